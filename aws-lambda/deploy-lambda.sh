@@ -38,6 +38,12 @@ fi
 
 echo -e "${GREEN}✅ AWS CLI is configured${NC}"
 
+# Backend modules the functions import (standard library only)
+SHARED_MODULES=(
+    "../backend/services/task_registry.py"
+    "../backend/services/claim_check.py"
+)
+
 # Function to create deployment package
 create_deployment_package() {
     local function_name=$1
@@ -52,6 +58,11 @@ create_deployment_package() {
     
     # Copy function code
     cp "./functions/${function_name}.py" "$package_dir/"
+
+    # Copy modules shared with the backend
+    for shared_module in "${SHARED_MODULES[@]}"; do
+        cp "$shared_module" "$package_dir/"
+    done
     
     # Install dependencies
     if [ -f "./requirements.txt" ]; then
@@ -1,21 +1,210 @@
+import hashlib
 import json
 import os
+import threading
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import (
+    dataclass,
+)
 from datetime import (
     datetime,
 )
 from typing import (
     Any,
+    Callable,
     Dict,
+    List,
+    Optional,
 )
 
 import requests
+from requests.adapters import (
+    HTTPAdapter,
+)
+
+# Upper bound on concurrent upstream calls per invocation
+MAX_WORKERS = int(os.environ.get("POLLER_MAX_WORKERS", "8"))
+
+# Default per-source timeout in seconds
+SOURCE_TIMEOUT = float(os.environ.get("POLLER_SOURCE_TIMEOUT", "10"))
+
+# Validator cache location; /tmp survives between warm invocations
+FETCH_CACHE_PATH = os.environ.get(
+    "FETCH_CACHE_PATH", "/tmp/wipsie-fetch-cache.json"
+)
+
+# Shared keep-alive session, reused across warm invocations
+_session = None
+_fetch_cache = None
+_fetch_cache_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Pooled HTTP session sized for the fetch thread pool"""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_WORKERS)
+        _session.mount("https://", adapter)
+        _session.mount("http://", adapter)
+    return _session
+
+
+class FetchCache:
+    """
+    Per-URL ETag / Last-Modified / content-hash cache.
+
+    Conditional headers let upstreams answer 304 without a body; when an
+    upstream ignores them, an unchanged content hash still marks the
+    payload as unchanged so it isn't stored or enriched again. New
+    validators are staged and only committed once the payloads they
+    describe are stored; otherwise a failed store would never be retried.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries = self._load()
+        self._staged: Dict[str, Dict[str, Any]] = {}
+        # Set once a poll's results are collected: fetches that finish
+        # after their deadline were reported as errors, so never commit
+        self._sealed = False
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def conditional_headers(self, key: str) -> Dict[str, str]:
+        entry = self._entries.get(key, {})
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def cached_record(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get(key, {}).get("record")
+
+    def stage(
+        self,
+        key: str,
+        response: requests.Response,
+        record: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Stage validators for a response; return True if content changed"""
+        with self._lock:
+            staged = {} if self._sealed else self._staged.setdefault(key, {})
+            staged["fetched_at"] = datetime.utcnow().isoformat()
+
+            if response.status_code == 304:
+                return False
+
+            content_hash = hashlib.sha256(response.content).hexdigest()
+            entry = self._entries.get(key, {})
+            changed = entry.get("content_hash") != content_hash
+            staged.update(
+                {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "content_hash": content_hash,
+                    "record": record,
+                }
+            )
+            return changed
+
+    def commit(self):
+        """Apply the staged validators and persist them"""
+        with self._lock:
+            for key, staged in self._staged.items():
+                self._entries.setdefault(key, {}).update(staged)
+                self._dirty = True
+            self._staged = {}
+        self.save()
+
+    def seal(self):
+        """Ignore fetches staged from now until the next discard()"""
+        with self._lock:
+            self._sealed = True
+
+    def discard(self):
+        """Drop the staged validators and start staging afresh"""
+        with self._lock:
+            self._staged = {}
+            self._sealed = False
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, "w") as f:
+                    json.dump(self._entries, f)
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except OSError as e:
+                print(f"Failed to persist fetch cache: {e}")
+
+
+def get_fetch_cache() -> FetchCache:
+    global _fetch_cache
+    # Fetch threads race to create the cache on a cold start
+    with _fetch_cache_lock:
+        if _fetch_cache is None:
+            _fetch_cache = FetchCache(FETCH_CACHE_PATH)
+    return _fetch_cache
+
+
+@dataclass
+class SourceFetch:
+    """One upstream call belonging to a source (a city, a symbol, a feed)"""
+
+    key: str
+    fetch: Callable[[requests.Session, float], Dict[str, Any]]
+    timeout: float = SOURCE_TIMEOUT
+
+
+@dataclass
+class DataSource:
+    """A registered source: builds its fetches and names its result key"""
+
+    name: str
+    result_key: str
+    build_fetches: Callable[[Dict[str, Any]], List[SourceFetch]]
+    error_field: str = "key"
+
+
+SOURCES: Dict[str, DataSource] = {}
+
+
+def register_source(name: str, result_key: str, error_field: str = "key"):
+    """Decorator registering a fetch builder under a source name"""
+
+    def decorator(build_fetches):
+        SOURCES[name] = DataSource(
+            name=name,
+            result_key=result_key,
+            build_fetches=build_fetches,
+            error_field=error_field,
+        )
+        return build_fetches
+
+    return decorator
 
 
 def lambda_handler(event, context):
     """
     Enhanced Data Poller Lambda Function - Staging Deployment
     Polls external APIs and stores data through the FastAPI backend
-    Version: 1.0.0-staging
+    Version: 1.1.0-staging
     """
 
     # Configuration from environment variables
@@ -26,29 +215,32 @@ def lambda_handler(event, context):
         # Get the source parameter from the event
         source = event.get("source", "weather")
 
-        if source == "weather":
-            result = poll_weather_data(api_key)
-        elif source == "stocks":
-            result = poll_stock_data()
-        elif source == "news":
-            result = poll_news_data()
-        else:
+        if source not in SOURCES:
             return {
                 "statusCode": 400,
                 "body": json.dumps(
                     {
                         "error": f"Unknown data source: {source}",
-                        "supported_sources": ["weather", "stocks", "news"],
+                        "supported_sources": sorted(SOURCES),
                     }
                 ),
             }
 
+        result = poll_source(source, {"api_key": api_key})
+
         # Store the data through the FastAPI backend
+        stored = True
         if (
             api_base_url != "http://localhost:8000"
         ):  # Only call API if not local dev
             store_result = store_data_via_api(api_base_url, result)
             result["storage_status"] = store_result
+            stored = store_result["status"] != "error"
+
+        # Remember what was fetched only once all of it is stored; after a
+        # failed store the next poll gets the payloads again, not a 304
+        if stored:
+            get_fetch_cache().commit()
 
         return {
             "statusCode": 200,
@@ -75,14 +267,91 @@ def lambda_handler(event, context):
         }
 
 
-def poll_weather_data(api_key: str) -> Dict[str, Any]:
-    """Poll weather data from OpenWeatherMap API"""
-    cities = ["London", "New York", "Tokyo", "Sydney"]
-    weather_data = []
+def poll_source(name: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run every fetch of a source concurrently.
 
-    for city in cities:
-        try:
-            # Using a demo endpoint for testing - replace with actual API
+    Wall time is bounded by the slowest fetch (or the largest per-source
+    timeout). A failed or timed-out fetch becomes an error record; the
+    other results are still returned. New validators stay staged in the
+    fetch cache until the caller commits them after storing the records.
+    """
+    source = SOURCES[name]
+    fetches = source.build_fetches(config)
+    session = get_session()
+    records: List[Dict[str, Any]] = []
+
+    # Validators left over from an earlier poll that was never stored
+    cache = get_fetch_cache()
+    cache.discard()
+
+    if not fetches:
+        return {source.result_key: records}
+
+    executor = ThreadPoolExecutor(
+        max_workers=min(MAX_WORKERS, len(fetches)),
+        thread_name_prefix=f"poll-{name}",
+    )
+    try:
+        futures = {
+            executor.submit(fetch.fetch, session, fetch.timeout): fetch
+            for fetch in fetches
+        }
+        deadline = max(fetch.timeout for fetch in fetches)
+        wait(futures, timeout=deadline)
+        cache.seal()
+        # Decided after sealing, so a fetch that staged just before the
+        # seal is reported and stored rather than failed
+        done = {future for future in futures if future.done()}
+
+        # Keep registry order so results are stable between runs
+        for future, fetch in futures.items():
+            if future not in done:
+                future.cancel()
+                error = f"Timed out after {fetch.timeout}s"
+            elif future.exception() is not None:
+                error = str(future.exception())
+            else:
+                records.append(future.result())
+                continue
+            records.append(
+                {
+                    source.error_field: fetch.key,
+                    "error": error,
+                    "source": f"{name}_api",
+                }
+            )
+    finally:
+        # Don't block the response on stragglers past their deadline
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return {
+        source.result_key: records,
+        "unchanged_count": sum(1 for r in records if r.get("unchanged")),
+    }
+
+
+@register_source("weather", "weather_data", error_field="city")
+def weather_fetches(config: Dict[str, Any]) -> List[SourceFetch]:
+    """One fetch per city against the OpenWeatherMap API"""
+    api_key = config.get("api_key", "demo_key")
+    base_url = os.environ.get(
+        "WEATHER_API_URL", "https://api.openweathermap.org/data/2.5/weather"
+    )
+    cities = config.get("cities", ["London", "New York", "Tokyo", "Sydney"])
+    timeout = config.get("timeout", SOURCE_TIMEOUT)
+
+    def to_record(data, city):
+        return {
+            "city": data.get("name", city),
+            "temperature": data.get("main", {}).get("temp"),
+            "humidity": data.get("main", {}).get("humidity"),
+            "description": data.get("weather", [{}])[0].get("description"),
+            "source": "weather_api",
+        }
+
+    def make_fetch(city):
+        def fetch(session, timeout):
             if api_key == "demo_key":
                 # Return mock data for testing
                 data = {
@@ -90,113 +359,156 @@ def poll_weather_data(api_key: str) -> Dict[str, Any]:
                     "main": {"temp": 20.5, "humidity": 65},
                     "weather": [{"description": "clear sky"}],
                 }
-            else:
-                response = requests.get(
-                    f"https://api.openweathermap.org/data/2.5/weather"
-                    f"?q={city}&appid={api_key}&units=metric",
-                    timeout=10,
-                )
-                response.raise_for_status()
-                data = response.json()
+                return to_record(data, city)
 
-            weather_data.append(
-                {
-                    "city": data.get("name", city),
-                    "temperature": data.get("main", {}).get("temp"),
-                    "humidity": data.get("main", {}).get("humidity"),
-                    "description": data.get("weather", [{}])[0].get(
-                        "description"
-                    ),
-                    "source": "weather_api",
-                }
+            # The API key is left out of the cache key on purpose
+            cache = get_fetch_cache()
+            cache_key = f"{base_url}?q={city}"
+            response = session.get(
+                base_url,
+                params={"q": city, "appid": api_key, "units": "metric"},
+                headers=cache.conditional_headers(cache_key),
+                timeout=timeout,
             )
+            if response.status_code == 304:
+                cache.stage(cache_key, response)
+                record = cache.cached_record(cache_key) or {"city": city}
+                return {**record, "unchanged": True}
 
-        except Exception as e:
-            weather_data.append(
-                {"city": city, "error": str(e), "source": "weather_api"}
-            )
+            response.raise_for_status()
+            record = to_record(response.json(), city)
+            if not cache.stage(cache_key, response, record):
+                return {**record, "unchanged": True}
+            return record
 
-    return {"weather_data": weather_data}
+        return fetch
 
+    return [
+        SourceFetch(key=city, fetch=make_fetch(city), timeout=timeout)
+        for city in cities
+    ]
 
-def poll_stock_data() -> Dict[str, Any]:
-    """Poll stock data - mock implementation"""
+
+@register_source("stocks", "stock_data", error_field="symbol")
+def stock_fetches(config: Dict[str, Any]) -> List[SourceFetch]:
+    """One fetch per symbol - mock implementation"""
     # This would integrate with a real stock API like Alpha Vantage
-    stocks = ["AAPL", "GOOGL", "MSFT", "AMZN"]
-    stock_data = []
+    symbols = config.get("symbols", ["AAPL", "GOOGL", "MSFT", "AMZN"])
 
-    for symbol in stocks:
-        # Mock data for demonstration
-        stock_data.append(
-            {
+    def make_fetch(symbol):
+        def fetch(session, timeout):
+            # Mock data for demonstration
+            return {
                 "symbol": symbol,
                 "price": round(150.0 + hash(symbol) % 100, 2),
                 "change": round((hash(symbol) % 20 - 10) / 10, 2),
                 "source": "stock_api",
             }
-        )
 
-    return {"stock_data": stock_data}
+        return fetch
 
+    return [
+        SourceFetch(key=symbol, fetch=make_fetch(symbol)) for symbol in symbols
+    ]
 
-def poll_news_data() -> Dict[str, Any]:
-    """Poll news data - mock implementation"""
+
+@register_source("news", "news_data", error_field="feed")
+def news_fetches(config: Dict[str, Any]) -> List[SourceFetch]:
+    """One fetch per feed - mock implementation"""
     # This would integrate with a news API like NewsAPI
-    news_data = [
-        {
+    mock_articles = {
+        "technology": {
             "title": "Tech stocks surge on AI optimism",
             "summary": "Technology stocks continue their upward trend...",
-            "source": "news_api",
-            "category": "technology",
         },
-        {
+        "environment": {
             "title": "Climate change impacts global weather patterns",
             "summary": "Scientists report significant changes in weather...",
-            "source": "news_api",
-            "category": "environment",
         },
-    ]
+    }
+    feeds = config.get("feeds", list(mock_articles))
+
+    def make_fetch(feed):
+        def fetch(session, timeout):
+            return {
+                **mock_articles.get(feed, {"title": feed, "summary": ""}),
+                "source": "news_api",
+                "category": feed,
+            }
+
+        return fetch
 
-    return {"news_data": news_data}
+    return [SourceFetch(key=feed, fetch=make_fetch(feed)) for feed in feeds]
+
+
+def poll_weather_data(api_key: str) -> Dict[str, Any]:
+    """Poll weather data from OpenWeatherMap API"""
+    return poll_source("weather", {"api_key": api_key})
+
+
+def poll_stock_data() -> Dict[str, Any]:
+    """Poll stock data - mock implementation"""
+    return poll_source("stocks", {})
+
+
+def poll_news_data() -> Dict[str, Any]:
+    """Poll news data - mock implementation"""
+    return poll_source("news", {})
 
 
 def store_data_via_api(
     api_base_url: str, data: Dict[str, Any]
 ) -> Dict[str, Any]:
-    """Store polled data through the FastAPI backend"""
-    try:
-        # Flatten the data for storage
-        data_points = []
-
-        for key, value in data.items():
-            if isinstance(value, list):
-                for i, item in enumerate(value):
-                    data_points.append(
-                        {
-                            "name": f"{key}_{i}",
-                            "value": json.dumps(item),
-                            "source": "lambda_poller",
-                        }
-                    )
-
-        # Send to API
-        response = requests.post(
-            f"{api_base_url}/api/data-points/",
-            json=(
-                data_points[0]
-                if data_points
-                else {
-                    "name": "empty",
-                    "value": "{}",
-                    "source": "lambda_poller",
-                }
-            ),
-            headers={"Content-Type": "application/json"},
-            timeout=10,
+    """
+    Store polled data through the FastAPI backend, one POST per point.
+
+    The status is "success" only if every point was stored: the caller
+    commits the fetch validators of all changed records on success.
+    """
+    # Flatten the data for storage
+    data_points = []
+
+    for key, value in data.items():
+        if isinstance(value, list):
+            for i, item in enumerate(value):
+                if item.get("unchanged"):
+                    # Same payload as last poll - nothing new to store
+                    continue
+                data_points.append(
+                    {
+                        "name": f"{key}_{i}",
+                        "value": json.dumps(item),
+                        "source": "lambda_poller",
+                    }
+                )
+
+    if not data_points:
+        if data.get("unchanged_count"):
+            return {"status": "skipped", "reason": "unchanged"}
+        data_points.append(
+            {"name": "empty", "value": "{}", "source": "lambda_poller"}
         )
-        response.raise_for_status()
 
-        return {"status": "success", "stored_points": len(data_points)}
+    session = get_session()
+    stored, errors = 0, []
+    for data_point in data_points:
+        try:
+            response = session.post(
+                f"{api_base_url}/api/data-points/",
+                json=data_point,
+                headers={"Content-Type": "application/json"},
+                timeout=10,
+            )
+            response.raise_for_status()
+            stored += 1
+        except Exception as e:
+            errors.append(f"{data_point['name']}: {e}")
 
-    except Exception as e:
-        return {"status": "error", "error": str(e)}
+    if errors:
+        return {
+            "status": "error",
+            "error": "; ".join(errors),
+            "stored_points": stored,
+            "failed_points": len(errors),
+        }
+    return {"status": "success", "stored_points": stored}
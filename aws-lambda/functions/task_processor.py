@@ -1,59 +1,107 @@
 import json
 import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    wait,
+)
 from datetime import (
     datetime,
 )
 from typing import (
     Any,
     Dict,
+    Optional,
+)
+from urllib.parse import (
+    urlsplit,
 )
 
 import requests
+from requests.adapters import (
+    HTTPAdapter,
+)
+
+try:
+    from claim_check import (
+        ClaimCheckCodec,
+        LocalBlobStore,
+        S3BlobStore,
+    )
+    from task_registry import (
+        ResourceHint,
+        registry,
+    )
+except ImportError:
+    # Running from the repository rather than the deployment package
+    sys.path.append(
+        os.path.join(
+            os.path.dirname(__file__), "..", "..", "backend", "services"
+        )
+    )
+    from claim_check import (
+        ClaimCheckCodec,
+        LocalBlobStore,
+        S3BlobStore,
+    )
+    from task_registry import (
+        ResourceHint,
+        registry,
+    )
+
+
+# Upper bound on SQS records processed at once in a batch invocation
+MAX_BATCH_CONCURRENCY = int(os.environ.get("MAX_BATCH_CONCURRENCY", "8"))
+
+# Longest a single record may run before it is reported as failed
+RECORD_TIMEOUT_SECONDS = float(os.environ.get("RECORD_TIMEOUT_SECONDS", "60"))
+
+# Time kept back from the invocation deadline to build the response
+DEADLINE_SAFETY_MS = int(os.environ.get("DEADLINE_SAFETY_MS", "2000"))
+
+# Webhook dispatch: concurrent requests and pooled connections per host
+WEBHOOK_MAX_PER_HOST = int(os.environ.get("WEBHOOK_MAX_PER_HOST", "4"))
+WEBHOOK_MAX_RETRIES = int(os.environ.get("WEBHOOK_MAX_RETRIES", "2"))
+WEBHOOK_BACKOFF_BASE = float(os.environ.get("WEBHOOK_BACKOFF_BASE", "0.5"))
+WEBHOOK_BACKOFF_MAX = float(os.environ.get("WEBHOOK_BACKOFF_MAX", "5"))
+
+# Consecutive failures before a host's circuit opens, and how long it stays
+# open before a single trial request is let through
+BREAKER_FAILURE_THRESHOLD = int(
+    os.environ.get("BREAKER_FAILURE_THRESHOLD", "5")
+)
+BREAKER_RESET_SECONDS = float(os.environ.get("BREAKER_RESET_SECONDS", "30"))
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Task ids per status update request (the API accepts up to 1000)
+TASK_STATUS_BATCH_SIZE = int(os.environ.get("TASK_STATUS_BATCH_SIZE", "500"))
 
 
 def lambda_handler(event, context):
     """
     Enhanced Task Processor Lambda Function - Staging Deployment
     Processes background tasks asynchronously with improved error handling
-    Version: 1.0.0-staging
+    Version: 1.1.0-staging
+
+    Accepts either a direct invocation ({"task_data": {...}}) or an SQS
+    batch event ({"Records": [...]}).
     """
 
+    if is_sqs_batch(event):
+        return handle_sqs_batch(event, context)
+
     try:
         # Extract task data from the event
         task_data = event.get("task_data", {})
         task_type = task_data.get("type", "unknown")
         task_id = task_data.get("id", "unknown")
 
-        print(f"Processing task {task_id} of type {task_type}")
-
-        # Process different types of tasks
-        if task_type == "email_notification":
-            result = process_email_notification(task_data)
-        elif task_type == "data_analysis":
-            result = process_data_analysis(task_data)
-        elif task_type == "report_generation":
-            result = process_report_generation(task_data)
-        elif task_type == "data_cleanup":
-            result = process_data_cleanup(task_data)
-        elif task_type == "webhook_call":
-            result = process_webhook_call(task_data)
-        else:
-            result = {
-                "status": "error",
-                "message": f"Unknown task type: {task_type}",
-                "supported_types": [
-                    "email_notification",
-                    "data_analysis",
-                    "report_generation",
-                    "data_cleanup",
-                    "webhook_call",
-                ],
-            }
-
-        # Update task status via API if configured
-        api_base_url = os.environ.get("API_BASE_URL")
-        if api_base_url and task_id != "unknown":
-            update_task_status(api_base_url, task_id, result)
+        result = process_task_data(task_data)
+        report_task_statuses({task_id: result})
 
         return {
             "statusCode": 200,
@@ -89,6 +137,140 @@ def lambda_handler(event, context):
         return error_response
 
 
+def process_task_data(task_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Dispatch a single task and report its status to the API"""
+    task_type = task_data.get("type", "unknown")
+    task_id = task_data.get("id", "unknown")
+
+    print(f"Processing task {task_id} of type {task_type}")
+
+    # The registry picks a process or thread pool from the type's hint
+    if task_type in registry:
+        result = registry.run(
+            task_type, task_data, timeout=task_data.get("timeout")
+        )
+    else:
+        result = {
+            "status": "error",
+            "message": f"Unknown task type: {task_type}",
+            "supported_types": registry.types(),
+        }
+
+    return result
+
+
+def is_sqs_batch(event: Dict[str, Any]) -> bool:
+    """True for events delivered by an SQS event source mapping"""
+    records = event.get("Records")
+    return bool(records) and all(
+        record.get("eventSource") == "aws:sqs" for record in records
+    )
+
+
+def remaining_time_ms(context) -> int:
+    """Milliseconds left in this invocation (generous default locally)"""
+    getter = getattr(context, "get_remaining_time_in_millis", None)
+    if getter is None:
+        getter = getattr(context, "remaining_time_in_millis", None)
+    return int(getter()) if callable(getter) else 900_000
+
+
+def claim_check_store():
+    """
+    Where producers offload large bodies. Claim checks pointing anywhere
+    else are refused, so a message can't make us read arbitrary objects.
+    """
+    bucket = os.environ.get("CLAIM_CHECK_BUCKET")
+    if bucket:
+        return S3BlobStore(
+            bucket, os.environ.get("CLAIM_CHECK_PREFIX", "claim-checks/")
+        )
+    directory = os.environ.get("CLAIM_CHECK_DIR")
+    return LocalBlobStore(directory) if directory else None
+
+
+# Decodes compressed and claim-checked message bodies
+CLAIM_CHECK_CODEC = ClaimCheckCodec(store=claim_check_store())
+
+
+def parse_sqs_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract task_data from an SQS message body"""
+    body = CLAIM_CHECK_CODEC.decode(
+        record["body"], record.get("messageAttributes")
+    ).get()
+    if not isinstance(body, dict):
+        raise ValueError("SQS message body must be a JSON object")
+    return body.get("task_data", body)
+
+
+def handle_sqs_batch(event: Dict[str, Any], context) -> Dict[str, Any]:
+    """
+    Process an SQS batch concurrently and report partial failures.
+
+    Records run on a bounded thread pool. Each handler is given
+    RECORD_TIMEOUT_SECONDS, capped by the time left in the invocation, as
+    its own timeout; records that fail, return an error status or haven't
+    returned by the invocation deadline are listed in batchItemFailures
+    so SQS redelivers only those messages. A slow record that did finish
+    is kept: redelivering it would repeat its side effects.
+    Requires ReportBatchItemFailures on the event source mapping.
+    """
+    records = event["Records"]
+    budget_s = max(
+        (remaining_time_ms(context) - DEADLINE_SAFETY_MS) / 1000, 0
+    )
+    record_timeout = min(RECORD_TIMEOUT_SECONDS, budget_s)
+    deadline = time.monotonic() + budget_s
+
+    failures = []
+    # task id -> result of records done by the deadline, reported in bulk;
+    # threads still running after it never touch this
+    finished = {}
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(MAX_BATCH_CONCURRENCY, len(records))),
+        thread_name_prefix="sqs-record",
+    )
+
+    def run(record):
+        timeout = min(record_timeout, deadline - time.monotonic())
+        if timeout <= 0:
+            # Queued behind slower records until the invocation ran out
+            raise TimeoutError("Invocation deadline reached before start")
+        task_data = dict(parse_sqs_record(record))
+        # IO-bound handlers (webhooks) honour this as their own timeout
+        task_data.setdefault("timeout", timeout)
+        return task_data.get("id"), process_task_data(task_data)
+
+    try:
+        futures = {executor.submit(run, record): record for record in records}
+        done, _ = wait(futures, timeout=budget_s)
+
+        for future, record in futures.items():
+            message_id = record["messageId"]
+            if future not in done:
+                future.cancel()
+                print(f"Record {message_id} timed out")
+            elif future.exception() is not None:
+                print(f"Record {message_id} failed: {future.exception()}")
+            else:
+                task_id, result = future.result()
+                finished[task_id] = result
+                if result.get("status") != "error":
+                    continue
+                print(f"Record {message_id} returned an error result")
+            failures.append({"itemIdentifier": message_id})
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    report_task_statuses(finished)
+    print(
+        f"Processed SQS batch: {len(records) - len(failures)} succeeded, "
+        f"{len(failures)} failed"
+    )
+    return {"batchItemFailures": failures}
+
+
+@registry.register("email_notification", hint=ResourceHint.IO_BOUND)
 def process_email_notification(task_data: Dict[str, Any]) -> Dict[str, Any]:
     """Process email notification task using AWS SES or SNS"""
     try:
@@ -116,129 +298,205 @@ def process_email_notification(task_data: Dict[str, Any]) -> Dict[str, Any]:
         }
 
 
-def process_data_analysis(task_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Process data analysis task"""
-    try:
-        dataset_id = task_data.get("dataset_id", "unknown")
-        analysis_type = task_data.get("analysis_type", "basic")
-
-        # Simulate data analysis processing
-        print(f"Analyzing dataset {dataset_id} with {analysis_type} analysis")
-
-        # Mock analysis results
-        results = {
-            "dataset_id": dataset_id,
-            "analysis_type": analysis_type,
-            "records_processed": 1000 + hash(dataset_id) % 5000,
-            "anomalies_detected": hash(dataset_id) % 10,
-            "processing_time": 2.3,
-        }
-
-        return {
-            "status": "success",
-            "message": f"Analysis completed for dataset {dataset_id}",
-            "results": results,
-        }
-
-    except Exception as e:
-        return {
-            "status": "error",
-            "message": f"Failed to analyze data: {str(e)}",
-        }
-
-
-def process_report_generation(task_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Process report generation task"""
-    try:
-        report_name = task_data.get("report_name", "unknown")
-        report_type = task_data.get("report_type", "summary")
-        date_range = task_data.get("date_range", "7d")
-
-        print(
-            f"Generating {report_type} report: {report_name} for {date_range}"
-        )
+class CircuitOpenError(Exception):
+    """Raised when a destination host's circuit breaker is open"""
 
-        # In a real implementation, you'd:
-        # 1. Query the database for report data
-        # 2. Generate the report (PDF, Excel, etc.)
-        # 3. Store it in S3
-        # 4. Send notification with download link
-
-        # Mock S3 URL
-        timestamp = datetime.now().strftime('%Y%m%d')
-        s3_url = (
-            f"https://my-bucket.s3.amazonaws.com/reports/"
-            f"{report_name}_{timestamp}.pdf"
-        )
 
-        return {
-            "status": "success",
-            "message": f"Report generated: {report_name}",
-            "report_url": s3_url,
-            "report_type": report_type,
-            "date_range": date_range,
-            "processing_time": 5.2,
-        }
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one destination host.
 
-    except Exception as e:
-        return {
-            "status": "error",
-            "message": f"Failed to generate report: {str(e)}",
-        }
+    closed -> open after BREAKER_FAILURE_THRESHOLD failures in a row;
+    open -> half-open once BREAKER_RESET_SECONDS have passed, letting one
+    trial request through; its outcome closes or re-opens the circuit.
+    """
 
+    def __init__(self, threshold: int, reset_seconds: float):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class WebhookDispatcher:
+    """
+    Sends webhook requests over a pooled keep-alive session.
 
-def process_data_cleanup(task_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Process data cleanup task"""
-    try:
-        cleanup_type = task_data.get("cleanup_type", "old_records")
-        days_old = task_data.get("days_old", 30)
+    Concurrent requests per host are capped, 5xx/429 responses and
+    connection errors are retried with full-jitter backoff inside the
+    caller's timeout, and a per-host circuit breaker fails fast once a
+    destination keeps failing.
+    """
 
-        print(
-            f"Running {cleanup_type} cleanup for records "
-            f"older than {days_old} days"
+    def __init__(
+        self,
+        max_per_host: int = WEBHOOK_MAX_PER_HOST,
+        max_retries: int = WEBHOOK_MAX_RETRIES,
+    ):
+        self.max_per_host = max_per_host
+        self.max_retries = max_retries
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max_per_host)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._hosts: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _host_state(self, host: str):
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = (
+                    threading.BoundedSemaphore(self.max_per_host),
+                    CircuitBreaker(
+                        BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS
+                    ),
+                )
+            return self._hosts[host]
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        return self._host_state(urlsplit(url).netloc)[1]
+
+    def backoff(self, attempt: int, response=None) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After on 429"""
+        delay = random.uniform(
+            0, min(WEBHOOK_BACKOFF_MAX, WEBHOOK_BACKOFF_BASE * 2**attempt)
         )
-
-        # Mock cleanup results
-        cleaned_records = hash(str(days_old)) % 1000
-
-        return {
-            "status": "success",
-            "message": f"Cleanup completed: {cleanup_type}",
-            "records_cleaned": cleaned_records,
-            "days_old": days_old,
-            "processing_time": 1.8,
-        }
-
-    except Exception as e:
-        return {
-            "status": "error",
-            "message": f"Failed to cleanup data: {str(e)}",
-        }
-
-
+        retry_after = None
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(float(retry_after), WEBHOOK_BACKOFF_MAX))
+        return delay
+
+    def dispatch(
+        self, method: str, url: str, payload: Dict[str, Any], timeout: float
+    ):
+        """Send a request; returns (response, attempts)"""
+        limiter, breaker = self._host_state(urlsplit(url).netloc)
+        deadline = time.monotonic() + timeout
+        attempt = 0
+
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(
+                    f"Circuit open for {urlsplit(url).netloc}"
+                )
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not limiter.acquire(timeout=remaining):
+                breaker.record_failure()
+                raise requests.Timeout(f"No connection slot for {url}")
+
+            response = None
+            try:
+                remaining = max(deadline - time.monotonic(), 0.001)
+                if method == "POST":
+                    response = self.session.post(
+                        url, json=payload, timeout=remaining
+                    )
+                else:
+                    response = self.session.get(
+                        url, params=payload, timeout=remaining
+                    )
+                retryable = response.status_code in RETRYABLE_STATUS_CODES
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    breaker.record_failure()
+                    raise
+                retryable = True
+            finally:
+                limiter.release()
+
+            if not retryable:
+                # 2xx-4xx (except 429) means the host itself is healthy
+                breaker.record_success()
+                return response, attempt + 1
+
+            breaker.record_failure()
+            delay = self.backoff(attempt, response)
+            if (
+                attempt >= self.max_retries
+                or time.monotonic() + delay >= deadline
+            ):
+                if response is None:
+                    raise requests.Timeout(f"Retries exhausted for {url}")
+                return response, attempt + 1
+
+            print(f"Retrying webhook {url} in {delay:.2f}s")
+            time.sleep(delay)
+            attempt += 1
+
+
+# Kept across warm invocations so connections and breaker state are reused
+_webhook_dispatcher = None
+_webhook_dispatcher_lock = threading.Lock()
+
+
+def get_webhook_dispatcher() -> WebhookDispatcher:
+    global _webhook_dispatcher
+    with _webhook_dispatcher_lock:
+        if _webhook_dispatcher is None:
+            _webhook_dispatcher = WebhookDispatcher()
+    return _webhook_dispatcher
+
+
+@registry.register("webhook_call", hint=ResourceHint.IO_BOUND)
 def process_webhook_call(task_data: Dict[str, Any]) -> Dict[str, Any]:
     """Process webhook call task"""
     try:
         webhook_url = task_data.get("webhook_url")
         payload = task_data.get("payload", {})
         method = task_data.get("method", "POST").upper()
+        timeout = min(float(task_data.get("timeout", 30)), 30)
 
         if not webhook_url:
             return {"status": "error", "message": "webhook_url is required"}
 
-        print(f"Calling webhook: {method} {webhook_url}")
-
-        # Make the webhook call
-        if method == "POST":
-            response = requests.post(webhook_url, json=payload, timeout=30)
-        elif method == "GET":
-            response = requests.get(webhook_url, params=payload, timeout=30)
-        else:
+        if method not in ("POST", "GET"):
             return {
                 "status": "error",
                 "message": f"Unsupported HTTP method: {method}",
             }
 
+        print(f"Calling webhook: {method} {webhook_url}")
+
+        started = time.monotonic()
+        response, attempts = get_webhook_dispatcher().dispatch(
+            method, webhook_url, payload, timeout
+        )
         response.raise_for_status()
 
         return {
@@ -246,9 +504,16 @@ def process_webhook_call(task_data: Dict[str, Any]) -> Dict[str, Any]:
             "message": f"Webhook called successfully: {webhook_url}",
             "response_status": response.status_code,
             "response_body": response.text[:500],  # Truncate response
-            "processing_time": 0.8,
+            "attempts": attempts,
+            "processing_time": round(time.monotonic() - started, 3),
         }
 
+    except CircuitOpenError as e:
+        return {
+            "status": "error",
+            "message": f"Webhook skipped: {str(e)}",
+            "circuit_open": True,
+        }
     except Exception as e:
         return {
             "status": "error",
@@ -256,20 +521,34 @@ def process_webhook_call(task_data: Dict[str, Any]) -> Dict[str, Any]:
         }
 
 
-def update_task_status(
-    api_base_url: str, task_id: str, result: Dict[str, Any]
-) -> None:
-    """Update task status via the FastAPI backend"""
-    try:
-        # In a real implementation, you'd call your API to update task status
-        print(f"Updating task {task_id} status via API: {api_base_url}")
-
-        # This would be something like:
-        # requests.put(f"{api_base_url}/api/tasks/{task_id}", json={
-        #     'status': ('completed' if result['status'] == 'success'
-        #                else 'failed'),
-        #     'result': result
-        # })
+def report_task_statuses(results: Dict[Any, Dict[str, Any]]) -> None:
+    """
+    Mark finished tasks completed or failed via the FastAPI backend.
 
-    except Exception as e:
-        print(f"Failed to update task status: {e}")
+    One PATCH /api/v1/tasks/status per status (and per
+    TASK_STATUS_BATCH_SIZE ids) instead of one request per task.
+    """
+    api_base_url = os.environ.get("API_BASE_URL")
+    if not api_base_url:
+        return
+
+    ids_by_status = {}
+    for task_id, result in results.items():
+        try:
+            task_id = int(task_id)
+        except (TypeError, ValueError):
+            continue  # Not a backend task (e.g. "unknown")
+        status = "completed" if result.get("status") == "success" else "failed"
+        ids_by_status.setdefault(status, []).append(task_id)
+
+    url = f"{api_base_url.rstrip('/')}/api/v1/tasks/status"
+    for status, ids in ids_by_status.items():
+        for start in range(0, len(ids), TASK_STATUS_BATCH_SIZE):
+            batch = ids[start : start + TASK_STATUS_BATCH_SIZE]
+            try:
+                response = requests.patch(
+                    url, json={"ids": batch, "status": status}, timeout=10
+                )
+                response.raise_for_status()
+            except Exception as e:
+                print(f"Failed to mark {len(batch)} tasks {status}: {e}")
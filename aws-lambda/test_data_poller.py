@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Data Poller Concurrency Tests
+Runs the weather source against a local HTTP stub with artificial latency
+"""
+
+import json
+import os
+import threading
+import time
+from http.server import (
+    BaseHTTPRequestHandler,
+    ThreadingHTTPServer,
+)
+from urllib.parse import (
+    parse_qs,
+    urlparse,
+)
+
+import pytest
+
+from test_lambda_local import (
+    load_lambda_function,
+)
+
+# Seconds each stubbed city takes to answer
+CITY_DELAYS = {"London": 0.3, "New York": 0.3, "Tokyo": 0.3, "Sydney": 0.3}
+
+
+class WeatherStubHandler(BaseHTTPRequestHandler):
+    """Answers like OpenWeatherMap after a per-city delay"""
+
+    delays = CITY_DELAYS
+    failing = set()
+    temperature = 12.0
+    send_etag = True
+    not_modified = 0
+    # Doubles as the backend API once accepting_posts is set
+    accepting_posts = False
+    rejected_cities = set()
+    posts = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        city = json.loads(json.loads(body)["value"]).get("city")
+        if not self.accepting_posts or city in self.rejected_cities:
+            self.send_response(500)
+        else:
+            WeatherStubHandler.posts.append(city)
+            self.send_response(201)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        city = parse_qs(urlparse(self.path).query)["q"][0]
+        time.sleep(self.delays.get(city, 0))
+
+        if city in self.failing:
+            self.send_response(503)
+            self.end_headers()
+            return
+
+        body = json.dumps(
+            {
+                "name": city,
+                "main": {"temp": self.temperature, "humidity": 80},
+                "weather": [{"description": "drizzle"}],
+            }
+        ).encode()
+        etag = f'"{city}-{self.temperature}"'
+        if self.send_etag and self.headers.get("If-None-Match") == etag:
+            WeatherStubHandler.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        if self.send_etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def weather_stub(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), WeatherStubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv(
+        "WEATHER_API_URL", f"http://127.0.0.1:{server.server_port}/weather"
+    )
+    yield WeatherStubHandler
+    WeatherStubHandler.delays = CITY_DELAYS
+    WeatherStubHandler.failing = set()
+    WeatherStubHandler.temperature = 12.0
+    WeatherStubHandler.send_etag = True
+    WeatherStubHandler.not_modified = 0
+    WeatherStubHandler.accepting_posts = False
+    WeatherStubHandler.rejected_cities = set()
+    WeatherStubHandler.posts = []
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def poller(tmp_path, monkeypatch):
+    monkeypatch.setenv("FETCH_CACHE_PATH", str(tmp_path / "cache.json"))
+    handler = load_lambda_function("./functions/data_poller.py")
+    return handler.__globals__
+
+
+def test_wall_time_is_about_the_slowest_call(weather_stub, poller):
+    start = time.perf_counter()
+    result = poller["poll_weather_data"]("real-key")
+    elapsed = time.perf_counter() - start
+
+    cities = [record["city"] for record in result["weather_data"]]
+    assert cities == ["London", "New York", "Tokyo", "Sydney"]
+    assert all("error" not in record for record in result["weather_data"])
+    # Sequential polling would take ~1.2s
+    assert elapsed < 0.3 * 2
+
+
+def test_partial_failure_keeps_other_cities(weather_stub, poller):
+    weather_stub.failing = {"Tokyo"}
+
+    records = poller["poll_weather_data"]("real-key")["weather_data"]
+
+    failed = [record for record in records if "error" in record]
+    assert [record["city"] for record in failed] == ["Tokyo"]
+    assert len(records) == 4
+
+
+def test_slow_source_times_out(weather_stub, poller):
+    weather_stub.delays = {**CITY_DELAYS, "Sydney": 3.0}
+
+    start = time.perf_counter()
+    records = poller["poll_source"](
+        "weather", {"api_key": "real-key", "timeout": 0.6}
+    )["weather_data"]
+    elapsed = time.perf_counter() - start
+
+    sydney = records[-1]
+    assert sydney["city"] == "Sydney" and "error" in sydney
+    assert all("error" not in record for record in records[:-1])
+    assert elapsed < 1.5
+
+
+def test_unknown_source_lists_registry(poller):
+    response = poller["lambda_handler"]({"source": "unknown"}, None)
+    body = json.loads(response["body"])
+    assert response["statusCode"] == 400
+    assert body["supported_sources"] == ["news", "stocks", "weather"]
+
+
+def test_unchanged_payload_uses_conditional_request(weather_stub, poller):
+    weather_stub.delays = {}
+    first = poller["poll_weather_data"]("real-key")
+    assert first["unchanged_count"] == 0
+    poller["get_fetch_cache"]().commit()
+
+    second = poller["poll_weather_data"]("real-key")
+    assert second["unchanged_count"] == 4
+    assert weather_stub.not_modified == 4
+    # The 304 still carries the last known reading
+    assert second["weather_data"][0]["temperature"] == 12.0
+
+    stored = poller["store_data_via_api"]("http://unused", second)
+    assert stored == {"status": "skipped", "reason": "unchanged"}
+
+
+def test_content_hash_catches_unchanged_without_etag(weather_stub, poller):
+    weather_stub.delays = {}
+    weather_stub.send_etag = False
+    poller["poll_weather_data"]("real-key")
+    poller["get_fetch_cache"]().commit()
+
+    assert poller["poll_weather_data"]("real-key")["unchanged_count"] == 4
+
+    weather_stub.temperature = 14.5
+    changed = poller["poll_weather_data"]("real-key")
+    assert changed["unchanged_count"] == 0
+
+
+def test_cache_survives_module_reload(weather_stub, poller):
+    weather_stub.delays = {}
+    poller["poll_weather_data"]("real-key")
+    poller["get_fetch_cache"]().commit()
+
+    reloaded = load_lambda_function("./functions/data_poller.py").__globals__
+    assert reloaded["poll_weather_data"]("real-key")["unchanged_count"] == 4
+
+
+def test_failed_store_keeps_previous_validators(
+    weather_stub, poller, monkeypatch
+):
+    weather_stub.delays = {}
+    monkeypatch.setenv("WEATHER_API_KEY", "real-key")
+    # The stub refuses POSTs, so storing the data fails
+    monkeypatch.setenv(
+        "API_BASE_URL", os.environ["WEATHER_API_URL"].rsplit("/", 1)[0]
+    )
+
+    response = poller["lambda_handler"]({"source": "weather"}, None)
+    body = json.loads(response["body"])
+    assert body["data"]["storage_status"]["status"] == "error"
+
+    # Nothing was remembered, so the payloads are fetched again
+    retry = poller["poll_weather_data"]("real-key")
+    assert retry["unchanged_count"] == 0
+    assert weather_stub.not_modified == 0
+
+
+def test_every_changed_point_is_stored_before_committing(
+    weather_stub, poller, monkeypatch
+):
+    weather_stub.delays = {}
+    weather_stub.accepting_posts = True
+    weather_stub.rejected_cities = {"Tokyo"}
+    monkeypatch.setenv("WEATHER_API_KEY", "real-key")
+    monkeypatch.setenv(
+        "API_BASE_URL", os.environ["WEATHER_API_URL"].rsplit("/", 1)[0]
+    )
+
+    body = json.loads(
+        poller["lambda_handler"]({"source": "weather"}, None)["body"]
+    )
+    status = body["data"]["storage_status"]
+    assert status["status"] == "error"
+    assert (status["stored_points"], status["failed_points"]) == (3, 1)
+    assert sorted(weather_stub.posts) == ["London", "New York", "Sydney"]
+    # Tokyo wasn't stored, so no city was committed as seen
+    assert poller["poll_weather_data"]("real-key")["unchanged_count"] == 0
+
+    weather_stub.rejected_cities = set()
+    body = json.loads(
+        poller["lambda_handler"]({"source": "weather"}, None)["body"]
+    )
+    assert body["data"]["storage_status"] == {
+        "status": "success",
+        "stored_points": 4,
+    }
+    assert poller["poll_weather_data"]("real-key")["unchanged_count"] == 4
+
+
+def test_late_fetch_is_not_committed(weather_stub, poller):
+    weather_stub.delays = {**CITY_DELAYS, "Sydney": 1.0}
+    poller["poll_source"]("weather", {"api_key": "real-key", "timeout": 0.6})
+    # Let Sydney's straggling fetch finish and try to stage
+    time.sleep(0.6)
+    poller["get_fetch_cache"]().commit()
+
+    weather_stub.delays = {}
+    records = poller["poll_weather_data"]("real-key")["weather_data"]
+    unchanged = [record["city"] for record in records if "unchanged" in record]
+    assert unchanged == ["London", "New York", "Tokyo"]
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Task Processor Tests
+Runs SQS batches and webhook calls against stubbed tasks and endpoints
+"""
+
+import json
+import threading
+import time
+from http.server import (
+    BaseHTTPRequestHandler,
+    ThreadingHTTPServer,
+)
+
+import pytest
+
+from test_lambda_local import (
+    load_lambda_function,
+)
+
+
+class FakeContext:
+    def __init__(self, remaining_ms=30000):
+        self.deadline = time.monotonic() + remaining_ms / 1000
+
+    def get_remaining_time_in_millis(self):
+        return int((self.deadline - time.monotonic()) * 1000)
+
+
+def sqs_event(*bodies):
+    return {
+        "Records": [
+            {
+                "messageId": f"msg-{index}",
+                "eventSource": "aws:sqs",
+                "body": body if isinstance(body, str) else json.dumps(body),
+            }
+            for index, body in enumerate(bodies)
+        ]
+    }
+
+
+@pytest.fixture
+def processor(monkeypatch):
+    monkeypatch.delenv("API_BASE_URL", raising=False)
+    module = load_lambda_function("./functions/task_processor.py").__globals__
+    calls = []
+
+    def fake_process(task_data):
+        calls.append(task_data)
+        time.sleep(task_data.get("sleep", 0))
+        if task_data.get("raise"):
+            raise RuntimeError("boom")
+        return {"status": task_data.get("status", "success")}
+
+    module["process_task_data"] = fake_process
+    module["DEADLINE_SAFETY_MS"] = 0
+    return module, calls
+
+
+def test_batch_runs_records_concurrently(processor):
+    module, calls = processor
+    event = sqs_event(
+        *[{"task_data": {"id": i, "sleep": 0.3}} for i in range(8)]
+    )
+
+    start = time.perf_counter()
+    result = module["lambda_handler"](event, FakeContext())
+    elapsed = time.perf_counter() - start
+
+    assert result == {"batchItemFailures": []}
+    assert len(calls) == 8
+    # Sequential processing would take ~2.4s
+    assert elapsed < 0.3 * 3
+
+
+def test_failed_records_are_reported(processor):
+    module, _ = processor
+    event = sqs_event(
+        {"task_data": {"id": 1}},
+        {"task_data": {"id": 2, "raise": True}},
+        {"id": 3, "status": "error"},
+        "not json",
+    )
+
+    result = module["lambda_handler"](event, FakeContext())
+
+    failed = [item["itemIdentifier"] for item in result["batchItemFailures"]]
+    assert failed == ["msg-1", "msg-2", "msg-3"]
+
+
+def test_records_past_the_deadline_fail(processor):
+    module, calls = processor
+    event = sqs_event({"id": 1}, {"id": 2, "sleep": 2.0})
+
+    start = time.perf_counter()
+    result = module["lambda_handler"](event, FakeContext(remaining_ms=500))
+    elapsed = time.perf_counter() - start
+
+    failed = [item["itemIdentifier"] for item in result["batchItemFailures"]]
+    assert failed == ["msg-1"]
+    assert elapsed < 1.0
+    # The record timeout is passed down to the task handlers
+    assert all(call["timeout"] <= 0.5 for call in calls)
+
+
+def test_slow_records_that_finish_are_not_redelivered(processor):
+    module, calls = processor
+    module["RECORD_TIMEOUT_SECONDS"] = 0.1
+    event = sqs_event({"task_data": {"id": 1, "sleep": 0.3}})
+
+    result = module["lambda_handler"](event, FakeContext())
+
+    # Over its own timeout but done before the invocation deadline
+    assert result == {"batchItemFailures": []}
+    assert calls[0]["timeout"] == 0.1
+
+
+def test_records_finishing_after_the_deadline_are_not_reported(processor):
+    module, _ = processor
+    reported = []
+    module["report_task_statuses"] = reported.append
+    wait = module["wait"]
+
+    def deadline_passes(futures, timeout):
+        # The record finishes just after wait() gave up on it
+        wait(futures, timeout=timeout)
+        return set(), set(futures)
+
+    module["wait"] = deadline_passes
+    event = sqs_event({"task_data": {"id": 1}})
+
+    result = module["lambda_handler"](event, FakeContext())
+
+    # SQS redelivers the record, so the API must not hear it completed
+    assert result == {"batchItemFailures": [{"itemIdentifier": "msg-0"}]}
+    assert reported == [{}]
+
+
+def test_direct_invocation_still_supported(processor):
+    module, calls = processor
+    response = module["lambda_handler"](
+        {"task_data": {"id": 7, "type": "webhook_call"}}, FakeContext()
+    )
+    assert response["statusCode"] == 200
+    assert calls[0]["id"] == 7
+
+
+class StatusApiHandler(BaseHTTPRequestHandler):
+    """Records PATCH /api/v1/tasks/status bodies"""
+
+    requests = []
+
+    def do_PATCH(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        StatusApiHandler.requests.append((self.path, json.loads(body)))
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+def test_batch_statuses_are_reported_in_bulk(processor, monkeypatch):
+    module, _ = processor
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StatusApiHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_base_url = f"http://127.0.0.1:{server.server_port}"
+    monkeypatch.setenv("API_BASE_URL", api_base_url)
+    module["TASK_STATUS_BATCH_SIZE"] = 3
+    event = sqs_event(
+        *[{"task_data": {"id": i}} for i in range(4)],
+        {"task_data": {"id": 4, "status": "error"}},
+        {"task_data": {"id": 5, "raise": True}},
+        {"task_data": {"type": "no-id"}},
+    )
+
+    try:
+        module["lambda_handler"](event, FakeContext())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    bodies = sorted(
+        (body["status"], sorted(body["ids"]))
+        for path, body in StatusApiHandler.requests
+    )
+    assert {path for path, _ in StatusApiHandler.requests} == {
+        "/api/v1/tasks/status"
+    }
+    # Crashed records are redelivered by SQS, not reported
+    assert [status for status, _ in bodies] == [
+        "completed",
+        "completed",
+        "failed",
+    ]
+    assert sorted(sum((ids for _, ids in bodies[:2]), [])) == [0, 1, 2, 3]
+    assert bodies[2] == ("failed", [4])
+
+
+def test_compressed_and_claim_checked_records(
+    processor, tmp_path, monkeypatch
+):
+    module, calls = processor
+    # The processor put backend/services on sys.path for its shared modules
+    from claim_check import (
+        ClaimCheckCodec,
+        LocalBlobStore,
+    )
+
+    monkeypatch.setenv("CLAIM_CHECK_DIR", str(tmp_path))
+    module["CLAIM_CHECK_CODEC"] = ClaimCheckCodec(
+        store=module["claim_check_store"]()
+    )
+    codec = ClaimCheckCodec(
+        store=LocalBlobStore(str(tmp_path)),
+        compress_threshold=64,
+        offload_threshold=256,
+    )
+    small = {"task_data": {"id": 1, "rows": ["x"] * 40}}
+    large = {"task_data": {"id": 2, "rows": [str(n) for n in range(500)]}}
+    records = []
+    for index, payload in enumerate((small, large)):
+        body, attributes = codec.encode(payload)
+        records.append(
+            {
+                "messageId": f"msg-{index}",
+                "eventSource": "aws:sqs",
+                "body": body,
+                "messageAttributes": {
+                    name: {"stringValue": value, "dataType": "String"}
+                    for name, value in attributes.items()
+                },
+            }
+        )
+
+    assert records[0]["messageAttributes"]["content_encoding"] == {
+        "stringValue": "gzip",
+        "dataType": "String",
+    }
+    assert "claim_check" in records[1]["body"]
+    result = module["lambda_handler"]({"Records": records}, FakeContext())
+
+    assert result == {"batchItemFailures": []}
+    assert sorted(len(call["rows"]) for call in calls) == [40, 500]
+
+
+def test_claim_check_outside_the_store_is_refused(
+    processor, tmp_path, monkeypatch
+):
+    module, calls = processor
+    monkeypatch.setenv("CLAIM_CHECK_DIR", str(tmp_path / "claims"))
+    module["CLAIM_CHECK_CODEC"] = module["ClaimCheckCodec"](
+        store=module["claim_check_store"]()
+    )
+    secret = tmp_path / "secret.json.gzip"
+    secret.write_bytes(b"not for queue senders")
+    body = json.dumps(
+        {"claim_check": {"store": "local", "path": str(secret)}}
+    )
+    event = sqs_event(body)
+    event["Records"][0]["messageAttributes"] = {
+        "content_encoding": {"stringValue": "claim-check"}
+    }
+
+    result = module["lambda_handler"](event, FakeContext())
+
+    assert result == {"batchItemFailures": [{"itemIdentifier": "msg-0"}]}
+    assert calls == []
+
+
+class WebhookStubHandler(BaseHTTPRequestHandler):
+    """Answers with queued status codes, then 200"""
+
+    statuses = []
+    hits = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        WebhookStubHandler.hits += 1
+        status = self.statuses.pop(0) if self.statuses else 200
+        body = b'{"ok": true}'
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def webhook_stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), WebhookStubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    WebhookStubHandler.url = f"http://127.0.0.1:{server.server_port}/hook"
+    yield WebhookStubHandler
+    WebhookStubHandler.statuses = []
+    WebhookStubHandler.hits = 0
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def webhooks():
+    module = load_lambda_function("./functions/task_processor.py").__globals__
+    module["WEBHOOK_BACKOFF_BASE"] = 0.01
+    module["BREAKER_FAILURE_THRESHOLD"] = 3
+    module["BREAKER_RESET_SECONDS"] = 0.2
+    return module
+
+
+def call_webhook(module, url):
+    return module["process_webhook_call"](
+        {"webhook_url": url, "payload": {"event": "done"}, "timeout": 2}
+    )
+
+
+def test_webhook_retries_server_errors(webhook_stub, webhooks):
+    webhook_stub.statuses = [503, 429]
+
+    result = call_webhook(webhooks, webhook_stub.url)
+
+    assert result["status"] == "success"
+    assert result["attempts"] == 3
+    assert webhook_stub.hits == 3
+
+
+def test_webhook_client_errors_are_not_retried(webhook_stub, webhooks):
+    webhook_stub.statuses = [404]
+
+    result = call_webhook(webhooks, webhook_stub.url)
+
+    assert result["status"] == "error"
+    assert webhook_stub.hits == 1
+    breaker = webhooks["get_webhook_dispatcher"]().breaker(webhook_stub.url)
+    assert breaker.state == "closed"
+
+
+def test_circuit_opens_for_failing_host(webhook_stub, webhooks):
+    webhook_stub.statuses = [500] * 3
+
+    assert call_webhook(webhooks, webhook_stub.url)["status"] == "error"
+    skipped = call_webhook(webhooks, webhook_stub.url)
+
+    assert skipped["circuit_open"] is True
+    assert webhook_stub.hits == 3
+
+    # After the reset window one trial request closes the circuit again
+    time.sleep(0.25)
+    assert call_webhook(webhooks, webhook_stub.url)["status"] == "success"
+    breaker = webhooks["get_webhook_dispatcher"]().breaker(webhook_stub.url)
+    assert breaker.state == "closed"
+
+
+def test_session_is_reused_across_calls(webhook_stub, webhooks):
+    call_webhook(webhooks, webhook_stub.url)
+    session = webhooks["get_webhook_dispatcher"]().session
+    call_webhook(webhooks, webhook_stub.url)
+    assert webhooks["get_webhook_dispatcher"]().session is session
+
+
+def test_task_types_come_from_shared_registry(monkeypatch):
+    monkeypatch.delenv("API_BASE_URL", raising=False)
+    module = load_lambda_function("./functions/task_processor.py").__globals__
+
+    unknown = module["process_task_data"]({"type": "nope"})
+    assert unknown["supported_types"] == [
+        "data_analysis",
+        "data_cleanup",
+        "email_notification",
+        "report_generation",
+        "webhook_call",
+    ]
+    # Cleanups need the database; the Lambda must not fake one
+    result = module["process_task_data"](
+        {"type": "data_cleanup", "days_old": 14}
+    )
+    assert result["status"] == "error" and result["days_old"] == 14
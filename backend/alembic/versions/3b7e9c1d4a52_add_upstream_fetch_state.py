@@ -0,0 +1,41 @@
+"""add upstream_fetch_state
+
+Revision ID: 3b7e9c1d4a52
+Revises: 662035ea71a4
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e9c1d4a52'
+down_revision: Union[str, None] = '662035ea71a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'upstream_fetch_state',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('url', sa.String(length=2048), nullable=False),
+        sa.Column('etag', sa.String(length=255), nullable=True),
+        sa.Column('last_modified', sa.String(length=64), nullable=True),
+        sa.Column('content_hash', sa.String(length=64), nullable=True),
+        sa.Column('fetch_count', sa.Integer(), nullable=False),
+        sa.Column('unchanged_count', sa.Integer(), nullable=False),
+        sa.Column('last_fetched_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_changed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('url'),
+    )
+    op.create_index(op.f('ix_upstream_fetch_state_id'), 'upstream_fetch_state', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_upstream_fetch_state_id'), table_name='upstream_fetch_state')
+    op.drop_table('upstream_fetch_state')
@@ -0,0 +1,45 @@
+"""add polling_sources
+
+Revision ID: 4d9f1b7e3a58
+Revises: 7a3c5e9b2d14
+Create Date: 2026-10-19 19:41:09.528310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d9f1b7e3a58'
+down_revision: Union[str, None] = '7a3c5e9b2d14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'polling_sources',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('url', sa.String(length=2048), nullable=False),
+        sa.Column('data_type', sa.String(length=50), nullable=False),
+        sa.Column('interval_seconds', sa.Integer(), nullable=False),
+        sa.Column('enabled', sa.Boolean(), nullable=False),
+        sa.Column('next_run_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('running_since', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('consecutive_failures', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('last_started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('url'),
+    )
+    op.create_index(op.f('ix_polling_sources_id'), 'polling_sources', ['id'], unique=False)
+    op.create_index(op.f('ix_polling_sources_next_run_at'), 'polling_sources', ['next_run_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_polling_sources_next_run_at'), table_name='polling_sources')
+    op.drop_index(op.f('ix_polling_sources_id'), table_name='polling_sources')
+    op.drop_table('polling_sources')
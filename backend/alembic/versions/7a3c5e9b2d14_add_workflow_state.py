@@ -0,0 +1,56 @@
+"""add workflows and workflow_steps
+
+Revision ID: 7a3c5e9b2d14
+Revises: e2b8d4f6a1c7
+Create Date: 2026-10-19 18:22:47.315902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a3c5e9b2d14'
+down_revision: Union[str, None] = 'e2b8d4f6a1c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'workflows',
+        sa.Column('id', sa.String(length=255), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('config', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_workflows_updated_at'), 'workflows', ['updated_at'], unique=False)
+    op.create_table(
+        'workflow_steps',
+        sa.Column('workflow_id', sa.String(length=255), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('items', sa.Integer(), nullable=True),
+        sa.Column('seconds', sa.Float(), nullable=True),
+        sa.Column('output', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['workflow_id'], ['workflows.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('workflow_id', 'name'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('workflow_steps')
+    op.drop_index(op.f('ix_workflows_updated_at'), table_name='workflows')
+    op.drop_table('workflows')
@@ -0,0 +1,36 @@
+"""add processed_messages
+
+Revision ID: 8f4d2a6c1e93
+Revises: 3b7e9c1d4a52
+Create Date: 2026-10-19 13:40:05.512876
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f4d2a6c1e93'
+down_revision: Union[str, None] = '3b7e9c1d4a52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'processed_messages',
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('hit_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('key'),
+    )
+    op.create_index(op.f('ix_processed_messages_expires_at'), 'processed_messages', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_processed_messages_expires_at'), table_name='processed_messages')
+    op.drop_table('processed_messages')
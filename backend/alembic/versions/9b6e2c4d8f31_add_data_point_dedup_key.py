@@ -0,0 +1,30 @@
+"""add data_points dedup_key
+
+Revision ID: 9b6e2c4d8f31
+Revises: 4d9f1b7e3a58
+Create Date: 2026-10-19 21:08:52.417906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b6e2c4d8f31'
+down_revision: Union[str, None] = '4d9f1b7e3a58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('data_points', sa.Column('dedup_key', sa.String(length=128), nullable=True))
+    op.add_column('data_points', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(op.f('ix_data_points_dedup_key'), 'data_points', ['dedup_key'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_data_points_dedup_key'), table_name='data_points')
+    op.drop_column('data_points', 'updated_at')
+    op.drop_column('data_points', 'dedup_key')
@@ -0,0 +1,26 @@
+"""add processed_messages owner
+
+Revision ID: c5a8e1f3b742
+Revises: 9b6e2c4d8f31
+Create Date: 2026-10-19 23:12:37.904215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a8e1f3b742'
+down_revision: Union[str, None] = '9b6e2c4d8f31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('processed_messages', sa.Column('owner', sa.String(length=255), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('processed_messages', 'owner')
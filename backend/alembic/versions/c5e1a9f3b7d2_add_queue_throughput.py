@@ -0,0 +1,35 @@
+"""add queue_throughput
+
+Revision ID: c5e1a9f3b7d2
+Revises: 8f4d2a6c1e93
+Create Date: 2026-10-19 15:12:41.208334
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e1a9f3b7d2'
+down_revision: Union[str, None] = '8f4d2a6c1e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'queue_throughput',
+        sa.Column('queue', sa.String(length=255), nullable=False),
+        sa.Column('window_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('acks', sa.Integer(), nullable=False),
+        sa.Column('busy_seconds', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('queue', 'window_start'),
+    )
+    op.create_index(op.f('ix_queue_throughput_window_start'), 'queue_throughput', ['window_start'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_queue_throughput_window_start'), table_name='queue_throughput')
+    op.drop_table('queue_throughput')
@@ -0,0 +1,36 @@
+"""add task_results
+
+Revision ID: e2b8d4f6a1c7
+Revises: c5e1a9f3b7d2
+Create Date: 2026-10-19 17:05:18.640219
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b8d4f6a1c7'
+down_revision: Union[str, None] = 'c5e1a9f3b7d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'task_results',
+        sa.Column('task_id', sa.String(length=255), nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=False),
+        sa.Column('meta', sa.Text(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('task_id'),
+    )
+    op.create_index(op.f('ix_task_results_expires_at'), 'task_results', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_task_results_expires_at'), table_name='task_results')
+    op.drop_table('task_results')
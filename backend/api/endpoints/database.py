@@ -13,11 +13,19 @@ from fastapi import (
     Depends,
     HTTPException,
     Query,
+    Request,
+    Response,
 )
 from sqlalchemy.orm import (
     Session,
 )
 
+from core.http_cache import (
+    collection_version,
+    conditional,
+    content_etag,
+    make_etag,
+)
 from db.database import (
     get_db,
 )
@@ -27,13 +35,25 @@ from models.models import (
     User,
 )
 from schemas.aurora_schemas import (
+    DataPointBulkCreate,
+    DataPointBulkCreateResponse,
     DataPointCreate,
     DataPointResponse,
+    TaskBulkCreate,
+    TaskBulkCreateResponse,
     TaskCreate,
     TaskResponse,
+    TaskStatusUpdate,
+    TaskStatusUpdateResponse,
     UserCreate,
     UserResponse,
 )
+from services.data_point_service import (
+    DataPointService,
+)
+from services.task_service import (
+    TaskService,
+)
 
 router = APIRouter(prefix="/api/v1", tags=["database"])
 
@@ -41,21 +61,47 @@ router = APIRouter(prefix="/api/v1", tags=["database"])
 # User endpoints
 @router.get("/users", response_model=List[UserResponse])
 async def get_users(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, le=1000),
     db: Session = Depends(get_db)
 ):
     """Get all users with pagination."""
-    users = db.query(User).offset(skip).limit(limit).all()
+    query = db.query(User)
+
+    version = collection_version(
+        query, User.id, User.created_at, User.updated_at
+    )
+    cached = conditional(
+        request, response, make_etag("users", skip, limit, *version)
+    )
+    if cached:
+        return cached
+
+    users = query.offset(skip).limit(limit).all()
     return users
 
 
 @router.get("/users/{user_id}", response_model=UserResponse)
-async def get_user(user_id: int, db: Session = Depends(get_db)):
+async def get_user(
+    user_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db)
+):
     """Get a specific user by ID."""
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+
+    cached = conditional(
+        request,
+        response,
+        make_etag("user", user.id, user.created_at, user.updated_at),
+    )
+    if cached:
+        return cached
     return user
 
 
@@ -83,6 +129,8 @@ async def create_user(user: UserCreate, db: Session = Depends(get_db)):
 # Task endpoints
 @router.get("/tasks", response_model=List[TaskResponse])
 async def get_tasks(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, le=1000),
     status: Optional[str] = Query(None),
@@ -98,16 +146,85 @@ async def get_tasks(
     if user_id:
         query = query.filter(Task.user_id == user_id)
 
+    version = collection_version(
+        query, Task.id, Task.created_at, Task.updated_at
+    )
+    cached = conditional(
+        request,
+        response,
+        make_etag("tasks", skip, limit, status, user_id, *version),
+    )
+    if cached:
+        return cached
+
     tasks = query.offset(skip).limit(limit).all()
     return tasks
 
 
+@router.post("/tasks/bulk", response_model=TaskBulkCreateResponse)
+async def create_tasks_bulk(
+    request: TaskBulkCreate, db: Session = Depends(get_db)
+):
+    """Create many tasks in one statement; tasks fail per item."""
+    created = TaskService.bulk_create(
+        db, [task.model_dump() for task in request.tasks]
+    )
+    results = [
+        {"index": index, "status": "created", "task": task}
+        if task is not None
+        else {"index": index, "status": "error", "detail": "User not found"}
+        for index, task in enumerate(created)
+    ]
+    succeeded = sum(task is not None for task in created)
+    return {
+        "created": succeeded,
+        "failed": len(created) - succeeded,
+        "results": results,
+    }
+
+
+@router.patch("/tasks/status", response_model=TaskStatusUpdateResponse)
+async def update_task_statuses(
+    request: TaskStatusUpdate, db: Session = Depends(get_db)
+):
+    """Set one status on many tasks in one statement."""
+    updated = set(
+        TaskService.bulk_update_status(db, request.ids, request.status)
+    )
+    results = [
+        {
+            "id": task_id,
+            "result": "updated" if task_id in updated else "not_found",
+        }
+        for task_id in dict.fromkeys(request.ids)
+    ]
+    return {
+        "status": request.status,
+        "updated": len(updated),
+        "not_found": len(results) - len(updated),
+        "results": results,
+    }
+
+
 @router.get("/tasks/{task_id}", response_model=TaskResponse)
-async def get_task(task_id: int, db: Session = Depends(get_db)):
+async def get_task(
+    task_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db)
+):
     """Get a specific task by ID."""
     task = db.query(Task).filter(Task.id == task_id).first()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
+
+    cached = conditional(
+        request,
+        response,
+        make_etag("task", task.id, task.created_at, task.updated_at),
+    )
+    if cached:
+        return cached
     return task
 
 
@@ -148,6 +265,8 @@ async def update_task(
 # DataPoint endpoints
 @router.get("/data-points", response_model=List[DataPointResponse])
 async def get_data_points(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, le=1000),
     task_id: Optional[int] = Query(None),
@@ -163,6 +282,21 @@ async def get_data_points(
     if data_type:
         query = query.filter(DataPoint.data_type == data_type)
 
+    version = collection_version(
+        query,
+        DataPoint.id,
+        DataPoint.timestamp,
+        DataPoint.created_at,
+        DataPoint.updated_at,
+    )
+    cached = conditional(
+        request,
+        response,
+        make_etag("data-points", skip, limit, task_id, data_type, *version),
+    )
+    if cached:
+        return cached
+
     data_points = query.offset(skip).limit(limit).all()
     return data_points
 
@@ -178,16 +312,56 @@ async def create_data_point(
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    db_data_point = DataPoint(**data_point.dict())
-    db.add(db_data_point)
-    db.commit()
-    db.refresh(db_data_point)
-    return db_data_point
+    values = data_point.model_dump(exclude_none=True)
+    dedup_key = DataPointService.dedup_key(values)
+    if dedup_key is None:
+        db_data_point = DataPoint(**values)
+        db.add(db_data_point)
+        db.commit()
+        db.refresh(db_data_point)
+        return db_data_point
+
+    # Idempotent: a replayed reading returns the row already stored
+    DataPointService.upsert_many(db, [values])
+    return db.query(DataPoint).filter(DataPoint.dedup_key == dedup_key).one()
+
+
+@router.post("/data-points/bulk", response_model=DataPointBulkCreateResponse)
+async def create_data_points_bulk(
+    request: DataPointBulkCreate, db: Session = Depends(get_db)
+):
+    """Ingest many data points in one upsert; duplicates are cheap."""
+    data_points = [
+        data_point.model_dump(exclude_none=True)
+        for data_point in request.data_points
+    ]
+    task_ids = {data_point["task_id"] for data_point in data_points}
+    found = {
+        task_id
+        for (task_id,) in db.query(Task.id).filter(Task.id.in_(task_ids))
+    }
+    missing_task = [
+        index
+        for index, data_point in enumerate(data_points)
+        if data_point["task_id"] not in found
+    ]
+    valid = [dp for dp in data_points if dp["task_id"] in found]
+
+    written = DataPointService.upsert_many(db, valid, request.on_conflict)
+    return {
+        "received": len(data_points),
+        "written": written,
+        "duplicates": len(valid) - written,
+        "failed": len(missing_task),
+        "missing_task": missing_task,
+    }
 
 
 # Analytics endpoints
 @router.get("/analytics/user-stats")
-async def get_user_stats(db: Session = Depends(get_db)):
+async def get_user_stats(
+    request: Request, response: Response, db: Session = Depends(get_db)
+):
     """Get user statistics."""
     from sqlalchemy import (
         func,
@@ -214,7 +388,7 @@ async def get_user_stats(db: Session = Depends(get_db)):
         total_tasks = stats.total_tasks or 0
         total_data_points = stats.total_data_points or 0
 
-    return {
+    result = {
         "total_users": total_users,
         "total_tasks": total_tasks,
         "total_data_points": total_data_points,
@@ -224,9 +398,16 @@ async def get_user_stats(db: Session = Depends(get_db)):
         ]
     }
 
+    cached = conditional(request, response, content_etag(result))
+    if cached:
+        return cached
+    return result
+
 
 @router.get("/analytics/task-completion")
-async def get_task_completion_data(db: Session = Depends(get_db)):
+async def get_task_completion_data(
+    request: Request, response: Response, db: Session = Depends(get_db)
+):
     """Get task completion analytics from data points."""
     from sqlalchemy import (
         text,
@@ -246,7 +427,7 @@ async def get_task_completion_data(db: Session = Depends(get_db)):
         LIMIT 20
     """)).fetchall()
 
-    return [
+    result = [
         {
             "task_title": row.title,
             "task_status": row.status,
@@ -255,3 +436,8 @@ async def get_task_completion_data(db: Session = Depends(get_db)):
         }
         for row in completion_data
     ]
+
+    cached = conditional(request, response, content_etag(result))
+    if cached:
+        return cached
+    return result
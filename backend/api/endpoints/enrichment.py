@@ -0,0 +1,39 @@
+import asyncio
+
+from fastapi import (
+    APIRouter,
+    HTTPException,
+)
+
+from schemas.aurora_schemas import (
+    EnrichmentRequest,
+)
+from services.process_pool import (
+    PoolSaturatedError,
+    get_process_pool,
+)
+from services.workflow_service import (
+    DataPipeline,
+)
+
+router = APIRouter(prefix="/api/v1/enrichment", tags=["enrichment"])
+
+
+@router.post("")
+async def enrich_records(request: EnrichmentRequest):
+    """Enrich records synchronously, off the event loop"""
+    records = [
+        {"data_type": request.data_type, **record}
+        for record in request.records
+    ]
+    try:
+        job = await get_process_pool().run(DataPipeline.enrich, records)
+    except PoolSaturatedError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Enrichment is at capacity, retry later",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Enrichment timed out")
+    return {"records": job.result, "timing": job.timing()}
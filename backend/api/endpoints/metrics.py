@@ -0,0 +1,54 @@
+from typing import (
+    Optional,
+)
+
+from fastapi import (
+    APIRouter,
+)
+
+from core.middleware import (
+    get_admission_controller,
+)
+from services.idempotency import (
+    get_idempotency_store,
+)
+from services.process_pool import (
+    get_process_pool,
+)
+
+router = APIRouter(prefix="/api/v1/metrics", tags=["metrics"])
+
+
+@router.get("/idempotency")
+def idempotency_metrics():
+    """Claims, skipped duplicates and duplicate hit rate"""
+    return get_idempotency_store().stats()
+
+
+@router.get("/admission")
+def admission_metrics():
+    """In-flight requests, rejections and queue wait per route group"""
+    return get_admission_controller().stats()
+
+
+@router.get("/process-pool")
+def process_pool_metrics():
+    """In-flight jobs, rejections and job timings of the API's pool"""
+    return get_process_pool().stats()
+
+
+@router.get("/autoscaling")
+def autoscaling_signals(running_workers: Optional[int] = None):
+    """
+    Queue depth, processing rate and desired workers per queue.
+
+    Read-only: the publish_scaling_signals beat task puts them into
+    CloudWatch every minute.
+    """
+    # Imported here so the API cold start doesn't pay for boto3
+    from services.autoscaling import (
+        AutoscalingService,
+    )
+
+    signals = AutoscalingService().signals(running_workers=running_workers)
+    return {"queues": signals}
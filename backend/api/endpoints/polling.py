@@ -0,0 +1,42 @@
+from typing import (
+    List,
+)
+
+from fastapi import (
+    APIRouter,
+)
+
+from schemas.aurora_schemas import (
+    PollingSourceCreate,
+    PollingSourceResponse,
+)
+
+router = APIRouter(prefix="/api/v1/polling-sources", tags=["polling"])
+
+
+def _scheduler():
+    # Imported here so the API cold start doesn't pay for the workers
+    from workers.scheduler import (
+        PollScheduler,
+    )
+
+    return PollScheduler()
+
+
+@router.get("", response_model=List[PollingSourceResponse])
+def list_polling_sources():
+    """Sources polled by the worker scheduler, with their next run"""
+    return _scheduler().sources()
+
+
+@router.put("", response_model=PollingSourceResponse)
+def register_polling_source(source: PollingSourceCreate):
+    """
+    Add a source, or change the cadence or enabled flag of one with the
+    same URL. Disabling stops new polls; a running one still finishes.
+    """
+    scheduler = _scheduler()
+    source_id = scheduler.register(
+        source.url, source.data_type, source.interval_seconds, source.enabled
+    )
+    return scheduler.get(source_id)
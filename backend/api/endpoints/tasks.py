@@ -0,0 +1,38 @@
+from fastapi import (
+    APIRouter,
+)
+
+router = APIRouter(prefix="/api/v1/tasks", tags=["tasks"])
+
+
+@router.get("/{celery_id}/status")
+def task_status(celery_id: str):
+    """Latest Celery state of a task; unknown or expired ids are PENDING"""
+    # Imported here so the API cold start doesn't pay for Celery
+    from celery import (
+        states,
+    )
+
+    from services.result_store import (
+        get_result_store,
+    )
+
+    meta = get_result_store().get(celery_id) or {
+        "status": states.PENDING,
+        "result": None,
+    }
+    status = {
+        "task_id": celery_id,
+        "status": meta["status"],
+        "result": meta.get("result"),
+        "date_done": meta.get("date_done"),
+    }
+    if meta["status"] in states.EXCEPTION_STATES:
+        # Exceptions are stored as {"exc_type", "exc_message", ...}
+        error = meta.get("result") or {}
+        status["result"] = None
+        status["error"] = {
+            "type": error.get("exc_type"),
+            "message": error.get("exc_message"),
+        }
+    return status
@@ -0,0 +1,19 @@
+from fastapi import (
+    APIRouter,
+    HTTPException,
+)
+
+from services.workflow_store import (
+    get_workflow_store,
+)
+
+router = APIRouter(prefix="/api/v1/workflows", tags=["workflows"])
+
+
+@router.get("/{workflow_id}")
+def workflow_progress(workflow_id: str):
+    """Status of a workflow run and each of its checkpointed steps"""
+    progress = get_workflow_store().progress(workflow_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Workflow not found")
+    return progress
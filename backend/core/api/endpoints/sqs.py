@@ -17,7 +17,7 @@ from pydantic import (
 )
 
 from services.aws.sqs.service import (
-    sqs_service,
+    get_sqs_service,
 )
 
 router = APIRouter(prefix="/sqs", tags=["SQS"])
@@ -40,7 +40,7 @@ class MessageResponse(BaseModel):
 async def send_message(request: SendMessageRequest):
     """Send a message to an SQS queue"""
     try:
-        result = sqs_service.send_message(
+        result = get_sqs_service().send_message(
             queue_name=request.queue_name,
             message_body=request.message,
             message_attributes=request.attributes,
@@ -57,7 +57,7 @@ async def send_message(request: SendMessageRequest):
 async def receive_messages(queue_name: str, max_messages: int = 5):
     """Receive messages from an SQS queue"""
     try:
-        messages = sqs_service.receive_messages(queue_name, max_messages)
+        messages = get_sqs_service().receive_messages(queue_name, max_messages)
         return {
             "queue": queue_name,
             "message_count": len(messages),
@@ -74,7 +74,7 @@ async def receive_messages(queue_name: str, max_messages: int = 5):
 async def delete_message(queue_name: str, receipt_handle: str):
     """Delete a message from an SQS queue"""
     try:
-        sqs_service.delete_message(queue_name, receipt_handle)
+        get_sqs_service().delete_message(queue_name, receipt_handle)
         return {"status": "deleted", "queue": queue_name}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -87,7 +87,7 @@ async def delete_message(queue_name: str, receipt_handle: str):
 async def list_queues():
     """List available SQS queues"""
     return {
-        "available_queues": list(sqs_service.queue_urls.keys()),
+        "available_queues": list(get_sqs_service().queue_urls.keys()),
         "region": "us-east-1",
     }
 
@@ -106,7 +106,7 @@ async def send_test_message():
     }
 
     try:
-        result = sqs_service.send_message("default", test_message)
+        result = get_sqs_service().send_message("default", test_message)
         return {
             "status": "success",
             "test_message": test_message,
@@ -120,6 +120,8 @@ async def send_test_message():
 async def get_queue_info(queue_name: str):
     """Get detailed information about a specific SQS queue"""
     try:
+        sqs_service = get_sqs_service()
+
         # Get queue URL
         if queue_name not in sqs_service.queue_urls:
             raise ValueError(f"Unknown queue: {queue_name}")
@@ -1,5 +1,6 @@
 import os
 from typing import (
+    Dict,
     List,
     Optional,
     Union,
@@ -30,6 +31,94 @@ class Settings(BaseSettings):
         "rds.amazonaws.com:5432/wipsie"
     )
 
+    # Response compression (bodies below this size are sent as-is)
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_LEVEL: int = 6
+
+    # Data analysis engine (column arrays must fit in the memory budget)
+    ANALYSIS_MEMORY_BUDGET_MB: int = 512
+    ANALYSIS_FETCH_CHUNK_SIZE: int = 50_000
+    ANALYSIS_ROLLING_WINDOW: int = 60
+    ANALYSIS_ZSCORE_THRESHOLD: float = 3.0
+
+    # Data cleanup deletes in committed chunks with a pause in between
+    CLEANUP_CHUNK_SIZE: int = 5000
+    CLEANUP_THROTTLE_SECONDS: float = 0.1
+
+    # Reports stream to S3 in multipart uploads of this part size
+    REPORTS_BUCKET: Optional[str] = None
+    REPORT_FETCH_CHUNK_SIZE: int = 10_000
+    S3_MULTIPART_PART_SIZE: int = 8 * 1024 * 1024
+
+    # Message deduplication: "database", "redis" or "memory"
+    IDEMPOTENCY_BACKEND: str = "database"
+    IDEMPOTENCY_TTL_SECONDS: int = 24 * 60 * 60
+    IDEMPOTENCY_LEASE_SECONDS: int = 10 * 60
+
+    # Task results: "database", "redis" or "memory". Workers buffer state
+    # changes and write them in batches every RESULT_STORE_FLUSH_SECONDS
+    RESULT_STORE_BACKEND: str = "database"
+    RESULT_STORE_TTL_SECONDS: int = 24 * 60 * 60
+    RESULT_STORE_FLUSH_SECONDS: float = 2.0
+    RESULT_STORE_BATCH_SIZE: int = 500
+
+    # Records per parallel enrichment task in data pipeline workflows
+    WORKFLOW_CHUNK_SIZE: int = 500
+    # Running workflows without a finished step for this long are resumed
+    WORKFLOW_STALL_SECONDS: int = 15 * 60
+
+    # Worker poll scheduler: beat ticks every POLL_SCHEDULER_TICK_SECONDS
+    # and queues the sources that are due. Each next run is spread by
+    # +/- POLL_SCHEDULER_JITTER of its interval; failing sources back off
+    # exponentially up to POLL_SCHEDULER_MAX_BACKOFF_SECONDS
+    POLL_SCHEDULER_TICK_SECONDS: float = 15.0
+    POLL_SCHEDULER_BATCH_SIZE: int = 100
+    POLL_SCHEDULER_JITTER: float = 0.1
+    POLL_SCHEDULER_MAX_BACKOFF_SECONDS: int = 60 * 60
+    # A poll still marked running after this long is presumed lost
+    POLL_SCHEDULER_LEASE_SECONDS: int = 5 * 60
+
+    # Most tasks per bulk create or status update request, and most data
+    # points per bulk ingestion request
+    TASK_BULK_MAX_ITEMS: int = 1000
+    DATA_POINT_BULK_MAX_ITEMS: int = 1000
+
+    # Admission control: max requests in flight per path prefix (longest
+    # match wins). /api/v1 matches SQLAlchemy's default pool of 5 + 10
+    # overflow connections. Excess requests queue up to
+    # ADMISSION_MAX_QUEUE deep for ADMISSION_QUEUE_TIMEOUT_SECONDS
+    ADMISSION_LIMITS: Dict[str, int] = {
+        "/api/v1/enrichment": 32,
+        "/api/v1": 15,
+    }
+    ADMISSION_MAX_QUEUE: int = 100
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 5.0
+    ADMISSION_BYPASS_PATHS: List[str] = ["/health"]
+
+    # Rate limiting: a token bucket per API key (or client IP) of
+    # RATE_LIMIT_CAPACITY tokens refilling at RATE_LIMIT_REFILL_PER_SECOND.
+    # Requests cost 1 token unless their path prefix has a cost here.
+    # Backend "memory" (per instance) or "redis" (shared by the fleet)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_CAPACITY: int = 120
+    RATE_LIMIT_REFILL_PER_SECOND: float = 2.0
+    RATE_LIMIT_ROUTE_COSTS: Dict[str, int] = {
+        "/api/v1/analytics": 10,
+        "/api/v1/enrichment": 5,
+    }
+    # Only behind a proxy that sets X-Forwarded-For (ALB, API Gateway)
+    RATE_LIMIT_TRUST_FORWARDED: bool = False
+
+    # CPU-bound work inside the API runs in a process pool; at most
+    # PROCESS_POOL_WORKERS running plus PROCESS_POOL_MAX_PENDING queued
+    # jobs, beyond which requests get a 503 with Retry-After
+    PROCESS_POOL_WORKERS: int = max(1, (os.cpu_count() or 2) - 1)
+    PROCESS_POOL_MAX_PENDING: int = 16
+    PROCESS_POOL_TIMEOUT_SECONDS: float = 30.0
+    # "spawn" so workers don't inherit the server's threads and sockets
+    PROCESS_POOL_START_METHOD: str = "spawn"
+
     # Redis (Optional - keeping for caching if needed)
     REDIS_URL: str = "redis://redis:6379"
 
@@ -52,6 +141,35 @@ class Settings(BaseSettings):
     SQS_TASK_PROCESSING_QUEUE: str = f"{SQS_QUEUE_PREFIX}-task-processing"
     SQS_NOTIFICATIONS_QUEUE: str = f"{SQS_QUEUE_PREFIX}-notifications"
 
+    # Share of polls each priority lane gets (weighted-fair consumer)
+    SQS_PRIORITY_WEIGHTS: Dict[str, int] = {"high": 6, "medium": 3, "low": 1}
+
+    # Message bodies over the first size are compressed (gzip or zstd);
+    # still over the second, they are stored in the claim-check bucket
+    # (or directory when no bucket is set) and sent as a pointer
+    SQS_COMPRESS_THRESHOLD_BYTES: int = 8 * 1024
+    SQS_CLAIM_CHECK_THRESHOLD_BYTES: int = 192 * 1024
+    SQS_PAYLOAD_ENCODING: str = "gzip"
+    SQS_CLAIM_CHECK_BUCKET: Optional[str] = None
+    SQS_CLAIM_CHECK_DIR: str = "/tmp/wipsie-claim-checks"
+
+    # Worker autoscaling signal: keep each queue's backlog drainable in
+    # AUTOSCALING_TARGET_SECONDS at the measured per-worker processing rate
+    WORKER_CONCURRENCY: int = 4
+    # Pool of the IO-bound worker profile: "threads", or "gevent" with the
+    # workers extra installed
+    WORKER_IO_POOL: str = "threads"
+    WORKER_IO_CONCURRENCY: int = 32
+    AUTOSCALING_TARGET_SECONDS: float = 60.0
+    AUTOSCALING_WINDOW_SECONDS: int = 60
+    AUTOSCALING_LOOKBACK_WINDOWS: int = 15
+    AUTOSCALING_SMOOTHING: float = 0.3
+    AUTOSCALING_DEFAULT_RATE: float = 1.0
+    AUTOSCALING_FLUSH_SECONDS: float = 10.0
+    AUTOSCALING_MIN_WORKERS: int = 0
+    AUTOSCALING_MAX_WORKERS: int = 20
+    AUTOSCALING_METRIC_NAMESPACE: str = "Wipsie/Workers"
+
     # Celery Configuration with SQS
     @property
     def CELERY_BROKER_URL(self) -> str:
@@ -60,8 +178,8 @@ class Settings(BaseSettings):
 
     @property
     def CELERY_RESULT_BACKEND(self) -> str:
-        # For results, we can use database or S3, using db:// for simplicity
-        return f"db+{self.DATABASE_URL}"
+        # Batched, expiring result store instead of a DB write per update
+        return "services.result_store:ResultStoreBackend"
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,97 @@
+"""
+HTTP conditional request helpers.
+Builds strong ETags for collection and item responses and answers
+If-None-Match revalidation with 304 Not Modified.
+"""
+
+import hashlib
+import json
+from typing import (
+    Any,
+    Optional,
+)
+
+from fastapi import (
+    Request,
+    Response,
+    status,
+)
+from fastapi.encoders import (
+    jsonable_encoder,
+)
+from sqlalchemy import (
+    func,
+)
+from sqlalchemy.orm import (
+    Query,
+)
+
+# Clients must revalidate, but may keep the body for a 304
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a strong ETag from version components"""
+    raw = "|".join(str(part) for part in parts)
+    digest = hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def content_etag(payload: Any) -> str:
+    """Build a strong ETag from the JSON representation of a payload"""
+    body = json.dumps(
+        jsonable_encoder(payload), sort_keys=True, separators=(",", ":")
+    )
+    return make_etag(body)
+
+
+def collection_version(query: Query, id_column, *timestamp_columns) -> tuple:
+    """
+    Cheap version fingerprint of a filtered query.
+
+    Returns (row count, max id, max of each timestamp column). Any insert,
+    delete or update that bumps a timestamp changes the fingerprint, so
+    the ETag can be checked before rows are loaded and serialized. Call
+    this before applying offset/limit.
+    """
+    entities = [func.count(id_column), func.max(id_column)]
+    entities.extend(func.max(column) for column in timestamp_columns)
+    return tuple(query.order_by(None).with_entities(*entities).one())
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check If-None-Match using the weak comparison RFC 9110 requires"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == bare
+        for candidate in header.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    """304 response carrying the current validator"""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
+
+def conditional(
+    request: Request, response: Response, etag: str
+) -> Optional[Response]:
+    """
+    Set validator headers on ``response``.
+
+    Returns a 304 response when the client already holds ``etag``,
+    otherwise ``None`` and the route continues building its body.
+    """
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return None
@@ -0,0 +1,21 @@
+"""
+ASGI middleware used by the FastAPI application
+"""
+
+from .admission import (
+    AdmissionControlMiddleware,
+    get_admission_controller,
+)
+from .compression import (
+    CompressionMiddleware,
+)
+from .rate_limit import (
+    RateLimitMiddleware,
+)
+
+__all__ = [
+    "AdmissionControlMiddleware",
+    "CompressionMiddleware",
+    "RateLimitMiddleware",
+    "get_admission_controller",
+]
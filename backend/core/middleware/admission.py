@@ -0,0 +1,251 @@
+"""
+Admission control middleware.
+Caps the requests in flight per route group so a spike queues at the
+edge instead of exhausting the database pool. Requests over the cap
+wait in a bounded FIFO queue for up to the queue timeout; when the
+queue is full, or its expected wait exceeds the timeout, they are
+rejected at once with 503 and Retry-After. Bypass paths (/health) are
+never queued.
+"""
+
+import asyncio
+import math
+import time
+from collections import (
+    deque,
+)
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+)
+
+from starlette.responses import (
+    JSONResponse,
+)
+from starlette.types import (
+    ASGIApp,
+    Receive,
+    Scope,
+    Send,
+)
+
+from core.config import (
+    settings,
+)
+
+# Recent queue waits kept per group for the percentile metrics
+WAIT_SAMPLES = 1000
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class RouteGroup:
+    """In-flight limit and FIFO wait queue for one path prefix"""
+
+    def __init__(
+        self,
+        prefix: str,
+        max_in_flight: int,
+        max_queue: int,
+        queue_timeout: float,
+    ):
+        self.prefix = prefix
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._waiters: deque = deque()
+        # Moving average of time in the app, for wait estimates
+        self._service_seconds = 0.0
+        self._waits: deque = deque(maxlen=WAIT_SAMPLES)
+        self.counters = {
+            "admitted": 0,
+            "queued": 0,
+            "rejected_full": 0,
+            "rejected_timeout": 0,
+        }
+
+    def _expected_wait(self) -> float:
+        waves = (len(self._waiters) + 1) / self.max_in_flight
+        return waves * self._service_seconds
+
+    def _retry_after(self) -> int:
+        return max(1, math.ceil(self._expected_wait()))
+
+    async def acquire(self) -> float:
+        """Take a slot, waiting if needed; returns the seconds waited"""
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            self.counters["admitted"] += 1
+            self._waits.append(0.0)
+            return 0.0
+
+        if (
+            len(self._waiters) >= self.max_queue
+            or self._expected_wait() > self.queue_timeout
+        ):
+            # Shed now rather than after a wait that can't succeed
+            self.counters["rejected_full"] += 1
+            raise AdmissionRejected("queue full", self._retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.counters["queued"] += 1
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(waiter), self.queue_timeout
+            )
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # The slot was handed over just as the wait ran out
+                self.release()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            self.counters["rejected_timeout"] += 1
+            raise AdmissionRejected("queue timeout", self._retry_after())
+        except asyncio.CancelledError:
+            # Client went away while queued
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            elif waiter in self._waiters:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            raise
+
+        waited = time.perf_counter() - started
+        self.counters["admitted"] += 1
+        self._waits.append(waited)
+        return waited
+
+    def release(self, service_seconds: Optional[float] = None):
+        """Free a slot, handing it straight to the next waiter"""
+        if service_seconds is not None:
+            self._service_seconds += 0.2 * (
+                service_seconds - self._service_seconds
+            )
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        waits = list(self._waits)
+        return {
+            "prefix": self.prefix,
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self.in_flight,
+            "queued_now": len(self._waiters),
+            **self.counters,
+            "avg_service_seconds": round(self._service_seconds, 4),
+            "queue_wait_seconds": {
+                "p50": round(_percentile(waits, 0.50), 4),
+                "p95": round(_percentile(waits, 0.95), 4),
+                "p99": round(_percentile(waits, 0.99), 4),
+                "max": round(max(waits, default=0.0), 4),
+            },
+        }
+
+
+class AdmissionController:
+    """Route groups by longest matching path prefix"""
+
+    def __init__(
+        self,
+        limits: Dict[str, int],
+        max_queue: int = 100,
+        queue_timeout: float = 5.0,
+        bypass_paths: Iterable[str] = ("/health",),
+    ):
+        self.groups = [
+            RouteGroup(prefix, limit, max_queue, queue_timeout)
+            for prefix, limit in sorted(
+                limits.items(), key=lambda item: len(item[0]), reverse=True
+            )
+        ]
+        self.bypass_paths = set(bypass_paths)
+
+    def group_for(self, path: str) -> Optional[RouteGroup]:
+        if path in self.bypass_paths:
+            return None
+        for group in self.groups:
+            if path.startswith(group.prefix):
+                return group
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"groups": [group.stats() for group in self.groups]}
+
+
+class AdmissionControlMiddleware:
+    """
+    Admit HTTP requests through an AdmissionController.
+
+    Requests outside every group (and bypass paths) pass straight
+    through. Rejections are ``503`` with ``Retry-After`` in seconds.
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        group = self.controller.group_for(scope["path"])
+        if group is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await group.acquire()
+        except AdmissionRejected as e:
+            response = JSONResponse(
+                {"detail": f"Server busy ({e.reason}), retry later"},
+                status_code=503,
+                headers={"Retry-After": str(e.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            group.release(time.perf_counter() - started)
+
+
+_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    # Only touched from the event loop, so no lock
+    global _controller
+    if _controller is None:
+        _controller = AdmissionController(
+            settings.ADMISSION_LIMITS,
+            max_queue=settings.ADMISSION_MAX_QUEUE,
+            queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+            bypass_paths=settings.ADMISSION_BYPASS_PATHS,
+        )
+    return _controller
@@ -0,0 +1,296 @@
+"""
+Rate limiting middleware.
+Token bucket per API client, keyed by X-API-Key or else client IP. A
+bucket holds up to RATE_LIMIT_CAPACITY tokens and refills at
+RATE_LIMIT_REFILL_PER_SECOND; each request spends its route's cost,
+so analytics queries drain a client faster than item reads. Responses
+carry the RateLimit-* headers; refused requests get 429 with
+Retry-After.
+"""
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from typing import (
+    Callable,
+    Dict,
+    Optional,
+    Tuple,
+)
+
+from starlette.concurrency import (
+    run_in_threadpool,
+)
+from starlette.datastructures import (
+    Headers,
+    MutableHeaders,
+)
+from starlette.responses import (
+    JSONResponse,
+)
+from starlette.types import (
+    ASGIApp,
+    Message,
+    Receive,
+    Scope,
+    Send,
+)
+
+from core.config import (
+    settings,
+)
+
+logger = logging.getLogger(__name__)
+
+# (allowed, tokens left, seconds until the request could go through)
+Decision = Tuple[bool, float, float]
+
+
+def _refill(
+    tokens: float,
+    updated: float,
+    now: float,
+    capacity: int,
+    rate: float,
+    cost: int,
+) -> Tuple[float, Decision]:
+    tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+    if tokens >= cost:
+        return tokens - cost, (True, tokens - cost, 0.0)
+    return tokens, (False, tokens, (cost - tokens) / rate)
+
+
+class MemoryRateLimiter:
+    """Buckets in this process; limits are per API instance"""
+
+    backend = "memory"
+    # take() never waits on I/O, so it runs on the event loop
+    blocking = False
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.monotonic,
+        max_buckets: int = 100_000,
+    ):
+        self.clock = clock
+        self.max_buckets = max_buckets
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def take(
+        self, key: str, cost: int, capacity: int, rate: float
+    ) -> Decision:
+        now = self.clock()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens, decision = _refill(
+                tokens, updated, now, capacity, rate, cost
+            )
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_buckets:
+                self._evict_full(now, capacity, rate)
+        return decision
+
+    def _evict_full(self, now: float, capacity: int, rate: float):
+        # A bucket that has refilled to capacity equals a missing one
+        self._buckets = {
+            key: (tokens, updated)
+            for key, (tokens, updated) in self._buckets.items()
+            if tokens + (now - updated) * rate < capacity
+        }
+
+
+# Refill and spend atomically; Redis' clock keeps the fleet consistent
+_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens),
+           'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisRateLimiter:
+    """Buckets shared by every API instance; needs the redis package"""
+
+    backend = "redis"
+    # take() is a network round trip: the middleware runs it in a thread
+    blocking = True
+
+    def __init__(
+        self,
+        url: str,
+        prefix: str = "rate-limit:",
+        timeout_seconds: float = 0.5,
+    ):
+        import redis
+
+        # A slow Redis fails open quickly instead of holding threads
+        self.client = redis.Redis.from_url(
+            url,
+            socket_timeout=timeout_seconds,
+            socket_connect_timeout=timeout_seconds,
+        )
+        self.client.ping()
+        self.prefix = prefix
+        self._take = self.client.register_script(_TAKE_SCRIPT)
+
+    def take(
+        self, key: str, cost: int, capacity: int, rate: float
+    ) -> Decision:
+        allowed, tokens = self._take(
+            keys=[self.prefix + key], args=[capacity, rate, cost]
+        )
+        tokens = float(tokens)
+        if allowed:
+            return True, tokens, 0.0
+        return False, tokens, (cost - tokens) / rate
+
+
+def client_key(scope: Scope, trust_forwarded: bool = False) -> str:
+    """Bucket key: the API key when sent, else the client's IP"""
+    headers = Headers(scope=scope)
+    api_key = headers.get("x-api-key")
+    if api_key:
+        # Hashed so raw keys never sit in memory dumps or Redis
+        return "key:" + hashlib.sha256(api_key.encode()).hexdigest()[:32]
+    forwarded = headers.get("x-forwarded-for")
+    if trust_forwarded and forwarded:
+        return "ip:" + forwarded.split(",")[0].strip()
+    client = scope.get("client")
+    return "ip:" + (client[0] if client else "unknown")
+
+
+class RateLimitMiddleware:
+    """
+    Apply a token bucket to every request under ``prefix``.
+
+    ``costs`` maps path prefixes to token costs (longest match wins,
+    default 1). If the limiter backend fails the request is let
+    through: an outage of Redis must not take the API down with it.
+    Blocking limiters (Redis) run in the thread pool so a round trip
+    never stalls the event loop and every other request with it.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        capacity: int,
+        refill_per_second: float,
+        costs: Optional[Dict[str, int]] = None,
+        prefix: str = "/",
+        trust_forwarded: bool = False,
+        limiter=None,
+    ):
+        self.app = app
+        # None: the configured limiter, connected on the first request
+        self.limiter = limiter
+        self.capacity = capacity
+        self.rate = refill_per_second
+        self.costs = sorted(
+            (costs or {}).items(), key=lambda item: len(item[0]), reverse=True
+        )
+        self.prefix = prefix
+        self.trust_forwarded = trust_forwarded
+        window = math.ceil(capacity / refill_per_second)
+        self.policy = f"{capacity};w={window}"
+
+    def cost_of(self, path: str) -> int:
+        for prefix, cost in self.costs:
+            if path.startswith(prefix):
+                return cost
+        return 1
+
+    def headers(self, tokens: float) -> Dict[str, str]:
+        # Reset: seconds until the bucket is full again
+        reset = math.ceil((self.capacity - tokens) / self.rate)
+        return {
+            "RateLimit-Limit": str(self.capacity),
+            "RateLimit-Remaining": str(max(0, math.floor(tokens))),
+            "RateLimit-Reset": str(max(0, reset)),
+            "RateLimit-Policy": self.policy,
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not scope["path"].startswith(
+            self.prefix
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        cost = self.cost_of(scope["path"])
+        key = client_key(scope, self.trust_forwarded)
+        try:
+            # Connecting to Redis blocks too, so only the first request
+            # (or one after a reset) creates the limiter off the loop
+            limiter = (
+                self.limiter
+                or _limiter
+                or await run_in_threadpool(get_rate_limiter)
+            )
+            args = (key, cost, self.capacity, self.rate)
+            if getattr(limiter, "blocking", False):
+                allowed, tokens, retry_after = await run_in_threadpool(
+                    limiter.take, *args
+                )
+            else:
+                allowed, tokens, retry_after = limiter.take(*args)
+        except Exception as e:
+            logger.warning(f"⚠️ Rate limiter unavailable, allowing: {e}")
+            await self.app(scope, receive, send)
+            return
+
+        headers = self.headers(tokens)
+        if not allowed:
+            response = JSONResponse(
+                {"detail": "Rate limit exceeded"},
+                status_code=429,
+                headers={
+                    **headers,
+                    "Retry-After": str(max(1, math.ceil(retry_after))),
+                },
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).update(headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """Configured limiter, falling back to memory if it can't be reached"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            backend = settings.RATE_LIMIT_BACKEND
+            try:
+                if backend == "redis":
+                    _limiter = RedisRateLimiter(settings.REDIS_URL)
+            except Exception as e:
+                logger.warning(f"⚠️ {backend} rate limiter down: {e}")
+            if _limiter is None:
+                _limiter = MemoryRateLimiter()
+    return _limiter
@@ -1,6 +1,14 @@
+import os
+from typing import (
+    Optional,
+)
+
 from sqlalchemy import (
     create_engine,
 )
+from sqlalchemy.engine import (
+    Engine,
+)
 from sqlalchemy.ext.declarative import (
     declarative_base,
 )
@@ -12,12 +20,52 @@ from core.config import (
     settings,
 )
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+_engine: Optional[Engine] = None
+
+
+def get_engine() -> Engine:
+    """
+    Shared engine, created on first use.
+
+    create_engine imports the DB driver, so deferring it keeps Lambda
+    cold starts cheap for requests that never touch the database.
+    """
+    global _engine
+    if _engine is None:
+        _engine = create_engine(settings.DATABASE_URL)
+    return _engine
+
+
+def _reset_engine_after_fork():
+    # Pooled connections must not be shared with a forked child
+    if _engine is not None:
+        _engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_reset_engine_after_fork)
+
+
+class _LazySessionMaker(sessionmaker):
+    """sessionmaker that binds to the shared engine on first call"""
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
+
+SessionLocal = _LazySessionMaker(autocommit=False, autoflush=False)
 
 Base = declarative_base()
 
 
+def __getattr__(name: str):
+    # Backward compatible lazy access to the old module-level engine
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -1,24 +1,84 @@
+from contextlib import (
+    asynccontextmanager,
+)
+
 # Import your API router
 from api.endpoints.database import (
     router as database_router,
 )
+from api.endpoints.enrichment import (
+    router as enrichment_router,
+)
+from api.endpoints.metrics import (
+    router as metrics_router,
+)
+from api.endpoints.polling import (
+    router as polling_router,
+)
+from api.endpoints.tasks import (
+    router as tasks_router,
+)
+from api.endpoints.workflows import (
+    router as workflows_router,
+)
 from fastapi import (
     FastAPI,
 )
 from fastapi.middleware.cors import (
     CORSMiddleware,
 )
-from mangum import (
-    Mangum,
+from core.config import (
+    settings,
+)
+from core.middleware import (
+    AdmissionControlMiddleware,
+    CompressionMiddleware,
+    RateLimitMiddleware,
+    get_admission_controller,
+)
+from services.process_pool import (
+    get_process_pool,
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Worker processes spawn on the first CPU-bound job, not at startup
+    pool = get_process_pool()
+    pool.start()
+    try:
+        yield
+    finally:
+        pool.shutdown()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Wipsie Backend API",
     description="Learning management system backend",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
+# Cap requests in flight per route group; added first so it sits inside
+# CORS and its 503s still carry CORS headers
+app.add_middleware(
+    AdmissionControlMiddleware,
+    controller=get_admission_controller(),
+)
+
+# Per-client token buckets, checked before a request takes an admission
+# slot
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        capacity=settings.RATE_LIMIT_CAPACITY,
+        refill_per_second=settings.RATE_LIMIT_REFILL_PER_SECOND,
+        costs=settings.RATE_LIMIT_ROUTE_COSTS,
+        prefix=settings.API_V1_STR,
+        trust_forwarded=settings.RATE_LIMIT_TRUST_FORWARDED,
+    )
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -28,8 +88,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON responses (data-point lists, analytics)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    compresslevel=settings.COMPRESSION_LEVEL,
+)
+
 # Include routers
 app.include_router(database_router)
+app.include_router(enrichment_router)
+app.include_router(metrics_router)
+app.include_router(polling_router)
+app.include_router(tasks_router)
+app.include_router(workflows_router)
 
 # Health check endpoint
 
@@ -43,8 +115,21 @@ async def health_check():
 async def root():
     return {"message": "Welcome to Wipsie Backend API"}
 
-# Lambda handler for AWS Lambda deployment
-lambda_handler = Mangum(app)
+# Lambda handler for AWS Lambda deployment. The Mangum adapter is built on
+# the first invocation so importing this module stays cheap.
+_mangum_handler = None
+
+
+def lambda_handler(event, context):
+    global _mangum_handler
+    if _mangum_handler is None:
+        from mangum import (
+            Mangum,
+        )
+
+        _mangum_handler = Mangum(app)
+    return _mangum_handler(event, context)
+
 
 # For local development
 if __name__ == "__main__":
@@ -1,6 +1,9 @@
 from sqlalchemy import (
+    JSON,
+    Boolean,
     Column,
     DateTime,
+    Float,
     ForeignKey,
     Integer,
     String,
@@ -20,6 +23,9 @@ from db.database import (
     Base,
 )
 
+# JSONB on PostgreSQL; plain JSON on SQLite so the test database can be built
+JSONType = JSONB().with_variant(JSON(), "sqlite")
+
 
 class User(Base):
     __tablename__ = "users"
@@ -66,11 +72,135 @@ class DataPoint(Base):
     task_id = Column(Integer, ForeignKey("tasks.id"),
                      nullable=False, index=True)
     data_type = Column(String(50), nullable=False)
-    value_json = Column(JSONB)
-    meta_data = Column(JSONB)  # Renamed from metadata
+    value_json = Column(JSONType)
+    meta_data = Column(JSONType)  # Renamed from metadata
     timestamp = Column(DateTime(timezone=True),
                        server_default=func.now(), index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Natural key for idempotent ingestion; NULL rows are never deduped
+    dedup_key = Column(String(128), unique=True, index=True)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationship
     task = relationship("Task", back_populates="data_points")
+
+
+class UpstreamFetchState(Base):
+    """Conditional-request validators for a polled upstream URL"""
+
+    __tablename__ = "upstream_fetch_state"
+
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String(2048), unique=True, nullable=False)
+    etag = Column(String(255))
+    last_modified = Column(String(64))
+    content_hash = Column(String(64))
+    fetch_count = Column(Integer, default=0, nullable=False)
+    unchanged_count = Column(Integer, default=0, nullable=False)
+    last_fetched_at = Column(DateTime(timezone=True))
+    last_changed_at = Column(DateTime(timezone=True))
+
+
+class ProcessedMessage(Base):
+    """Idempotency record for a message handled by a worker"""
+
+    __tablename__ = "processed_messages"
+
+    key = Column(String(255), primary_key=True)
+    status = Column(String(20), nullable=False, default="in_progress")
+    # Celery task id holding the claim; a redelivery of it may take over
+    owner = Column(String(255), nullable=True)
+    hit_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+
+class QueueThroughput(Base):
+    """Worker acks per queue in fixed time windows, for autoscaling"""
+
+    __tablename__ = "queue_throughput"
+
+    queue = Column(String(255), primary_key=True)
+    window_start = Column(
+        DateTime(timezone=True), primary_key=True, index=True
+    )
+    acks = Column(Integer, default=0, nullable=False)
+    busy_seconds = Column(Float, default=0.0, nullable=False)
+
+
+class TaskResult(Base):
+    """Latest state of a Celery task, written in batches by the workers"""
+
+    __tablename__ = "task_results"
+
+    task_id = Column(String(255), primary_key=True)
+    status = Column(String(50), nullable=False)
+    # Celery result meta: result, traceback, date_done, children
+    meta = Column(Text, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+
+class Workflow(Base):
+    """A workflow run; its steps are checkpointed in workflow_steps"""
+
+    __tablename__ = "workflows"
+
+    id = Column(String(255), primary_key=True)
+    name = Column(String(100), nullable=False)
+    status = Column(String(20), nullable=False, default="running")
+    config = Column(JSONType, nullable=False)
+    error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Touched on every step transition, so stalled runs can be resumed
+    updated_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    steps = relationship(
+        "WorkflowStep",
+        back_populates="workflow",
+        cascade="all, delete-orphan",
+        order_by="WorkflowStep.position",
+    )
+
+
+class WorkflowStep(Base):
+    """Checkpoint of one workflow step: status, timing and output"""
+
+    __tablename__ = "workflow_steps"
+
+    workflow_id = Column(
+        String(255),
+        ForeignKey("workflows.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    name = Column(String(100), primary_key=True)
+    position = Column(Integer, nullable=False)
+    status = Column(String(20), nullable=False, default="pending")
+    attempts = Column(Integer, default=0, nullable=False)
+    items = Column(Integer)
+    seconds = Column(Float)
+    output = Column(JSONType)
+    error = Column(Text)
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+
+    workflow = relationship("Workflow", back_populates="steps")
+
+
+class PollingSource(Base):
+    """An upstream polled on its own cadence by the worker scheduler"""
+
+    __tablename__ = "polling_sources"
+
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String(2048), unique=True, nullable=False)
+    data_type = Column(String(50), nullable=False)
+    interval_seconds = Column(Integer, nullable=False)
+    enabled = Column(Boolean, default=True, nullable=False)
+    next_run_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    # Set while a poll is queued or running; ticks skip the source then
+    running_since = Column(DateTime(timezone=True))
+    consecutive_failures = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text)
+    last_started_at = Column(DateTime(timezone=True))
+    last_finished_at = Column(DateTime(timezone=True))
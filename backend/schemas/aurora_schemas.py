@@ -4,12 +4,19 @@ from datetime import (
 from typing import (
     Any,
     Dict,
+    List,
+    Literal,
     Optional,
 )
 
 from pydantic import (
     BaseModel,
     EmailStr,
+    Field,
+)
+
+from core.config import (
+    settings,
 )
 
 
@@ -55,6 +62,45 @@ class TaskResponse(TaskBase):
         from_attributes = True
 
 
+# Bulk task schemas: one statement per request, a result per item
+class TaskBulkCreate(BaseModel):
+    tasks: List[TaskCreate] = Field(
+        ..., min_length=1, max_length=settings.TASK_BULK_MAX_ITEMS
+    )
+
+
+class TaskBulkCreateResult(BaseModel):
+    index: int
+    status: str  # "created" or "error"
+    task: Optional[TaskResponse] = None
+    detail: Optional[str] = None
+
+
+class TaskBulkCreateResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[TaskBulkCreateResult]
+
+
+class TaskStatusUpdate(BaseModel):
+    ids: List[int] = Field(
+        ..., min_length=1, max_length=settings.TASK_BULK_MAX_ITEMS
+    )
+    status: str = Field(..., min_length=1, max_length=20)
+
+
+class TaskStatusResult(BaseModel):
+    id: int
+    result: str  # "updated" or "not_found"
+
+
+class TaskStatusUpdateResponse(BaseModel):
+    status: str
+    updated: int
+    not_found: int
+    results: List[TaskStatusResult]
+
+
 # DataPoint schemas
 class DataPointBase(BaseModel):
     data_type: str
@@ -64,6 +110,11 @@ class DataPointBase(BaseModel):
 
 class DataPointCreate(DataPointBase):
     task_id: int
+    # Reading time; defaults to when the row is written
+    timestamp: Optional[datetime] = None
+    # Client-supplied idempotency key; otherwise derived from task_id,
+    # data_type and timestamp when a timestamp is given
+    dedup_key: Optional[str] = Field(None, min_length=1, max_length=128)
 
 
 class DataPointResponse(DataPointBase):
@@ -71,6 +122,53 @@ class DataPointResponse(DataPointBase):
     task_id: int
     timestamp: datetime
     created_at: datetime
+    dedup_key: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+# Enrichment schemas
+class EnrichmentRequest(BaseModel):
+    records: List[Dict[str, Any]]
+    # Applied to records that don't carry their own data_type
+    data_type: str = "generic"
+
+
+class DataPointBulkCreate(BaseModel):
+    data_points: List[DataPointCreate] = Field(
+        ..., min_length=1, max_length=settings.DATA_POINT_BULK_MAX_ITEMS
+    )
+    # On a dedup_key conflict: "ignore" keeps the stored row, "update"
+    # overwrites its values
+    on_conflict: Literal["ignore", "update"] = "ignore"
+
+
+class DataPointBulkCreateResponse(BaseModel):
+    received: int
+    written: int
+    duplicates: int
+    failed: int
+    # Indexes of data points whose task doesn't exist
+    missing_task: List[int]
+
+
+# Scheduled polling sources
+class PollingSourceCreate(BaseModel):
+    url: str = Field(..., min_length=1, max_length=2048)
+    data_type: str = Field(..., min_length=1, max_length=50)
+    interval_seconds: int = Field(..., ge=1)
+    enabled: bool = True
+
+
+class PollingSourceResponse(PollingSourceCreate):
+    id: int
+    next_run_at: datetime
+    running_since: Optional[datetime] = None
+    consecutive_failures: int
+    last_error: Optional[str] = None
+    last_finished_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -0,0 +1,294 @@
+"""
+Data analysis engine.
+Loads a task's DataPoints into NumPy columns with a projected query and
+computes summary statistics, rolling windows and z-score anomalies with
+vectorized operations, in bounded memory.
+"""
+
+import logging
+import time
+from dataclasses import (
+    dataclass,
+)
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    Optional,
+    Tuple,
+)
+
+import numpy as np
+from sqlalchemy import (
+    func,
+    select,
+)
+from sqlalchemy.orm import (
+    Session,
+)
+
+from core.config import (
+    settings,
+)
+from core.db_functions.session import (
+    get_db_session,
+)
+from models.models import (
+    DataPoint,
+)
+from services.task_registry import (
+    ResourceHint,
+    registry,
+)
+
+logger = logging.getLogger(__name__)
+
+# float64 epoch seconds + float64 value
+BYTES_PER_ROW = 16
+
+# Rolling statistics run over blocks of this many points so the scratch
+# arrays stay a fixed size however long the series is
+ROLLING_BLOCK_SIZE = 1 << 20
+
+# Scratch arrays alive per rolling block (segment, cumsums, mean, std, z)
+ROLLING_SCRATCH_ARRAYS = 8
+
+
+@dataclass
+class SeriesColumns:
+    """A time series as parallel columns, ordered by timestamp"""
+
+    timestamps: np.ndarray
+    values: np.ndarray
+    total_rows: int
+    truncated: bool = False
+
+
+def max_rows_for_budget(memory_budget_mb: int) -> int:
+    """Rows whose columns fit the budget next to the rolling scratch space"""
+    scratch = ROLLING_BLOCK_SIZE * 8 * ROLLING_SCRATCH_ARRAYS
+    available = memory_budget_mb * 1024 * 1024 - scratch
+    return max(available // BYTES_PER_ROW, 0)
+
+
+class AnalysisEngine:
+    @staticmethod
+    def load_columns(
+        db: Session,
+        task_id: int,
+        value_key: str = "value",
+        data_type: Optional[str] = None,
+        memory_budget_mb: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+    ) -> SeriesColumns:
+        """
+        Load (timestamp, value) columns for a task.
+
+        Only the epoch timestamp and one numeric JSON field are selected,
+        streamed in chunks into preallocated arrays. When the series is
+        larger than the memory budget allows, the most recent rows are kept.
+        """
+        memory_budget_mb = (
+            memory_budget_mb or settings.ANALYSIS_MEMORY_BUDGET_MB
+        )
+        chunk_size = chunk_size or settings.ANALYSIS_FETCH_CHUNK_SIZE
+
+        value = DataPoint.value_json[value_key].as_float()
+        filters = [DataPoint.task_id == task_id, value.isnot(None)]
+        if data_type:
+            filters.append(DataPoint.data_type == data_type)
+
+        total = db.execute(
+            select(func.count()).select_from(DataPoint).where(*filters)
+        ).scalar_one()
+        rows = min(total, max_rows_for_budget(memory_budget_mb))
+
+        timestamps = np.empty(rows, dtype=np.float64)
+        values = np.empty(rows, dtype=np.float64)
+
+        query = (
+            select(func.extract("epoch", DataPoint.timestamp), value)
+            .where(*filters)
+            .order_by(DataPoint.timestamp, DataPoint.id)
+            .offset(total - rows)
+            .limit(rows)
+            .execution_options(yield_per=chunk_size)
+        )
+        filled = 0
+        for partition in db.execute(query).partitions():
+            count = len(partition)
+            timestamps[filled:filled + count] = np.fromiter(
+                (row[0] for row in partition), np.float64, count
+            )
+            values[filled:filled + count] = np.fromiter(
+                (row[1] for row in partition), np.float64, count
+            )
+            filled += count
+
+        return SeriesColumns(
+            timestamps=timestamps[:filled],
+            values=values[:filled],
+            total_rows=total,
+            truncated=rows < total,
+        )
+
+    @staticmethod
+    def summarize(values: np.ndarray) -> Dict[str, Any]:
+        """Summary statistics for a value column"""
+        if values.size == 0:
+            return {"count": 0}
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        return {
+            "count": int(values.size),
+            "mean": float(values.mean()),
+            "std": float(values.std()),
+            "min": float(values.min()),
+            "max": float(values.max()),
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+        }
+
+    @staticmethod
+    def rolling_blocks(
+        values: np.ndarray, window: int, block_size: int = ROLLING_BLOCK_SIZE
+    ) -> Iterator[Tuple[int, np.ndarray, np.ndarray]]:
+        """
+        Trailing-window mean and std for every point from `window` on.
+
+        Yields (start, mean, std) where mean[k] and std[k] describe the
+        `window` points before values[start + k]. Each block works on
+        cumulative sums of a mean-shifted segment, which keeps the
+        variance numerically stable.
+        """
+        for start in range(window, values.size, block_size):
+            stop = min(start + block_size, values.size)
+            segment = values[start - window:stop]
+            offset = segment.mean()
+            shifted = segment - offset
+
+            sums = np.concatenate(([0.0], np.cumsum(shifted)))
+            squares = np.concatenate(([0.0], np.cumsum(shifted * shifted)))
+            width = segment.size - window
+            window_sum = sums[window:window + width] - sums[:width]
+            window_squares = squares[window:window + width] - squares[:width]
+
+            mean = window_sum / window
+            variance = np.maximum(window_squares / window - mean * mean, 0.0)
+            yield start, mean + offset, np.sqrt(variance)
+
+    @staticmethod
+    def analyze(
+        columns: SeriesColumns,
+        window: Optional[int] = None,
+        threshold: Optional[float] = None,
+        max_anomalies: int = 100,
+    ) -> Dict[str, Any]:
+        """Summary, rolling-window and z-score anomaly results"""
+        window = window or settings.ANALYSIS_ROLLING_WINDOW
+        if threshold is None:
+            # 0 is a valid threshold: flag every deviation from the mean
+            threshold = settings.ANALYSIS_ZSCORE_THRESHOLD
+        values = columns.values
+
+        result = {
+            "summary": AnalysisEngine.summarize(values),
+            "total_rows": columns.total_rows,
+            "truncated": columns.truncated,
+        }
+        if values.size <= window:
+            result["rolling"] = {"window": window}
+            result["anomalies"] = {
+                "count": 0,
+                "threshold": threshold,
+                "points": [],
+            }
+            return result
+
+        min_mean, max_mean = np.inf, -np.inf
+        anomaly_count = 0
+        top_index = np.empty(0, dtype=np.int64)
+        top_z = np.empty(0, dtype=np.float64)
+
+        for start, mean, std in AnalysisEngine.rolling_blocks(values, window):
+            min_mean = min(min_mean, float(mean.min()))
+            max_mean = max(max_mean, float(mean.max()))
+
+            current = values[start:start + mean.size]
+            z = np.divide(
+                current - mean,
+                std,
+                out=np.zeros_like(mean),
+                where=std > 0,
+            )
+            hits = np.flatnonzero(np.abs(z) > threshold)
+            anomaly_count += hits.size
+
+            # Keep only the strongest anomalies seen so far
+            top_index = np.concatenate((top_index, hits + start))
+            top_z = np.concatenate((top_z, z[hits]))
+            if top_z.size > max_anomalies:
+                keep = np.argpartition(-np.abs(top_z), max_anomalies)
+                top_index = top_index[keep[:max_anomalies]]
+                top_z = top_z[keep[:max_anomalies]]
+
+        latest = values[-window:]
+        result["rolling"] = {
+            "window": window,
+            "latest_mean": float(latest.mean()),
+            "latest_std": float(latest.std()),
+            "min_mean": min_mean,
+            "max_mean": max_mean,
+        }
+
+        order = np.argsort(top_index)
+        result["anomalies"] = {
+            "count": int(anomaly_count),
+            "threshold": threshold,
+            "points": [
+                {
+                    "timestamp": float(columns.timestamps[index]),
+                    "value": float(values[index]),
+                    "zscore": float(z_value),
+                }
+                for index, z_value in zip(top_index[order], top_z[order])
+            ],
+        }
+        return result
+
+
+@registry.register("data_analysis", hint=ResourceHint.CPU_BOUND)
+def process_data_analysis(task_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Analyze a task's stored data points"""
+    try:
+        task_id = int(task_data["task_id"])
+        started = time.perf_counter()
+        with get_db_session() as db:
+            columns = AnalysisEngine.load_columns(
+                db,
+                task_id,
+                value_key=task_data.get("value_key", "value"),
+                data_type=task_data.get("data_type"),
+            )
+        loaded = time.perf_counter()
+
+        results = AnalysisEngine.analyze(
+            columns,
+            window=task_data.get("window"),
+            threshold=task_data.get("zscore_threshold"),
+        )
+        results["load_seconds"] = round(loaded - started, 3)
+        results["compute_seconds"] = round(time.perf_counter() - loaded, 3)
+
+        return {
+            "status": "success",
+            "message": f"Analysis completed for task {task_id}",
+            "results": results,
+        }
+
+    except Exception as e:
+        logger.error(f"Data analysis failed: {e}")
+        return {
+            "status": "error",
+            "message": f"Failed to analyze data: {str(e)}",
+        }
@@ -0,0 +1,424 @@
+"""
+Worker autoscaling signal.
+Workers record an ack for every task they finish; the API samples queue
+depth, combines it with the measured per-worker processing rate and
+publishes a desired worker count per queue, so scaling follows real
+throughput instead of a fixed concurrency.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import (
+    defaultdict,
+)
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+from sqlalchemy import (
+    delete,
+    select,
+    update,
+)
+from sqlalchemy.exc import (
+    IntegrityError,
+)
+
+from core.config import (
+    settings,
+)
+from db.database import (
+    SessionLocal,
+)
+from models.models import (
+    QueueThroughput,
+)
+from services.aws.sqs.priority import (
+    base_queue,
+    lanes,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def window_start(at: datetime, window_seconds: int) -> datetime:
+    """Start of the fixed window that contains `at`"""
+    epoch = int(at.timestamp())
+    return datetime.fromtimestamp(epoch - epoch % window_seconds, timezone.utc)
+
+
+def smoothed_rate(windows: List[Tuple[int, float]], alpha: float):
+    """
+    Exponential moving average of acks per busy second, oldest first.
+
+    Windows without busy time carry no information and are skipped;
+    returns None when there is nothing to average.
+    """
+    average = None
+    for acks, busy_seconds in windows:
+        if busy_seconds <= 0:
+            continue
+        rate = acks / busy_seconds
+        if average is None:
+            average = rate
+        else:
+            average = alpha * rate + (1 - alpha) * average
+    return average
+
+
+def desired_workers(
+    backlog: int,
+    rate_per_slot: float,
+    target_seconds: float,
+    concurrency: int,
+    min_workers: int,
+    max_workers: int,
+) -> int:
+    """Workers needed to clear `backlog` within target_seconds"""
+    if backlog <= 0:
+        return min_workers
+    acceptable_per_slot = max(rate_per_slot * target_seconds, 1e-9)
+    slots = math.ceil(backlog / acceptable_per_slot)
+    workers = math.ceil(slots / max(concurrency, 1))
+    return max(min_workers, min(max_workers, workers))
+
+
+def worker_concurrency(queue: str) -> int:
+    """Task slots per worker consuming a queue, from its worker profile"""
+    # Imported here because workers.celery_app imports this module
+    from workers.celery_app import (
+        WORKER_PROFILES,
+    )
+
+    # Dedicated profiles come before the catch-all "all" profile
+    for profile in WORKER_PROFILES.values():
+        if queue in profile.queues:
+            return profile.concurrency
+    return settings.WORKER_CONCURRENCY
+
+
+class AckRecorder:
+    """
+    Buffers worker acks in memory and flushes them as per-window counters.
+
+    Flushing at most every AUTOSCALING_FLUSH_SECONDS keeps the cost to one
+    small write per queue and window instead of one per task. A failed
+    flush is logged and dropped: the signal is advisory.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable] = None,
+        window_seconds: Optional[int] = None,
+        flush_seconds: Optional[float] = None,
+    ):
+        self.session_factory = session_factory or SessionLocal
+        self.window_seconds = (
+            window_seconds or settings.AUTOSCALING_WINDOW_SECONDS
+        )
+        if flush_seconds is None:
+            flush_seconds = settings.AUTOSCALING_FLUSH_SECONDS
+        self.flush_seconds = flush_seconds
+        self._pending = defaultdict(lambda: [0, 0.0])
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def record(
+        self, queue: str, busy_seconds: float, at: Optional[datetime] = None
+    ):
+        key = (queue, window_start(at or _utcnow(), self.window_seconds))
+        with self._lock:
+            entry = self._pending[key]
+            entry[0] += 1
+            entry[1] += busy_seconds
+            due = time.monotonic() - self._last_flush >= self.flush_seconds
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write buffered acks; returns the number of windows written"""
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(
+                lambda: [0, 0.0]
+            )
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        db = self.session_factory()
+        try:
+            for (queue, start), (acks, busy_seconds) in pending.items():
+                _add_to_window(db, queue, start, acks, busy_seconds)
+            return len(pending)
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"⚠️ Failed to flush worker acks: {e}")
+            return 0
+        finally:
+            db.close()
+
+
+def _add_to_window(db, queue, start, acks, busy_seconds):
+    increment = (
+        update(QueueThroughput)
+        .where(
+            QueueThroughput.queue == queue,
+            QueueThroughput.window_start == start,
+        )
+        .values(
+            acks=QueueThroughput.acks + acks,
+            busy_seconds=QueueThroughput.busy_seconds + busy_seconds,
+        )
+    )
+    if db.execute(increment).rowcount:
+        db.commit()
+        return
+    db.add(
+        QueueThroughput(
+            queue=queue,
+            window_start=start,
+            acks=acks,
+            busy_seconds=busy_seconds,
+        )
+    )
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another worker opened the window first
+        db.rollback()
+        db.execute(increment)
+        db.commit()
+
+
+class AutoscalingService:
+    """
+    Turns queue depth and processing rate into scaling signals.
+
+    Per queue (all priority lanes together) the desired worker count is
+    the number of workers that clears the current backlog within
+    AUTOSCALING_TARGET_SECONDS at the smoothed rate one worker slot has
+    actually achieved. Queues without recent acks use
+    AUTOSCALING_DEFAULT_RATE.
+    """
+
+    def __init__(
+        self,
+        sqs_service=None,
+        session_factory: Optional[Callable] = None,
+        cloudwatch=None,
+    ):
+        self._sqs_service = sqs_service
+        self.session_factory = session_factory or SessionLocal
+        self._cloudwatch = cloudwatch
+
+    @property
+    def sqs_service(self):
+        if self._sqs_service is None:
+            from services.aws.sqs.service import (
+                get_sqs_service,
+            )
+
+            self._sqs_service = get_sqs_service()
+        return self._sqs_service
+
+    @property
+    def cloudwatch(self):
+        if self._cloudwatch is None:
+            import boto3
+
+            self._cloudwatch = boto3.client(
+                "cloudwatch",
+                region_name=settings.AWS_REGION,
+                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+            )
+        return self._cloudwatch
+
+    def queue_depths(self) -> Dict[str, Dict[str, int]]:
+        """Visible and in-flight messages per queue, summed over lanes"""
+        sqs = self.sqs_service
+        depths = {}
+        for name in sqs.queue_urls:
+            if base_queue(name) != name:
+                continue
+            queue = sqs.queue_urls[name].rsplit("/", 1)[-1]
+            depth = {"visible": 0, "in_flight": 0}
+            for lane in lanes(name):
+                attributes = sqs.sqs.get_queue_attributes(
+                    QueueUrl=sqs.queue_urls[lane],
+                    AttributeNames=[
+                        "ApproximateNumberOfMessages",
+                        "ApproximateNumberOfMessagesNotVisible",
+                    ],
+                )["Attributes"]
+                depth["visible"] += int(
+                    attributes.get("ApproximateNumberOfMessages", 0)
+                )
+                depth["in_flight"] += int(
+                    attributes.get("ApproximateNumberOfMessagesNotVisible", 0)
+                )
+            depths[queue] = depth
+        return depths
+
+    def processing_rates(self) -> Dict[str, float]:
+        """Smoothed acks per busy worker-second for each queue"""
+        lookback = (
+            settings.AUTOSCALING_WINDOW_SECONDS
+            * settings.AUTOSCALING_LOOKBACK_WINDOWS
+        )
+        since = _utcnow() - timedelta(seconds=lookback)
+        db = self.session_factory()
+        try:
+            rows = db.execute(
+                select(
+                    QueueThroughput.queue,
+                    QueueThroughput.window_start,
+                    QueueThroughput.acks,
+                    QueueThroughput.busy_seconds,
+                )
+                .where(QueueThroughput.window_start >= since)
+                .order_by(QueueThroughput.window_start)
+            ).all()
+        finally:
+            db.close()
+
+        windows = defaultdict(lambda: defaultdict(lambda: [0, 0.0]))
+        for queue, start, acks, busy_seconds in rows:
+            window = windows[base_queue(queue)][start]
+            window[0] += acks
+            window[1] += busy_seconds
+
+        rates = {}
+        for queue, by_start in windows.items():
+            ordered = [tuple(by_start[start]) for start in sorted(by_start)]
+            rate = smoothed_rate(ordered, settings.AUTOSCALING_SMOOTHING)
+            if rate is not None:
+                rates[queue] = rate
+        return rates
+
+    def signals(
+        self, running_workers: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Scaling signal per queue.
+
+        backlog_per_worker is only known when the caller passes the
+        running worker count; scale on it against
+        acceptable_backlog_per_worker, or use desired_workers directly.
+        """
+        rates = self.processing_rates()
+        signals = []
+        for queue, depth in self.queue_depths().items():
+            backlog = depth["visible"] + depth["in_flight"]
+            rate = rates.get(queue, settings.AUTOSCALING_DEFAULT_RATE)
+            concurrency = worker_concurrency(queue)
+            acceptable = (
+                rate * settings.AUTOSCALING_TARGET_SECONDS * concurrency
+            )
+            signal = {
+                "queue": queue,
+                "messages_visible": depth["visible"],
+                "messages_in_flight": depth["in_flight"],
+                "processing_rate_per_slot": round(rate, 4),
+                "rate_source": "measured" if queue in rates else "default",
+                "worker_concurrency": concurrency,
+                "acceptable_backlog_per_worker": round(acceptable, 2),
+                "desired_workers": desired_workers(
+                    backlog,
+                    rate,
+                    settings.AUTOSCALING_TARGET_SECONDS,
+                    concurrency,
+                    settings.AUTOSCALING_MIN_WORKERS,
+                    settings.AUTOSCALING_MAX_WORKERS,
+                ),
+            }
+            if running_workers:
+                signal["backlog_per_worker"] = round(
+                    backlog / running_workers, 2
+                )
+            signals.append(signal)
+        return signals
+
+    def publish(self, signals: List[Dict[str, Any]]) -> int:
+        """Put the signals as CloudWatch metrics, one dimension per queue"""
+        metric_data = []
+        for signal in signals:
+            dimensions = [{"Name": "QueueName", "Value": signal["queue"]}]
+            backlog = signal["messages_visible"] + signal["messages_in_flight"]
+            values = (
+                ("Backlog", backlog, "Count"),
+                ("DesiredWorkers", signal["desired_workers"], "Count"),
+                (
+                    "AcceptableBacklogPerWorker",
+                    signal["acceptable_backlog_per_worker"],
+                    "Count",
+                ),
+                (
+                    "ProcessingRatePerSlot",
+                    signal["processing_rate_per_slot"],
+                    "Count/Second",
+                ),
+            )
+            for name, value, unit in values:
+                metric_data.append(
+                    {
+                        "MetricName": name,
+                        "Dimensions": dimensions,
+                        "Value": float(value),
+                        "Unit": unit,
+                    }
+                )
+        if metric_data:
+            self.cloudwatch.put_metric_data(
+                Namespace=settings.AUTOSCALING_METRIC_NAMESPACE,
+                MetricData=metric_data,
+            )
+        return len(metric_data)
+
+    def purge_windows(self) -> int:
+        """Drop throughput windows older than the lookback"""
+        lookback = (
+            settings.AUTOSCALING_WINDOW_SECONDS
+            * settings.AUTOSCALING_LOOKBACK_WINDOWS
+        )
+        cutoff = _utcnow() - timedelta(seconds=lookback * 2)
+        db = self.session_factory()
+        try:
+            deleted = db.execute(
+                delete(QueueThroughput).where(
+                    QueueThroughput.window_start < cutoff
+                )
+            ).rowcount
+            db.commit()
+            return deleted
+        finally:
+            db.close()
+
+
+_ack_recorder: Optional[AckRecorder] = None
+_ack_recorder_lock = threading.Lock()
+
+
+def get_ack_recorder() -> AckRecorder:
+    """Per-process recorder shared by every task in a worker"""
+    global _ack_recorder
+    with _ack_recorder_lock:
+        if _ack_recorder is None:
+            _ack_recorder = AckRecorder()
+    return _ack_recorder
@@ -3,6 +3,9 @@ AWS services module
 Provides access to Amazon Web Services integrations
 """
 
+from .s3.service import (
+    S3Service,
+)
 from .ses.service import (
     SESService,
 )
@@ -10,4 +13,4 @@ from .sqs.service import (
     SQSService,
 )
 
-__all__ = ["SQSService", "SESService"]
+__all__ = ["SQSService", "SESService", "S3Service"]
@@ -0,0 +1,20 @@
+"""
+S3 service module
+Amazon Simple Storage Service integration
+"""
+
+from .exceptions import (
+    MultipartUploadError,
+    S3Error,
+)
+from .service import (
+    MultipartWriter,
+    S3Service,
+)
+
+__all__ = [
+    "S3Service",
+    "MultipartWriter",
+    "S3Error",
+    "MultipartUploadError",
+]
@@ -0,0 +1,15 @@
+"""
+S3-specific exceptions
+"""
+
+
+class S3Error(Exception):
+    """Base exception for S3 operations"""
+
+    pass
+
+
+class MultipartUploadError(S3Error):
+    """Raised when a multipart upload fails and is aborted"""
+
+    pass
@@ -0,0 +1,173 @@
+"""
+Amazon S3 integration with streaming multipart uploads
+"""
+
+import io
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+)
+
+import boto3
+
+from core.config import (
+    settings,
+)
+
+from .exceptions import (
+    MultipartUploadError,
+)
+
+# S3 rejects non-final parts below 5 MiB
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+class MultipartWriter(io.RawIOBase):
+    """
+    Writable file object that uploads to S3 part by part.
+
+    At most one part is buffered at a time, so memory stays at part_size
+    however large the object grows. close() completes the upload; an
+    exception inside a `with` block aborts it instead.
+    """
+
+    def __init__(
+        self,
+        client,
+        bucket: str,
+        key: str,
+        part_size: int = MIN_PART_SIZE,
+        content_type: str = "application/octet-stream",
+    ):
+        super().__init__()
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self.upload_id = client.create_multipart_upload(
+            Bucket=bucket, Key=key, ContentType=content_type
+        )["UploadId"]
+        self.parts: List[Dict[str, Any]] = []
+        self.bytes_written = 0
+        self.max_buffered = 0
+        self._buffer = bytearray()
+        self._finished = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        self.bytes_written += len(data)
+        self.max_buffered = max(self.max_buffered, len(self._buffer))
+        while len(self._buffer) >= self.part_size:
+            self._upload_part(bytes(self._buffer[:self.part_size]))
+            del self._buffer[:self.part_size]
+        return len(data)
+
+    def tell(self) -> int:
+        return self.bytes_written
+
+    def _upload_part(self, body: bytes):
+        number = len(self.parts) + 1
+        try:
+            response = self.client.upload_part(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self.upload_id,
+                PartNumber=number,
+                Body=body,
+            )
+        except Exception as e:
+            self.abort()
+            raise MultipartUploadError(f"Part {number} failed: {e}") from e
+        self.parts.append({"PartNumber": number, "ETag": response["ETag"]})
+
+    def close(self):
+        if self._finished:
+            return super().close()
+        # S3 needs at least one part, even for an empty object
+        if self._buffer or not self.parts:
+            self._upload_part(bytes(self._buffer))
+            self._buffer.clear()
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            MultipartUpload={"Parts": self.parts},
+        )
+        self._finished = True
+        super().close()
+
+    def abort(self):
+        if not self._finished:
+            self.client.abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self.upload_id
+            )
+            self._finished = True
+            self._buffer.clear()
+
+    def __del__(self):
+        # Only an explicit close() may publish the object
+        try:
+            self.abort()
+        except Exception:
+            pass
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is not None:
+            self.abort()
+        return super().__exit__(exc_type, exc, traceback)
+
+
+class S3Service:
+    """Service for storing objects in Amazon S3"""
+
+    def __init__(self, client=None):
+        self.s3 = client or boto3.client(
+            "s3",
+            region_name=settings.AWS_REGION,
+            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        )
+
+    def open_multipart(
+        self,
+        bucket: str,
+        key: str,
+        part_size: Optional[int] = None,
+        content_type: str = "application/octet-stream",
+    ) -> MultipartWriter:
+        """Start a multipart upload and return a writer for it"""
+        return MultipartWriter(
+            self.s3,
+            bucket,
+            key,
+            part_size=part_size or settings.S3_MULTIPART_PART_SIZE,
+            content_type=content_type,
+        )
+
+    def object_url(self, bucket: str, key: str) -> str:
+        return f"s3://{bucket}/{key}"
+
+    def presigned_url(
+        self, bucket: str, key: str, expires_in: int = 3600
+    ) -> str:
+        return self.s3.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": bucket, "Key": key},
+            ExpiresIn=expires_in,
+        )
+
+
+_s3_service: Optional[S3Service] = None
+
+
+def get_s3_service() -> S3Service:
+    """Shared S3Service, created on first use to keep imports cheap"""
+    global _s3_service
+    if _s3_service is None:
+        _s3_service = S3Service()
+    return _s3_service
@@ -170,5 +170,19 @@ class SESService:
         }
 
 
-# Global instance
-ses_service = SESService()
+_ses_service: Optional[SESService] = None
+
+
+def get_ses_service() -> SESService:
+    """Shared SESService, created on first use to keep imports cheap"""
+    global _ses_service
+    if _ses_service is None:
+        _ses_service = SESService()
+    return _ses_service
+
+
+def __getattr__(name: str):
+    # Backward compatible lazy access to the old module-level instance
+    if name == "ses_service":
+        return get_ses_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
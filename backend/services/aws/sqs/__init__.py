@@ -11,6 +11,11 @@ from .models import (
     QueueInfo,
     SQSMessage,
 )
+from .priority import (
+    PRIORITIES,
+    WeightedFairPoller,
+    lane_name,
+)
 from .service import (
     SQSService,
 )
@@ -21,4 +26,7 @@ __all__ = [
     "QueueInfo",
     "SQSError",
     "QueueNotFoundError",
+    "PRIORITIES",
+    "WeightedFairPoller",
+    "lane_name",
 ]
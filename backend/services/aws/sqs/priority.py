@@ -0,0 +1,98 @@
+"""
+Priority lanes for SQS queues.
+Every queue has high, medium and low variants. Consumers poll them with
+weighted-fair scheduling, so a flood of low-priority work cannot starve
+high-priority messages such as alerts.
+"""
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+PRIORITIES = ("high", "medium", "low")
+DEFAULT_PRIORITY = "medium"
+DEFAULT_WEIGHTS = {"high": 6, "medium": 3, "low": 1}
+
+
+def normalize_priority(priority: Optional[str]) -> str:
+    """Known priority names pass through; anything else is medium"""
+    if isinstance(priority, str) and priority.lower() in PRIORITIES:
+        return priority.lower()
+    return DEFAULT_PRIORITY
+
+
+def lane_name(queue: str, priority: Optional[str]) -> str:
+    """
+    Queue name (or URL) for a priority lane.
+
+    Medium keeps the original name so existing producers and consumers of
+    the un-suffixed queues carry on working.
+    """
+    priority = normalize_priority(priority)
+    if priority == DEFAULT_PRIORITY:
+        return queue
+    return f"{queue}-{priority}"
+
+
+def base_queue(lane: str) -> str:
+    """The queue a lane belongs to (its name without -high or -low)"""
+    for priority in PRIORITIES:
+        suffix = f"-{priority}"
+        if priority != DEFAULT_PRIORITY and lane.endswith(suffix):
+            return lane[: -len(suffix)]
+    return lane
+
+
+def lanes(queue: str) -> List[str]:
+    """All lanes of a queue, highest priority first"""
+    return [lane_name(queue, priority) for priority in PRIORITIES]
+
+
+class WeightedFairPoller:
+    """
+    Decides which priority lane a consumer polls next.
+
+    Uses smooth weighted round-robin: with weights 6/3/1 the high lane is
+    picked 6 times in every 10 polls, spread out instead of in one burst.
+    When the picked lane is empty the others are tried in priority order,
+    so no poll is wasted while any lane has work.
+    """
+
+    def __init__(self, weights: Optional[Dict[str, int]] = None):
+        weights = weights or DEFAULT_WEIGHTS
+        self.weights = {
+            priority: max(0, int(weights.get(priority, 0)))
+            for priority in PRIORITIES
+        }
+        if not any(self.weights.values()):
+            raise ValueError("At least one priority weight must be positive")
+        self._total = sum(self.weights.values())
+        self._current = {priority: 0 for priority in PRIORITIES}
+
+    def next_priority(self) -> str:
+        for priority in PRIORITIES:
+            self._current[priority] += self.weights[priority]
+        # max() keeps the first of equal candidates, i.e. the higher lane
+        chosen = max(PRIORITIES, key=self._current.__getitem__)
+        self._current[chosen] -= self._total
+        return chosen
+
+    def order(self) -> List[str]:
+        """Lanes to try for one poll: the weighted pick, then the rest"""
+        chosen = self.next_priority()
+        return [chosen] + [p for p in PRIORITIES if p != chosen]
+
+    def poll(
+        self, receive: Callable[[str], List[Any]]
+    ) -> Tuple[Optional[str], List[Any]]:
+        """Call receive(priority) lane by lane until one returns messages"""
+        for priority in self.order():
+            messages = receive(priority)
+            if messages:
+                return priority, messages
+        return None, []
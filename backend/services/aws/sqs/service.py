@@ -2,7 +2,6 @@
 Refactored SQS service with improved organization
 """
 
-import json
 from datetime import (
     datetime,
 )
@@ -18,6 +17,18 @@ import boto3
 from core.config import (
     settings,
 )
+from services.claim_check import (
+    ClaimCheckCodec,
+    LocalBlobStore,
+    S3BlobStore,
+)
+
+from .priority import (
+    PRIORITIES,
+    WeightedFairPoller,
+    lane_name,
+    normalize_priority,
+)
 
 
 class SQSService:
@@ -35,59 +46,92 @@ class SQSService:
         aws_account = "554510949034"
         region = settings.AWS_REGION
         base_url = f"https://sqs.{region}.amazonaws.com/{aws_account}"
-        self.queue_urls = {
+        base_queues = {
             "default": f"{base_url}/wipsie-default",
             "data_polling": f"{base_url}/wipsie-data-polling",
             "task_processing": f"{base_url}/wipsie-task-processing",
             "notifications": f"{base_url}/wipsie-notifications",
         }
 
+        # Every queue has high/medium/low lanes; medium is the base queue
+        self.queue_urls = {}
+        for name, url in base_queues.items():
+            for priority in PRIORITIES:
+                lane = lane_name(name, priority)
+                self.queue_urls[lane] = lane_name(url, priority)
+        self._pollers: Dict[str, WeightedFairPoller] = {}
+        self.codec = get_claim_check_codec()
+
     def send_message(
         self,
         queue_name: str,
         message_body: Dict[str, Any],
         message_attributes: Optional[Dict[str, Any]] = None,
+        priority: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Send a message to the specified SQS queue"""
+        """
+        Send a message to the priority lane of the specified SQS queue.
 
-        if queue_name not in self.queue_urls:
+        The lane comes from `priority`, else the message's own "priority"
+        field; anything unrecognised goes to the medium lane.
+        """
+
+        priority = normalize_priority(priority or message_body.get("priority"))
+        lane = lane_name(queue_name, priority)
+        if lane not in self.queue_urls:
             raise ValueError(f"Unknown queue: {queue_name}")
 
-        queue_url = self.queue_urls[queue_name]
+        queue_url = self.queue_urls[lane]
 
         # Add timestamp to message
         message_body["timestamp"] = datetime.now().isoformat()
         message_body["queue"] = queue_name
+        message_body["priority"] = priority
 
         # Prepare message attributes
         attrs = {
             "source": {"StringValue": "sqs_service", "DataType": "String"},
             "queue_name": {"StringValue": queue_name, "DataType": "String"},
+            "priority": {"StringValue": priority, "DataType": "String"},
         }
 
-        if message_attributes:
-            for key, value in message_attributes.items():
-                attrs[key] = {"StringValue": str(value), "DataType": "String"}
+        # Large bodies are compressed, or offloaded behind a claim check
+        body, encoding_attrs = self.codec.encode(message_body)
+
+        extra_attrs = {**(message_attributes or {}), **encoding_attrs}
+        for key, value in extra_attrs.items():
+            attrs[key] = {"StringValue": str(value), "DataType": "String"}
 
         # Send message
         response = self.sqs.send_message(
             QueueUrl=queue_url,
-            MessageBody=json.dumps(message_body),
+            MessageBody=body,
             MessageAttributes=attrs,
         )
 
         return {
             "message_id": response["MessageId"],
-            "queue": queue_name,
+            "queue": lane,
+            "priority": priority,
             "queue_url": queue_url,
             "status": "sent",
             "timestamp": message_body["timestamp"],
         }
 
     def receive_messages(
-        self, queue_name: str, max_messages: int = 5
+        self,
+        queue_name: str,
+        max_messages: int = 5,
+        wait_seconds: int = 2,
+        lazy: bool = False,
     ) -> List[Dict[str, Any]]:
-        """Receive messages from the specified queue"""
+        """
+        Receive messages from the specified queue (or priority lane).
+
+        Compressed bodies are decoded here. With lazy=True each "body" is a
+        LazyPayload instead, so claim-checked payloads are only downloaded
+        when the consumer calls get().
+        """
 
         if queue_name not in self.queue_urls:
             raise ValueError(f"Unknown queue: {queue_name}")
@@ -97,23 +141,65 @@ class SQSService:
         response = self.sqs.receive_message(
             QueueUrl=queue_url,
             MaxNumberOfMessages=max_messages,
-            WaitTimeSeconds=2,
+            WaitTimeSeconds=wait_seconds,
             MessageAttributeNames=["All"],
         )
 
         messages = []
         for msg in response.get("Messages", []):
+            attributes = msg.get("MessageAttributes", {})
+            payload = self.codec.decode(msg["Body"], attributes)
             messages.append(
                 {
                     "message_id": msg["MessageId"],
-                    "body": json.loads(msg["Body"]),
-                    "attributes": msg.get("MessageAttributes", {}),
+                    "body": payload if lazy else payload.get(),
+                    "attributes": attributes,
                     "receipt_handle": msg["ReceiptHandle"],
+                    "queue": queue_name,
                 }
             )
 
         return messages
 
+    def receive_prioritized(
+        self, queue_name: str, max_messages: int = 5, lazy: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Receive from a queue's priority lanes with weighted-fair polling.
+
+        Lanes are short-polled in the order the poller picks; only when all
+        of them are empty does the call long-poll, on the high lane, so an
+        idle consumer still reacts to alerts first. Delete each message
+        through its "queue", which names the lane it came from.
+        """
+
+        if queue_name not in self.queue_urls:
+            raise ValueError(f"Unknown queue: {queue_name}")
+
+        poller = self._pollers.get(queue_name)
+        if poller is None:
+            poller = WeightedFairPoller(settings.SQS_PRIORITY_WEIGHTS)
+            self._pollers[queue_name] = poller
+
+        def receive(priority: str) -> List[Dict[str, Any]]:
+            return self.receive_messages(
+                lane_name(queue_name, priority),
+                max_messages,
+                wait_seconds=0,
+                lazy=lazy,
+            )
+
+        priority, messages = poller.poll(receive)
+        if not messages:
+            priority = PRIORITIES[0]
+            messages = self.receive_messages(
+                lane_name(queue_name, priority), max_messages, lazy=lazy
+            )
+
+        for message in messages:
+            message["priority"] = priority
+        return messages
+
     def delete_message(self, queue_name: str, receipt_handle: str):
         """Delete a message from the queue"""
 
@@ -141,5 +227,39 @@ class SQSService:
         return response["Attributes"]
 
 
-# Global instance for backward compatibility
-sqs_service = SQSService()
+_claim_check_codec: Optional[ClaimCheckCodec] = None
+
+
+def get_claim_check_codec() -> ClaimCheckCodec:
+    """Codec for message bodies: S3 claim checks, else a local directory"""
+    global _claim_check_codec
+    if _claim_check_codec is None:
+        if settings.SQS_CLAIM_CHECK_BUCKET:
+            store = S3BlobStore(settings.SQS_CLAIM_CHECK_BUCKET)
+        else:
+            store = LocalBlobStore(settings.SQS_CLAIM_CHECK_DIR)
+        _claim_check_codec = ClaimCheckCodec(
+            store=store,
+            compress_threshold=settings.SQS_COMPRESS_THRESHOLD_BYTES,
+            offload_threshold=settings.SQS_CLAIM_CHECK_THRESHOLD_BYTES,
+            encoding=settings.SQS_PAYLOAD_ENCODING,
+        )
+    return _claim_check_codec
+
+
+_sqs_service: Optional[SQSService] = None
+
+
+def get_sqs_service() -> SQSService:
+    """Shared SQSService, created on first use to keep imports cheap"""
+    global _sqs_service
+    if _sqs_service is None:
+        _sqs_service = SQSService()
+    return _sqs_service
+
+
+def __getattr__(name: str):
+    # Backward compatible lazy access to the old module-level instance
+    if name == "sqs_service":
+        return get_sqs_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
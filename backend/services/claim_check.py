@@ -0,0 +1,270 @@
+"""
+Claim-check encoding for queue messages.
+Message bodies over a size threshold are compressed inline; bodies still
+too large for SQS are stored in a blob store (S3, or a local directory
+stand-in) and replaced by a pointer the consumer resolves only when it
+needs the payload. Standard library only, with boto3 imported lazily:
+deploy-lambda.sh copies this file into the Lambda packages.
+"""
+
+import base64
+import gzip
+import json
+import os
+import uuid
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Optional,
+    Tuple,
+)
+
+# SQS rejects message bodies plus attributes over 256 KiB
+SQS_MAX_MESSAGE_BYTES = 256 * 1024
+
+ENCODING_ATTRIBUTE = "content_encoding"
+CLAIM_CHECK_ENCODING = "claim-check"
+CLAIM_CHECK_FIELD = "claim_check"
+
+
+class ClaimCheckError(Exception):
+    """Raised when a claim-checked payload cannot be stored or fetched"""
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ClaimCheckError(
+            "zstd payloads need the zstandard package"
+        ) from e
+    return zstandard
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    if encoding == "zstd":
+        return _zstd().ZstdCompressor().compress(data)
+    raise ValueError(f"Unsupported payload encoding: {encoding}")
+
+
+def decompress(data: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    if encoding == "zstd":
+        return _zstd().ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unsupported payload encoding: {encoding}")
+
+
+class LocalBlobStore:
+    """Directory-backed stand-in for S3 (development and tests)"""
+
+    name = "local"
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def put(self, key: str, data: bytes) -> Dict[str, Any]:
+        path = os.path.join(self.directory, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as blob:
+            blob.write(data)
+        return {"store": self.name, "path": path}
+
+    def get(self, pointer: Dict[str, Any]) -> bytes:
+        # Pointers come from message bodies: only read inside our directory
+        root = os.path.realpath(self.directory)
+        path = os.path.realpath(str(pointer.get("path", "")))
+        if pointer.get("store") != self.name or (
+            os.path.commonpath([root, path]) != root or path == root
+        ):
+            raise ClaimCheckError(
+                f"Claim check outside {self.directory}: {pointer}"
+            )
+        with open(path, "rb") as blob:
+            return blob.read()
+
+
+class S3BlobStore:
+    """
+    Payloads kept in S3 under a prefix.
+
+    Objects are never deleted by consumers, since a redelivered message
+    still needs its payload; expire the prefix with a lifecycle rule.
+    """
+
+    name = "s3"
+
+    def __init__(
+        self, bucket: str, prefix: str = "claim-checks/", client=None
+    ):
+        self.bucket = bucket
+        self.prefix = prefix
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            import boto3
+
+            self._client = boto3.client("s3")
+        return self._client
+
+    def put(self, key: str, data: bytes) -> Dict[str, Any]:
+        key = self.prefix + key
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=data)
+        return {"store": self.name, "bucket": self.bucket, "key": key}
+
+    def get(self, pointer: Dict[str, Any]) -> bytes:
+        # Pointers come from message bodies: only read our bucket and prefix
+        key = str(pointer.get("key", ""))
+        if (
+            pointer.get("store") != self.name
+            or pointer.get("bucket") != self.bucket
+            or not key.startswith(self.prefix)
+        ):
+            raise ClaimCheckError(
+                f"Claim check outside s3://{self.bucket}/{self.prefix}: "
+                f"{pointer}"
+            )
+        response = self.client.get_object(Bucket=self.bucket, Key=key)
+        return response["Body"].read()
+
+
+class LazyPayload:
+    """A decoded message payload, fetched and decompressed on first use"""
+
+    def __init__(
+        self,
+        loader: Callable[[], Any],
+        claim_check: Optional[Dict[str, Any]] = None,
+    ):
+        self._loader = loader
+        self.claim_check = claim_check
+        self._loaded = False
+        self._value = None
+
+    def get(self) -> Any:
+        if not self._loaded:
+            self._value = self._loader()
+            self._loaded = True
+        return self._value
+
+
+def attribute_value(attributes: Optional[Dict[str, Any]], name: str):
+    """Read a string attribute from boto3 or Lambda event message attributes"""
+    value = (attributes or {}).get(name)
+    if isinstance(value, dict):
+        return value.get("StringValue", value.get("stringValue"))
+    return value
+
+
+class ClaimCheckCodec:
+    """
+    Encodes payloads into SQS message bodies and back.
+
+    Bodies under compress_threshold bytes are sent as plain JSON. Larger
+    ones are compressed and base64 encoded inline, with the encoding in
+    the content_encoding attribute. If that is still over
+    offload_threshold the compressed payload goes to the blob store and
+    the body carries only a {"claim_check": pointer}.
+    """
+
+    def __init__(
+        self,
+        store=None,
+        compress_threshold: int = 8 * 1024,
+        offload_threshold: int = 192 * 1024,
+        encoding: str = "gzip",
+    ):
+        self.store = store
+        self.compress_threshold = compress_threshold
+        self.offload_threshold = min(offload_threshold, SQS_MAX_MESSAGE_BYTES)
+        self.encoding = encoding
+
+    def encode(self, payload: Any) -> Tuple[str, Dict[str, str]]:
+        """Message body and the string attributes to send with it"""
+        raw = json.dumps(payload, default=str)
+        if len(raw.encode("utf-8")) < self.compress_threshold:
+            return raw, {}
+
+        compressed = compress(raw.encode("utf-8"), self.encoding)
+        inline = base64.b64encode(compressed).decode("ascii")
+        if len(inline) <= self.offload_threshold:
+            return inline, {ENCODING_ATTRIBUTE: self.encoding}
+
+        pointer = self.offload(compressed)
+        return (
+            json.dumps({CLAIM_CHECK_FIELD: pointer}),
+            {ENCODING_ATTRIBUTE: CLAIM_CHECK_ENCODING},
+        )
+
+    def offload(self, compressed: bytes) -> Dict[str, Any]:
+        if self.store is None:
+            raise ClaimCheckError(
+                f"Payload of {len(compressed)} compressed bytes is too large "
+                "for SQS and no claim-check store is configured"
+            )
+        try:
+            pointer = self.store.put(
+                f"{uuid.uuid4()}.json.{self.encoding}", compressed
+            )
+        except Exception as e:
+            raise ClaimCheckError(f"Failed to store payload: {e}") from e
+        pointer.update({"encoding": self.encoding, "bytes": len(compressed)})
+        return pointer
+
+    def decode(
+        self, body: str, attributes: Optional[Dict[str, Any]] = None
+    ) -> LazyPayload:
+        """Payload of a received message; claim checks are not fetched yet"""
+        encoding = attribute_value(attributes, ENCODING_ATTRIBUTE)
+        if encoding == CLAIM_CHECK_ENCODING:
+            pointer = json.loads(body)[CLAIM_CHECK_FIELD]
+            return LazyPayload(lambda: self.fetch(pointer), pointer)
+        if encoding:
+            return LazyPayload(
+                lambda: json.loads(
+                    decompress(base64.b64decode(body), encoding)
+                )
+            )
+        return LazyPayload(lambda: json.loads(body))
+
+    def fetch(self, pointer: Dict[str, Any]) -> Any:
+        """
+        Download and decompress a claim-checked payload.
+
+        Only the configured store is read, and it rejects pointers outside
+        its bucket and prefix (or directory): anyone who can enqueue a
+        message chooses the pointer.
+        """
+        if self.store is None:
+            raise ClaimCheckError(
+                "Received a claim check but no claim-check store is "
+                "configured"
+            )
+        try:
+            data = self.store.get(pointer)
+        except ClaimCheckError:
+            raise
+        except Exception as e:
+            raise ClaimCheckError(f"Failed to fetch payload: {e}") from e
+        return json.loads(decompress(data, pointer.get("encoding", "gzip")))
+
+    def wrap(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Offload an oversized task argument for brokers that serialize
+        their own messages (Celery); small payloads pass through.
+        """
+        raw = json.dumps(payload, default=str).encode("utf-8")
+        if len(raw) <= self.offload_threshold:
+            return payload
+        return {CLAIM_CHECK_FIELD: self.offload(compress(raw, self.encoding))}
+
+    def unwrap(self, payload: Any) -> Any:
+        """Resolve a payload produced by wrap()"""
+        if isinstance(payload, dict) and set(payload) == {CLAIM_CHECK_FIELD}:
+            return self.fetch(payload[CLAIM_CHECK_FIELD])
+        return payload
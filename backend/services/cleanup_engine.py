@@ -0,0 +1,221 @@
+"""
+Data cleanup engine.
+Deletes expired data points in bounded, separately committed chunks so a
+large cleanup never holds long locks or floods the database, and can be
+resumed from wherever it stopped.
+"""
+
+import logging
+import re
+import time
+from dataclasses import (
+    asdict,
+    dataclass,
+    field,
+)
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+)
+
+from sqlalchemy import (
+    delete,
+    select,
+    text,
+)
+from sqlalchemy.orm import (
+    Session,
+)
+
+from core.config import (
+    settings,
+)
+from core.db_functions.session import (
+    get_db_session,
+)
+from models.models import (
+    DataPoint,
+)
+from services.task_registry import (
+    ResourceHint,
+    registry,
+)
+
+logger = logging.getLogger(__name__)
+
+_PARTITION_UPPER_BOUND = re.compile(r"TO \('([^']+)'\)")
+
+
+@dataclass
+class CleanupReport:
+    cutoff: str
+    rows_deleted: int = 0
+    chunks: int = 0
+    partitions_detached: List[str] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+    rows_per_second: float = 0.0
+    completed: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def partition_upper_bound(bound_expression: str) -> Optional[datetime]:
+    """Upper bound of a range partition, e.g. FOR VALUES FROM (..) TO (..)"""
+    match = _PARTITION_UPPER_BOUND.search(bound_expression or "")
+    if not match:
+        return None
+    upper = datetime.fromisoformat(match.group(1))
+    if upper.tzinfo is None:
+        upper = upper.replace(tzinfo=timezone.utc)
+    return upper
+
+
+class CleanupEngine:
+    @staticmethod
+    def expired_partitions(db: Session, cutoff: datetime) -> List[str]:
+        """Range partitions of data_points that lie entirely before cutoff"""
+        if db.get_bind().dialect.name != "postgresql":
+            return []
+        rows = db.execute(
+            text(
+                "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+                "FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = :table"
+            ),
+            {"table": DataPoint.__tablename__},
+        ).all()
+        expired = []
+        for name, bound in rows:
+            upper = partition_upper_bound(bound)
+            if upper is not None and upper <= cutoff:
+                expired.append(name)
+        return sorted(expired)
+
+    @staticmethod
+    def detach_partitions(db: Session, names: List[str]) -> List[str]:
+        """Detach and drop whole partitions instead of deleting their rows"""
+        for name in names:
+            table = DataPoint.__tablename__
+            db.execute(text(f'ALTER TABLE {table} DETACH PARTITION "{name}"'))
+            db.execute(text(f'DROP TABLE "{name}"'))
+            db.commit()
+            logger.info(f"Detached expired partition {name}")
+        return names
+
+    @staticmethod
+    def delete_before(
+        db: Session,
+        cutoff: datetime,
+        chunk_size: Optional[int] = None,
+        throttle_seconds: Optional[float] = None,
+        data_type: Optional[str] = None,
+        task_id: Optional[int] = None,
+        max_chunks: Optional[int] = None,
+    ) -> CleanupReport:
+        """
+        Delete data points older than cutoff, chunk_size rows at a time.
+
+        Each chunk is DELETE ... WHERE id IN (SELECT id ... LIMIT n) in its
+        own transaction, followed by a pause. Passing the same cutoff again
+        resumes an interrupted run; max_chunks bounds a single run.
+        """
+        chunk_size = chunk_size or settings.CLEANUP_CHUNK_SIZE
+        if throttle_seconds is None:
+            throttle_seconds = settings.CLEANUP_THROTTLE_SECONDS
+
+        report = CleanupReport(cutoff=cutoff.isoformat())
+        started = time.perf_counter()
+
+        if data_type is None and task_id is None:
+            expired = CleanupEngine.expired_partitions(db, cutoff)
+            report.partitions_detached = CleanupEngine.detach_partitions(
+                db, expired
+            )
+
+        filters = [DataPoint.timestamp < cutoff]
+        if data_type is not None:
+            filters.append(DataPoint.data_type == data_type)
+        if task_id is not None:
+            filters.append(DataPoint.task_id == task_id)
+
+        chunk_ids = (
+            select(DataPoint.id)
+            .where(*filters)
+            .order_by(DataPoint.id)
+            .limit(chunk_size)
+            .scalar_subquery()
+        )
+        statement = (
+            delete(DataPoint)
+            .where(DataPoint.id.in_(chunk_ids))
+            .execution_options(synchronize_session=False)
+        )
+
+        while max_chunks is None or report.chunks < max_chunks:
+            deleted = db.execute(statement).rowcount
+            db.commit()
+            report.rows_deleted += deleted
+            report.chunks += 1
+
+            if deleted < chunk_size:
+                report.completed = True
+                break
+            if throttle_seconds:
+                time.sleep(throttle_seconds)
+
+        report.elapsed_seconds = round(time.perf_counter() - started, 3)
+        if report.elapsed_seconds:
+            report.rows_per_second = round(
+                report.rows_deleted / report.elapsed_seconds, 1
+            )
+        return report
+
+
+@registry.register("data_cleanup", hint=ResourceHint.IO_BOUND)
+def process_data_cleanup(task_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Delete expired data points in throttled chunks"""
+    try:
+        if task_data.get("cutoff"):
+            # Resuming a previous run keeps its original cutoff
+            cutoff = datetime.fromisoformat(task_data["cutoff"])
+        else:
+            days_old = int(task_data.get("days_old", 30))
+            cutoff = datetime.now(timezone.utc) - timedelta(days=days_old)
+
+        with get_db_session() as db:
+            report = CleanupEngine.delete_before(
+                db,
+                cutoff,
+                chunk_size=task_data.get("chunk_size"),
+                throttle_seconds=task_data.get("throttle_seconds"),
+                data_type=task_data.get("data_type"),
+                task_id=task_data.get("task_id"),
+                max_chunks=task_data.get("max_chunks"),
+            )
+
+        logger.info(
+            f"Cleanup removed {report.rows_deleted} rows in "
+            f"{report.chunks} chunks ({report.rows_per_second} rows/s)"
+        )
+        return {
+            "status": "success",
+            "message": f"Cleanup completed before {report.cutoff}",
+            **report.to_dict(),
+        }
+
+    except Exception as e:
+        logger.error(f"Data cleanup failed: {e}")
+        return {
+            "status": "error",
+            "message": f"Failed to cleanup data: {str(e)}",
+        }
@@ -1,8 +1,22 @@
+import hashlib
+from datetime import (
+    datetime,
+    timezone,
+)
 from typing import (
+    Any,
+    Dict,
     List,
     Optional,
 )
 
+from sqlalchemy import (
+    func,
+)
+from sqlalchemy.dialects import (
+    postgresql,
+    sqlite,
+)
 from sqlalchemy.orm import (
     Session,
 )
@@ -41,6 +55,82 @@ class DataPointService:
         db.refresh(db_data_point)
         return db_data_point
 
+    @staticmethod
+    def dedup_key(data_point: Dict[str, Any]) -> Optional[str]:
+        """
+        Idempotency key of a reading: the client's own key, else a hash
+        of task, type and reading time. None (no dedup) without either.
+        """
+        if data_point.get("dedup_key"):
+            return data_point["dedup_key"]
+        timestamp = data_point.get("timestamp")
+        if timestamp is None:
+            return None
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        natural = (
+            f"{data_point['task_id']}|{data_point['data_type']}|"
+            f"{timestamp.astimezone(timezone.utc).isoformat()}"
+        )
+        return hashlib.sha256(natural.encode()).hexdigest()
+
+    @staticmethod
+    def upsert_many(
+        db: Session,
+        data_points: List[Dict[str, Any]],
+        on_conflict: str = "ignore",
+    ) -> int:
+        """
+        Write data points with one INSERT ... ON CONFLICT (dedup_key).
+
+        "ignore" leaves stored duplicates untouched (DO NOTHING); "update"
+        overwrites their values and bumps updated_at, so collection ETags
+        change. Returns the number of rows inserted or updated.
+        """
+        now = datetime.now(timezone.utc)
+        rows, keyed = [], {}
+        for data_point in data_points:
+            row = {
+                "task_id": data_point["task_id"],
+                "data_type": data_point["data_type"],
+                "value_json": data_point.get("value_json"),
+                "meta_data": data_point.get("meta_data"),
+                # Multi-row VALUES can't fall back to the server default
+                "timestamp": data_point.get("timestamp") or now,
+                "dedup_key": DataPointService.dedup_key(data_point),
+            }
+            key = row["dedup_key"]
+            if key is None:
+                rows.append(row)
+            elif on_conflict == "update":
+                # One statement can't touch a row twice: last one wins
+                keyed[key] = row
+            else:
+                keyed.setdefault(key, row)
+        rows.extend(keyed.values())
+        if not rows:
+            return 0
+
+        dialect = db.get_bind().dialect.name
+        insert = (postgresql if dialect == "postgresql" else sqlite).insert
+        statement = insert(DataPoint.__table__).values(rows)
+        if on_conflict == "update":
+            statement = statement.on_conflict_do_update(
+                index_elements=[DataPoint.dedup_key],
+                set_={
+                    "value_json": statement.excluded.value_json,
+                    "meta_data": statement.excluded.meta_data,
+                    "updated_at": func.now(),
+                },
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(
+                index_elements=[DataPoint.dedup_key]
+            )
+        written = len(db.execute(statement.returning(DataPoint.id)).all())
+        db.commit()
+        return written
+
     @staticmethod
     def get_data_points_by_source(db: Session, source: str) -> List[DataPoint]:
         """Get data points filtered by source"""
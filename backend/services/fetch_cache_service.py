@@ -0,0 +1,117 @@
+"""
+Upstream fetch cache.
+Tracks ETag / Last-Modified / content hash per polled URL so pollers can
+send conditional requests and skip storing payloads that didn't change.
+"""
+
+import hashlib
+from datetime import (
+    datetime,
+    timezone,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Optional,
+    Tuple,
+)
+
+import httpx
+from sqlalchemy.orm import (
+    Session,
+)
+
+from core.db_functions.session import (
+    get_db_session,
+)
+from models.models import (
+    UpstreamFetchState,
+)
+
+
+class FetchCacheService:
+    @staticmethod
+    def get_state(db: Session, url: str) -> Optional[UpstreamFetchState]:
+        """Get the cached validators for a URL"""
+        return (
+            db.query(UpstreamFetchState)
+            .filter(UpstreamFetchState.url == url)
+            .first()
+        )
+
+    @staticmethod
+    def conditional_headers(db: Session, url: str) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for a URL"""
+        state = FetchCacheService.get_state(db, url)
+        headers = {}
+        if state and state.etag:
+            headers["If-None-Match"] = state.etag
+        if state and state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+        return headers
+
+    @staticmethod
+    def record_response(
+        db: Session, url: str, response: httpx.Response
+    ) -> bool:
+        """
+        Stage validators from a response on the session.
+
+        Returns True when the payload differs from the previous fetch. A
+        304, or a 200 whose body hashes to the stored value, counts as
+        unchanged. Nothing is committed: the caller commits once the
+        payload is stored, so a failed store is fetched again next time.
+        """
+        now = datetime.now(timezone.utc)
+        state = FetchCacheService.get_state(db, url)
+        if state is None:
+            state = UpstreamFetchState(
+                url=url, fetch_count=0, unchanged_count=0
+            )
+            db.add(state)
+
+        state.fetch_count += 1
+        state.last_fetched_at = now
+
+        if response.status_code == 304:
+            changed = False
+        else:
+            content_hash = hashlib.sha256(response.content).hexdigest()
+            changed = content_hash != state.content_hash
+            state.content_hash = content_hash
+            state.etag = response.headers.get("etag")
+            state.last_modified = response.headers.get("last-modified")
+
+        if changed:
+            state.last_changed_at = now
+        else:
+            state.unchanged_count += 1
+
+        db.flush()
+        return changed
+
+
+def fetch_if_changed(
+    url: str,
+    handle: Callable[[Session, httpx.Response], Any],
+    timeout: float = 30,
+) -> Tuple[bool, Any]:
+    """
+    Conditional GET of a URL; hand a changed payload to handle(db, response).
+
+    The new validators commit in handle's transaction, only after it
+    returns. If handle raises, they roll back and the next poll gets the
+    payload again instead of a 304. Returns (changed, handle's result).
+    """
+    with get_db_session() as db:
+        headers = FetchCacheService.conditional_headers(db, url)
+
+    response = httpx.get(url, timeout=timeout, headers=headers)
+    if response.status_code != 304:
+        response.raise_for_status()
+
+    with get_db_session() as db:
+        changed = FetchCacheService.record_response(db, url, response)
+        result = handle(db, response) if changed else None
+    return changed, result
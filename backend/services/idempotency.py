@@ -0,0 +1,406 @@
+"""
+Idempotency store for at-least-once message handling.
+Workers claim a message key before doing the work; a duplicate of a
+completed message is skipped. A claim records the Celery task that owns
+it: a redelivery of that task (its worker died) or an expired lease takes
+the claim over, and any other duplicate of an in-flight message is
+retried after the lease instead of being acknowledged.
+"""
+
+import functools
+import json
+import logging
+import threading
+import time
+from collections import (
+    OrderedDict,
+)
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Optional,
+)
+
+from sqlalchemy import (
+    delete,
+    func,
+    select,
+)
+from sqlalchemy.exc import (
+    IntegrityError,
+)
+
+from core.config import (
+    settings,
+)
+from db.database import (
+    SessionLocal,
+)
+from models.models import (
+    ProcessedMessage,
+)
+
+logger = logging.getLogger(__name__)
+
+# Outcomes of a claim
+CLAIMED = "claimed"
+IN_PROGRESS = "in_progress"
+COMPLETED = "completed"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite returns naive datetimes for timezone-aware columns
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _stats(claims: int, duplicates: int, backend: str) -> Dict[str, Any]:
+    seen = claims + duplicates
+    return {
+        "backend": backend,
+        "claims": claims,
+        "duplicates": duplicates,
+        "hit_rate": round(duplicates / seen, 4) if seen else 0.0,
+    }
+
+
+class MemoryIdempotencyStore:
+    """Per-process store; the fallback when no shared store is reachable"""
+
+    backend = "memory"
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.claims = 0
+        self.duplicates = 0
+
+    def claim(
+        self,
+        key: str,
+        lease_seconds: int,
+        owner: str = "",
+        takeover: bool = False,
+    ) -> str:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                if entry[0] == COMPLETED or not takeover:
+                    self.duplicates += 1
+                    return entry[0]
+            self._entries[key] = [IN_PROGRESS, now + lease_seconds, owner]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.claims += 1
+            return CLAIMED
+
+    def complete(self, key: str, ttl_seconds: int, owner: str = ""):
+        with self._lock:
+            self._entries[key] = [
+                COMPLETED,
+                time.monotonic() + ttl_seconds,
+                owner,
+            ]
+
+    def release(self, key: str, owner: str = ""):
+        with self._lock:
+            entry = self._entries.get(key)
+            # Only the owner may drop a claim; a takeover has a new owner
+            if entry is not None and entry[0] == IN_PROGRESS:
+                if entry[2] == owner:
+                    del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return _stats(self.claims, self.duplicates, self.backend)
+
+
+class DatabaseIdempotencyStore:
+    """processed_messages table, shared by every worker"""
+
+    backend = "database"
+
+    def __init__(self, session_factory: Optional[Callable] = None):
+        self.session_factory = session_factory or SessionLocal
+
+    def claim(
+        self,
+        key: str,
+        lease_seconds: int,
+        owner: str = "",
+        takeover: bool = False,
+    ) -> str:
+        now = _utcnow()
+        db = self.session_factory()
+        try:
+            record = db.get(ProcessedMessage, key, with_for_update=True)
+            if record is None:
+                db.add(
+                    ProcessedMessage(
+                        key=key,
+                        status=IN_PROGRESS,
+                        owner=owner,
+                        hit_count=0,
+                        expires_at=now + timedelta(seconds=lease_seconds),
+                    )
+                )
+                try:
+                    db.commit()
+                    return CLAIMED
+                except IntegrityError:
+                    # Another worker claimed it between our read and insert
+                    db.rollback()
+                    record = db.get(ProcessedMessage, key)
+
+            if _aware(record.expires_at) > now and (
+                record.status == COMPLETED or not takeover
+            ):
+                status = record.status
+                record.hit_count += 1
+                db.commit()
+                return status
+
+            # The lease or TTL ran out, or the owner's message came back
+            # after its worker died; take it over
+            record.status = IN_PROGRESS
+            record.owner = owner
+            record.expires_at = now + timedelta(seconds=lease_seconds)
+            db.commit()
+            return CLAIMED
+        finally:
+            db.close()
+
+    def complete(self, key: str, ttl_seconds: int, owner: str = ""):
+        db = self.session_factory()
+        try:
+            record = db.get(ProcessedMessage, key)
+            if record is not None:
+                record.status = COMPLETED
+                record.owner = owner
+                record.expires_at = _utcnow() + timedelta(seconds=ttl_seconds)
+                db.commit()
+        finally:
+            db.close()
+
+    def release(self, key: str, owner: str = ""):
+        db = self.session_factory()
+        try:
+            db.execute(
+                delete(ProcessedMessage).where(
+                    ProcessedMessage.key == key,
+                    ProcessedMessage.status == IN_PROGRESS,
+                    ProcessedMessage.owner == owner,
+                )
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def purge_expired(self) -> int:
+        """Delete records past their TTL"""
+        db = self.session_factory()
+        try:
+            deleted = db.execute(
+                delete(ProcessedMessage).where(
+                    ProcessedMessage.expires_at < _utcnow()
+                )
+            ).rowcount
+            db.commit()
+            return deleted
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        db = self.session_factory()
+        try:
+            claims, duplicates = db.execute(
+                select(
+                    func.count(ProcessedMessage.key),
+                    func.coalesce(func.sum(ProcessedMessage.hit_count), 0),
+                )
+            ).one()
+            return _stats(claims, int(duplicates), self.backend)
+        finally:
+            db.close()
+
+
+# Claim atomically: returns the claimed/duplicate status. Values are
+# "completed" or "in_progress:<owner>"
+_CLAIM_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if current and (current == 'completed' or ARGV[3] ~= '1') then
+    return string.match(current, '^[^:]+')
+end
+redis.call('SET', KEYS[1], 'in_progress:' .. ARGV[2], 'EX', ARGV[1])
+return 'claimed'
+"""
+
+# Delete the claim only while the caller still owns it
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == 'in_progress:' .. ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisIdempotencyStore:
+    """Keys with expiry, claimed by a script; needs the redis package"""
+
+    backend = "redis"
+
+    def __init__(self, url: str, prefix: str = "idempotency:"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.client.ping()
+        self.prefix = prefix
+        self._claim = self.client.register_script(_CLAIM_SCRIPT)
+        self._release = self.client.register_script(_RELEASE_SCRIPT)
+
+    def claim(
+        self,
+        key: str,
+        lease_seconds: int,
+        owner: str = "",
+        takeover: bool = False,
+    ) -> str:
+        status = self._claim(
+            keys=[self.prefix + key],
+            args=[lease_seconds, owner, "1" if takeover else "0"],
+        ).decode()
+        counter = "claims" if status == CLAIMED else "duplicates"
+        self.client.incr(self.prefix + "stats:" + counter)
+        return status
+
+    def complete(self, key: str, ttl_seconds: int, owner: str = ""):
+        self.client.set(self.prefix + key, COMPLETED, ex=ttl_seconds)
+
+    def release(self, key: str, owner: str = ""):
+        self._release(keys=[self.prefix + key], args=[owner])
+
+    def stats(self) -> Dict[str, Any]:
+        claims, duplicates = self.client.mget(
+            self.prefix + "stats:claims", self.prefix + "stats:duplicates"
+        )
+        return _stats(int(claims or 0), int(duplicates or 0), self.backend)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_idempotency_store():
+    """Configured store, falling back to memory if it can't be reached"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            backend = settings.IDEMPOTENCY_BACKEND
+            try:
+                if backend == "redis":
+                    _store = RedisIdempotencyStore(settings.REDIS_URL)
+                elif backend == "database":
+                    _store = DatabaseIdempotencyStore()
+            except Exception as e:
+                logger.warning(
+                    f"⚠️ {backend} idempotency store unavailable: {e}"
+                )
+            if _store is None:
+                _store = MemoryIdempotencyStore()
+    return _store
+
+
+def message_key(task, payload: Any) -> str:
+    """
+    correlation_id, then message_id, then the Celery task id.
+
+    Never a record id from the payload: re-processing the same record is
+    a new message, not a duplicate.
+    """
+    if isinstance(payload, str):
+        try:
+            payload = json.loads(payload)
+        except ValueError:
+            payload = {}
+    if isinstance(payload, dict):
+        for field in ("correlation_id", "message_id"):
+            if payload.get(field):
+                return str(payload[field])
+    return str(task.request.id)
+
+
+def _redelivered(task) -> bool:
+    delivery_info = getattr(task.request, "delivery_info", None) or {}
+    return bool(delivery_info.get("redelivered"))
+
+
+def idempotent(name: Optional[str] = None, key: Callable = message_key):
+    """
+    Skip bound Celery tasks whose message was already handled.
+
+    The key is claimed for the task id before the task body runs, marked
+    completed on success and released on failure so a retry can claim it
+    again. A duplicate of an in-flight message is retried after the lease
+    rather than acknowledged, so if the claim's owner died the message
+    still runs once the lease expires. If the store itself fails the task
+    runs anyway: a possible duplicate is better than a lost message.
+    """
+
+    def decorator(func):
+        handler = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(task, payload, *args, **kwargs):
+            dedup_key = f"{handler}:{key(task, payload)}"
+            owner = str(task.request.id)
+            lease = settings.IDEMPOTENCY_LEASE_SECONDS
+            store = get_idempotency_store()
+            try:
+                status = store.claim(
+                    dedup_key, lease, owner, takeover=_redelivered(task)
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ Idempotency check failed: {e}")
+                return func(task, payload, *args, **kwargs)
+
+            if status == COMPLETED:
+                logger.info(f"⏭️ Skipping duplicate message {dedup_key}")
+                return {"status": "duplicate", "idempotency_key": dedup_key}
+            if status == IN_PROGRESS:
+                logger.info(f"⏳ {dedup_key} is in progress, retrying later")
+                raise task.retry(countdown=lease)
+
+            try:
+                result = func(task, payload, *args, **kwargs)
+            except BaseException:
+                _safely(store.release, dedup_key, owner)
+                raise
+            _safely(
+                store.complete,
+                dedup_key,
+                settings.IDEMPOTENCY_TTL_SECONDS,
+                owner,
+            )
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def _safely(operation: Callable, *args):
+    try:
+        operation(*args)
+    except Exception as e:
+        logger.warning(f"⚠️ Idempotency store update failed: {e}")
@@ -0,0 +1,245 @@
+"""
+Process pool for CPU-bound work in the API.
+
+Request handlers hand enrichment or analysis to a ProcessPoolExecutor
+started with the app's lifespan, so the event loop keeps serving other
+routes. The pool accepts at most PROCESS_POOL_WORKERS running plus
+PROCESS_POOL_MAX_PENDING queued jobs; past that, PoolSaturatedError
+tells the caller to answer 503 with a Retry-After estimate.
+"""
+
+import asyncio
+import logging
+import math
+import multiprocessing
+import threading
+import time
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from dataclasses import (
+    dataclass,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Optional,
+)
+
+from core.config import (
+    settings,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PoolSaturatedError(Exception):
+    """Every worker is busy and the pending queue is full"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Process pool saturated, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class JobResult:
+    result: Any
+    queued_seconds: float
+    run_seconds: float
+
+    def timing(self) -> Dict[str, float]:
+        return {
+            "queued_seconds": round(self.queued_seconds, 4),
+            "run_seconds": round(self.run_seconds, 4),
+        }
+
+
+def _timed_call(fn: Callable, args: tuple, kwargs: dict):
+    # Runs in the child: time the work itself, not the pickling and queue
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+class ProcessPoolService:
+    """Bounded ProcessPoolExecutor with per-job timing"""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+        start_method: Optional[str] = None,
+    ):
+        self.max_workers = max_workers or settings.PROCESS_POOL_WORKERS
+        self.max_pending = (
+            settings.PROCESS_POOL_MAX_PENDING
+            if max_pending is None
+            else max_pending
+        )
+        self.timeout_seconds = (
+            timeout_seconds or settings.PROCESS_POOL_TIMEOUT_SECONDS
+        )
+        self.start_method = (
+            start_method or settings.PROCESS_POOL_START_METHOD
+        )
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._stats = {
+            "jobs": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "rejected": 0,
+            "run_seconds": 0.0,
+            "max_run_seconds": 0.0,
+            "queued_seconds": 0.0,
+        }
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_pending
+
+    @property
+    def running(self) -> bool:
+        return self._executor is not None
+
+    def start(self):
+        """Create the executor; worker processes spawn on first use"""
+        if self._executor is not None:
+            return
+        try:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+            )
+        except (OSError, NotImplementedError) as e:
+            # No POSIX semaphores (e.g. AWS Lambda): keep the work off the
+            # event loop with threads instead
+            logger.warning(f"⚠️ No process pool ({e}), using threads")
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="cpu-pool",
+            )
+        logger.info(
+            f"🧮 Process pool started: {self.max_workers} workers, "
+            f"{self.max_pending} pending"
+        )
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting jobs, drop queued ones and stop the workers"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+            logger.info("🧮 Process pool stopped")
+
+    async def run(
+        self,
+        fn: Callable,
+        *args,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> JobResult:
+        """
+        Run fn(*args, **kwargs) in a worker process.
+
+        fn and its arguments must be picklable (module-level functions).
+        Raises PoolSaturatedError when the pool is full and
+        asyncio.TimeoutError after `timeout` seconds; a timed-out job
+        keeps its slot until its process finishes it.
+        """
+        if self._executor is None:
+            raise RuntimeError("Process pool is not running")
+
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self._stats["rejected"] += 1
+                raise PoolSaturatedError(self._retry_after())
+            self._in_flight += 1
+
+        submitted = time.perf_counter()
+        try:
+            future = self._executor.submit(_timed_call, fn, args, kwargs)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+
+        try:
+            result, run_seconds = await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                timeout or self.timeout_seconds,
+            )
+        except asyncio.TimeoutError:
+            self._count("timed_out")
+            raise
+        except Exception:
+            self._count("failed")
+            raise
+
+        elapsed = time.perf_counter() - submitted
+        job = JobResult(
+            result=result,
+            queued_seconds=max(0.0, elapsed - run_seconds),
+            run_seconds=run_seconds,
+        )
+        with self._lock:
+            self._stats["jobs"] += 1
+            self._stats["run_seconds"] += run_seconds
+            self._stats["queued_seconds"] += job.queued_seconds
+            self._stats["max_run_seconds"] = max(
+                self._stats["max_run_seconds"], run_seconds
+            )
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            in_flight = self._in_flight
+        jobs = stats.pop("jobs")
+        run_seconds = stats.pop("run_seconds")
+        queued_seconds = stats.pop("queued_seconds")
+        return {
+            "running": self.running,
+            "workers": self.max_workers,
+            "capacity": self.capacity,
+            "in_flight": in_flight,
+            "jobs": jobs,
+            **stats,
+            "avg_run_seconds": round(run_seconds / jobs, 4) if jobs else 0.0,
+            "avg_queued_seconds": (
+                round(queued_seconds / jobs, 4) if jobs else 0.0
+            ),
+            "max_run_seconds": round(stats["max_run_seconds"], 4),
+        }
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def _retry_after(self) -> int:
+        # Time for the jobs ahead to drain at the average job duration;
+        # called with the lock held
+        jobs = self._stats["jobs"]
+        average = self._stats["run_seconds"] / jobs if jobs else 1.0
+        waves = self._in_flight / self.max_workers
+        return max(1, math.ceil(average * waves))
+
+
+_pool: Optional[ProcessPoolService] = None
+_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessPoolService:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolService()
+    return _pool
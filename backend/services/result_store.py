@@ -0,0 +1,384 @@
+"""
+Task result store.
+Keeps the latest Celery state of each task with a TTL. Workers buffer
+state changes in memory and write them in batches, so update_state calls
+and STARTED/SUCCESS transitions cost one bulk write per flush interval
+instead of one database write each.
+"""
+
+import abc
+import json
+import logging
+import threading
+import time
+from collections import (
+    OrderedDict,
+)
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Optional,
+)
+
+from celery import (
+    states,
+)
+from celery.backends.base import (
+    BaseBackend,
+)
+from celery.result import (
+    result_from_tuple,
+)
+from sqlalchemy import (
+    delete,
+    select,
+)
+
+from core.config import (
+    settings,
+)
+from db.database import (
+    SessionLocal,
+)
+from models.models import (
+    TaskResult,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite returns naive datetimes for timezone-aware columns
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _is_ready(entry: tuple) -> bool:
+    return entry[0].get("status") in states.READY_STATES
+
+
+class ResultStoreUnavailable(RuntimeError):
+    """Raised when the configured result store can't be reached"""
+
+
+class MemoryResultStore:
+    """Per-process store for local runs; other processes can't see it"""
+
+    backend = "memory"
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def set(self, task_id: str, meta: Dict[str, Any], ttl_seconds: int):
+        with self._lock:
+            self._entries[task_id] = (meta, time.monotonic() + ttl_seconds)
+            self._entries.move_to_end(task_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(task_id)
+            if entry is None or entry[1] <= time.monotonic():
+                return None
+            return entry[0]
+
+    def delete(self, task_id: str):
+        with self._lock:
+            self._entries.pop(task_id, None)
+
+    def flush(self) -> int:
+        return 0
+
+
+class BufferedResultStore(abc.ABC):
+    """
+    Coalesces state changes per task and writes them in batches.
+
+    A background thread flushes every flush_seconds; a full buffer of
+    batch_size tasks flushes at once. A failed flush is logged and its
+    states go back into the buffer for the next one, unless a newer
+    state for the same task arrived in the meantime.
+    """
+
+    backend = "buffered"
+
+    def __init__(
+        self,
+        flush_seconds: Optional[float] = None,
+        batch_size: Optional[int] = None,
+    ):
+        if flush_seconds is None:
+            flush_seconds = settings.RESULT_STORE_FLUSH_SECONDS
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size or settings.RESULT_STORE_BATCH_SIZE
+        self._pending: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+
+    def set(self, task_id: str, meta: Dict[str, Any], ttl_seconds: int):
+        with self._lock:
+            current = self._pending.get(task_id)
+            # A late PROGRESS update must not hide the final result
+            if current is None or not _is_ready(current):
+                self._pending[task_id] = (meta, ttl_seconds)
+            full = len(self._pending) >= self.batch_size
+            self._start_flusher()
+        if full:
+            self.flush()
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            pending = self._pending.get(task_id)
+        if pending is not None:
+            return pending[0]
+        return self._read(task_id)
+
+    def flush(self) -> int:
+        """Write buffered states; returns the number of tasks written"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        try:
+            self._write(pending)
+            return len(pending)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to flush {len(pending)} results: {e}")
+            self._requeue(pending)
+            return 0
+
+    def _requeue(self, failed: Dict[str, tuple]):
+        with self._lock:
+            for task_id, entry in failed.items():
+                current = self._pending.get(task_id)
+                # Newer states win, except over a final one
+                if current is None or (
+                    _is_ready(entry) and not _is_ready(current)
+                ):
+                    self._pending[task_id] = entry
+
+    def _start_flusher(self):
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        # Started lazily so prefork children each get their own thread
+        self._flusher = threading.Thread(
+            target=self._flush_periodically,
+            name="result-store-flusher",
+            daemon=True,
+        )
+        self._flusher.start()
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            self.flush()
+
+    @abc.abstractmethod
+    def _read(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Stored state of a task, None if unknown or expired"""
+
+    @abc.abstractmethod
+    def _write(self, pending: Dict[str, tuple]):
+        """Store {task_id: (meta, ttl_seconds)}; raise on failure"""
+
+
+class DatabaseResultStore(BufferedResultStore):
+    """task_results table, one bulk replace per flush"""
+
+    backend = "database"
+
+    def __init__(self, session_factory: Optional[Callable] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.session_factory = session_factory or SessionLocal
+
+    def _read(self, task_id: str) -> Optional[Dict[str, Any]]:
+        db = self.session_factory()
+        try:
+            row = db.execute(
+                select(TaskResult.meta, TaskResult.expires_at).where(
+                    TaskResult.task_id == task_id
+                )
+            ).first()
+        finally:
+            db.close()
+        if row is None or _aware(row.expires_at) <= _utcnow():
+            return None
+        return json.loads(row.meta)
+
+    def _write(self, pending: Dict[str, tuple]):
+        now = _utcnow()
+        rows = [
+            {
+                "task_id": task_id,
+                "status": meta["status"],
+                "meta": json.dumps(meta, default=str),
+                "updated_at": now,
+                "expires_at": now + timedelta(seconds=ttl_seconds),
+            }
+            for task_id, (meta, ttl_seconds) in pending.items()
+        ]
+        db = self.session_factory()
+        try:
+            db.execute(
+                delete(TaskResult).where(TaskResult.task_id.in_(pending))
+            )
+            db.bulk_insert_mappings(TaskResult, rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def delete(self, task_id: str):
+        with self._lock:
+            self._pending.pop(task_id, None)
+        db = self.session_factory()
+        try:
+            db.execute(delete(TaskResult).where(TaskResult.task_id == task_id))
+            db.commit()
+        finally:
+            db.close()
+
+    def purge_expired(self) -> int:
+        """Delete results past their TTL"""
+        db = self.session_factory()
+        try:
+            deleted = db.execute(
+                delete(TaskResult).where(TaskResult.expires_at < _utcnow())
+            ).rowcount
+            db.commit()
+            return deleted
+        finally:
+            db.close()
+
+
+class RedisResultStore(BufferedResultStore):
+    """SET with expiry, pipelined per flush; needs the redis package"""
+
+    backend = "redis"
+
+    def __init__(self, url: str, prefix: str = "task-result:", **kwargs):
+        import redis
+
+        super().__init__(**kwargs)
+        self.client = redis.Redis.from_url(url)
+        self.client.ping()
+        self.prefix = prefix
+
+    def _read(self, task_id: str) -> Optional[Dict[str, Any]]:
+        value = self.client.get(self.prefix + task_id)
+        return json.loads(value) if value else None
+
+    def _write(self, pending: Dict[str, tuple]):
+        pipeline = self.client.pipeline(transaction=False)
+        for task_id, (meta, ttl_seconds) in pending.items():
+            pipeline.set(
+                self.prefix + task_id,
+                json.dumps(meta, default=str),
+                ex=ttl_seconds,
+            )
+        pipeline.execute()
+
+    def delete(self, task_id: str):
+        with self._lock:
+            self._pending.pop(task_id, None)
+        self.client.delete(self.prefix + task_id)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_result_store():
+    """
+    Configured store. Raises ResultStoreUnavailable if it can't be
+    reached: results kept in one worker's memory would be invisible to
+    the API, so tasks would look PENDING forever. The next call retries.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            backend = settings.RESULT_STORE_BACKEND
+            try:
+                if backend == "redis":
+                    _store = RedisResultStore(settings.REDIS_URL)
+                elif backend == "database":
+                    _store = DatabaseResultStore()
+                elif backend == "memory":
+                    _store = MemoryResultStore()
+                else:
+                    raise ValueError(f"unknown backend {backend!r}")
+            except Exception as e:
+                raise ResultStoreUnavailable(
+                    f"{backend} result store unavailable: {e}"
+                ) from e
+    return _store
+
+
+class ResultStoreBackend(BaseBackend):
+    """
+    Celery result backend on top of the result store.
+
+    Configured as result_backend="services.result_store:ResultStoreBackend".
+    Results expire after RESULT_STORE_TTL_SECONDS. Chords use Celery's
+    polling chord_unlock, since the store has no atomic counters.
+    """
+
+    def __init__(self, app, url=None, **kwargs):
+        super().__init__(app, **kwargs)
+        self.url = url
+
+    def _store_result(
+        self, task_id, result, state, traceback=None, request=None, **kwargs
+    ):
+        meta = self._get_result_meta(
+            result=result, state=state, traceback=traceback, request=request
+        )
+        meta["task_id"] = task_id
+        get_result_store().set(
+            task_id, meta, settings.RESULT_STORE_TTL_SECONDS
+        )
+        return result
+
+    def _get_task_meta_for(self, task_id):
+        meta = get_result_store().get(task_id)
+        if meta is None:
+            return {"status": states.PENDING, "result": None}
+        return self.meta_from_decoded(dict(meta))
+
+    def _forget(self, task_id):
+        get_result_store().delete(task_id)
+
+    def _save_group(self, group_id, result):
+        get_result_store().set(
+            f"group:{group_id}",
+            {"status": states.SUCCESS, "result": result.as_tuple()},
+            settings.RESULT_STORE_TTL_SECONDS,
+        )
+        return result
+
+    def _restore_group(self, group_id):
+        meta = get_result_store().get(f"group:{group_id}")
+        if meta:
+            meta = dict(meta)
+            meta["result"] = result_from_tuple(meta["result"], self.app)
+            return meta
+
+    def _delete_group(self, group_id):
+        get_result_store().delete(f"group:{group_id}")
+
+    def as_uri(self, include_password=False):
+        return "result-store://"
@@ -124,5 +124,19 @@ class SQSService:
         )
 
 
-# Global SQS service instance
-sqs_service = SQSService()
+_sqs_service: Optional[SQSService] = None
+
+
+def get_sqs_service() -> SQSService:
+    """Shared SQSService, created on first use to keep imports cheap"""
+    global _sqs_service
+    if _sqs_service is None:
+        _sqs_service = SQSService()
+    return _sqs_service
+
+
+def __getattr__(name: str):
+    # Backward compatible lazy access to the old module-level instance
+    if name == "sqs_service":
+        return get_sqs_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
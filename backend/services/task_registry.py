@@ -0,0 +1,280 @@
+"""
+Task Registry
+Task-type handlers shared by the Celery workers and the task processor
+Lambda. Standard library only: deploy-lambda.sh copies this file into the
+Lambda package next to task_processor.py.
+"""
+
+import logging
+import multiprocessing
+import os
+import statistics
+import threading
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from dataclasses import (
+    dataclass,
+)
+from enum import (
+    Enum,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+)
+
+logger = logging.getLogger(__name__)
+
+TaskFunc = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+class ResourceHint(str, Enum):
+    """How a task type uses resources, which decides where it runs"""
+
+    # Pure-Python compute: a process pool sidesteps the GIL
+    CPU_BOUND = "cpu_bound"
+    # Waits on network or disk: threads are enough
+    IO_BOUND = "io_bound"
+    # Cheap per item: a whole batch runs in one pool slot
+    BATCHABLE = "batchable"
+
+
+class UnknownTaskType(KeyError):
+    """Raised for a task type with no registered handler"""
+
+
+@dataclass
+class TaskHandler:
+    name: str
+    func: TaskFunc
+    hint: ResourceHint = ResourceHint.IO_BOUND
+    description: str = ""
+
+
+def _run_sequential(
+    func: TaskFunc, items: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    return [func(item) for item in items]
+
+
+class TaskRegistry:
+    """
+    Maps task types to handlers and runs them on a matching executor.
+
+    CPU-bound handlers go to a process pool, IO-bound and batchable ones to
+    a thread pool. Where processes can't be started (no /dev/shm on Lambda,
+    daemonic Celery prefork children, TASK_PROCESS_WORKERS=0) CPU-bound
+    handlers fall back to the thread pool.
+    """
+
+    def __init__(
+        self,
+        max_threads: Optional[int] = None,
+        max_processes: Optional[int] = None,
+    ):
+        self._handlers: Dict[str, TaskHandler] = {}
+        self.max_threads = max_threads or int(
+            os.environ.get("TASK_THREAD_WORKERS", "8")
+        )
+        if max_processes is None:
+            max_processes = int(
+                os.environ.get("TASK_PROCESS_WORKERS", os.cpu_count() or 1)
+            )
+        self.max_processes = max_processes
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[Executor] = None
+        self._processes_unavailable = False
+        self._lock = threading.Lock()
+
+    def register(
+        self, name: str, hint: ResourceHint = ResourceHint.IO_BOUND
+    ) -> Callable[[TaskFunc], TaskFunc]:
+        """Decorator registering a handler for a task type"""
+
+        def decorator(func: TaskFunc) -> TaskFunc:
+            self._handlers[name] = TaskHandler(
+                name=name,
+                func=func,
+                hint=ResourceHint(hint),
+                description=(func.__doc__ or "").strip(),
+            )
+            return func
+
+        return decorator
+
+    def get(self, name: str) -> TaskHandler:
+        try:
+            return self._handlers[name]
+        except KeyError:
+            raise UnknownTaskType(name) from None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._handlers
+
+    def types(self) -> List[str]:
+        return sorted(self._handlers)
+
+    def thread_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(
+                    max_workers=self.max_threads,
+                    thread_name_prefix="task-registry",
+                )
+            return self._thread_pool
+
+    def process_pool(self) -> Executor:
+        with self._lock:
+            if self._process_pool is None and not self._processes_unavailable:
+                self._process_pool = self._start_process_pool()
+                self._processes_unavailable = self._process_pool is None
+        return self._process_pool or self.thread_pool()
+
+    def _start_process_pool(self) -> Optional[Executor]:
+        if self.max_processes < 1:
+            return None
+        if multiprocessing.current_process().daemon:
+            logger.info("Daemonic worker, running CPU-bound tasks in threads")
+            return None
+        try:
+            return ProcessPoolExecutor(max_workers=self.max_processes)
+        except (OSError, NotImplementedError, ImportError) as e:
+            logger.warning(f"Process pool unavailable, using threads: {e}")
+            return None
+
+    def executor_for(self, hint: ResourceHint) -> Executor:
+        if hint == ResourceHint.CPU_BOUND:
+            return self.process_pool()
+        return self.thread_pool()
+
+    def submit(self, name: str, task_data: Dict[str, Any]) -> Future:
+        handler = self.get(name)
+        return self.executor_for(handler.hint).submit(handler.func, task_data)
+
+    def run(
+        self,
+        name: str,
+        task_data: Dict[str, Any],
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Run one task on its executor and wait for the result"""
+        return self.submit(name, task_data).result(timeout=timeout)
+
+    def run_batch(
+        self,
+        name: str,
+        items: List[Dict[str, Any]],
+        timeout: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Run many tasks of one type, results in input order"""
+        handler = self.get(name)
+        executor = self.executor_for(handler.hint)
+        if handler.hint == ResourceHint.BATCHABLE:
+            future = executor.submit(_run_sequential, handler.func, items)
+            return future.result(timeout=timeout)
+        chunksize = 1
+        if isinstance(executor, ProcessPoolExecutor):
+            chunksize = max(1, len(items) // (self.max_processes * 4))
+        return list(
+            executor.map(
+                handler.func, items, timeout=timeout, chunksize=chunksize
+            )
+        )
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            for pool in (self._thread_pool, self._process_pool):
+                if pool is not None:
+                    pool.shutdown(wait=wait)
+            self._thread_pool = None
+            self._process_pool = None
+
+
+registry = TaskRegistry()
+
+
+@registry.register("data_analysis", hint=ResourceHint.CPU_BOUND)
+def process_data_analysis(task_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Summarize values sent inline with the task.
+
+    The backend registers services.analysis_engine in place of this
+    handler to analyze stored data points; the Lambda only has the
+    payload to work with.
+    """
+    try:
+        values = [float(value) for value in task_data.get("values", [])]
+        if not values:
+            return {
+                "status": "error",
+                "message": "data_analysis needs inline 'values' here",
+            }
+
+        threshold = float(task_data.get("zscore_threshold", 3.0))
+        mean = statistics.fmean(values)
+        std = statistics.pstdev(values, mean)
+        anomalies = [
+            value
+            for value in values
+            if std and abs(value - mean) / std > threshold
+        ]
+
+        return {
+            "status": "success",
+            "message": f"Analysis completed for {len(values)} values",
+            "results": {
+                "summary": {
+                    "count": len(values),
+                    "mean": mean,
+                    "std": std,
+                    "min": min(values),
+                    "max": max(values),
+                },
+                "anomalies": {"count": len(anomalies), "values": anomalies},
+            },
+        }
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Failed to analyze data: {str(e)}",
+        }
+
+
+@registry.register("report_generation", hint=ResourceHint.IO_BOUND)
+def process_report_generation(task_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Refuse reports where there is no database.
+
+    The backend registers services.report_engine in place of this handler
+    to stream data points into an S3 multipart upload; the Lambda has no
+    rows to report on and must not hand out a URL for a missing object.
+    """
+    return {
+        "status": "error",
+        "message": "report_generation runs on the backend workers, not here",
+        "report_name": task_data.get("report_name", "report"),
+    }
+
+
+@registry.register("data_cleanup", hint=ResourceHint.IO_BOUND)
+def process_data_cleanup(task_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Refuse cleanups where there is no database.
+
+    The backend registers services.cleanup_engine in place of this
+    handler; the Lambda can't reach the data points, and reporting a
+    cleanup it didn't do would mark the task completed.
+    """
+    return {
+        "status": "error",
+        "message": "data_cleanup runs on the backend workers, not here",
+        "days_old": task_data.get("days_old", 30),
+    }
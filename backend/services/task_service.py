@@ -1,14 +1,22 @@
 from typing import (
+    Any,
+    Dict,
     List,
     Optional,
 )
 
+from sqlalchemy import (
+    insert,
+    select,
+    update,
+)
 from sqlalchemy.orm import (
     Session,
 )
 
 from models.models import (
     Task,
+    User,
 )
 from schemas.schemas import (
     TaskCreate,
@@ -36,6 +44,56 @@ class TaskService:
         db.refresh(db_task)
         return db_task
 
+    @staticmethod
+    def bulk_create(
+        db: Session, tasks: List[Dict[str, Any]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Create tasks with one INSERT ... RETURNING.
+
+        Returns the created rows in input order, with None for tasks
+        whose user doesn't exist (those are not inserted).
+        """
+        user_ids = {task["user_id"] for task in tasks}
+        users = set(db.scalars(select(User.id).where(User.id.in_(user_ids))))
+        valid = [task for task in tasks if task["user_id"] in users]
+
+        rows = iter(())
+        if valid:
+            # Core rows rather than ORM objects: nothing to expire and
+            # reload one by one after the commit. PostgreSQL batches this
+            # into INSERT ... SELECT FROM VALUES ... RETURNING in input
+            # order; SQLite can only keep that order row by row
+            rows = iter(
+                db.execute(
+                    insert(Task.__table__).returning(
+                        *Task.__table__.c, sort_by_parameter_order=True
+                    ),
+                    valid,
+                )
+                .mappings()
+                .all()
+            )
+            db.commit()
+        return [
+            dict(next(rows)) if task["user_id"] in users else None
+            for task in tasks
+        ]
+
+    @staticmethod
+    def bulk_update_status(
+        db: Session, task_ids: List[int], status: str
+    ) -> List[int]:
+        """Set the status of many tasks in one UPDATE; returns found ids"""
+        updated = db.scalars(
+            update(Task.__table__)
+            .where(Task.id.in_(set(task_ids)))
+            .values(status=status)
+            .returning(Task.id)
+        ).all()
+        db.commit()
+        return updated
+
     @staticmethod
     def update_task(
         db: Session, task_id: int, task_update: TaskUpdate
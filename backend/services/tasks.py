@@ -3,17 +3,26 @@ from datetime import (
     datetime,
 )
 
-import httpx
 from celery import (
     current_task,
 )
 
+# Register the backend analysis, cleanup and report handlers
+import services.analysis_engine  # noqa: F401
+import services.cleanup_engine  # noqa: F401
+import services.report_engine  # noqa: F401
 from core.celery_app import (
     celery_app,
 )
+from services.fetch_cache_service import (
+    fetch_if_changed,
+)
 from services.lambda_service import (
     LambdaService,
 )
+from services.task_registry import (
+    registry,
+)
 
 
 @celery_app.task(bind=True)
@@ -27,20 +36,30 @@ def poll_data(self, source_url: str, data_type: str):
             state="PROGRESS", meta={"status": "Starting data polling"}
         )
 
-        # Poll data (this is a simple example)
-        response = httpx.get(source_url, timeout=30)
-        data = response.json()
-
-        # Process and store data
-        processed_data = {
-            "type": data_type,
-            "data": data,
-            "timestamp": datetime.utcnow().isoformat(),
-            "source": source_url,
-        }
-
-        # Here you would typically save to database
-        # db_service.save_data_point(processed_data)
+        def process(db, response):
+            # Runs before the new validators commit: if it fails, the next
+            # poll fetches this payload again
+            processed_data = {
+                "type": data_type,
+                "data": response.json(),
+                "timestamp": datetime.utcnow().isoformat(),
+                "source": source_url,
+            }
+
+            # Here you would typically save to database, in this session
+            # db_service.save_data_point(db, processed_data)
+            return processed_data
+
+        # Conditional request: upstreams answer 304 when nothing changed
+        changed, processed_data = fetch_if_changed(source_url, process)
+
+        if not changed:
+            # Skip storage and downstream enrichment for a repeat payload
+            return {
+                "status": "unchanged",
+                "message": f"{data_type} data unchanged since last poll",
+                "source": source_url,
+            }
 
         return {
             "status": "completed",
@@ -68,12 +87,8 @@ def process_task(self, task_id: int, task_data: dict):
         # Simulate task processing
         task_type = task_data.get("type", "generic")
 
-        if task_type == "data_analysis":
-            # Simulate data analysis
-            result = analyze_data(task_data.get("dataset"))
-        elif task_type == "report_generation":
-            # Simulate report generation
-            result = generate_report(task_data.get("report_config"))
+        if task_type in registry:
+            result = registry.run(task_type, task_data)
         else:
             result = {"message": f"Processed {task_type} task"}
 
@@ -141,21 +156,3 @@ def invoke_lambda_function(function_name: str, payload: dict):
 
     except Exception as e:
         return {"status": "failed", "error": str(e)}
-
-
-def analyze_data(dataset):
-    """Simulate data analysis"""
-    return {
-        "analysis_type": "statistical_summary",
-        "records_processed": len(dataset) if dataset else 0,
-        "timestamp": datetime.utcnow().isoformat(),
-    }
-
-
-def generate_report(config):
-    """Simulate report generation"""
-    return {
-        "report_name": config.get("name", "report") + ".pdf",
-        "pages": config.get("pages", 10),
-        "timestamp": datetime.utcnow().isoformat(),
-    }
@@ -0,0 +1,280 @@
+"""
+Workflow state store.
+Persists workflow runs and a checkpoint per step, so a workflow resumed
+after a worker crash skips every step that already finished and reuses
+its output instead of starting over.
+"""
+
+import threading
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+)
+
+from sqlalchemy import (
+    func,
+    select,
+)
+
+from db.database import (
+    SessionLocal,
+)
+from models.models import (
+    Workflow,
+    WorkflowStep,
+)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+class WorkflowStore:
+    """workflows and workflow_steps tables"""
+
+    def __init__(self, session_factory: Optional[Callable] = None):
+        self.session_factory = session_factory or SessionLocal
+
+    def create(
+        self,
+        workflow_id: str,
+        name: str,
+        config: Dict[str, Any],
+        steps: List[str],
+    ):
+        """Record a new run with its known steps pending"""
+        db = self.session_factory()
+        try:
+            db.add(
+                Workflow(
+                    id=workflow_id,
+                    name=name,
+                    status="running",
+                    config=config,
+                    updated_at=_utcnow(),
+                )
+            )
+            db.add_all(
+                WorkflowStep(
+                    workflow_id=workflow_id,
+                    name=step,
+                    position=position,
+                    status="pending",
+                    attempts=0,
+                )
+                for position, step in enumerate(steps)
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def add_steps(self, workflow_id: str, steps: List[str]):
+        """Append steps found while running (e.g. one per chunk)"""
+        db = self.session_factory()
+        try:
+            existing = set(
+                db.scalars(
+                    select(WorkflowStep.name).where(
+                        WorkflowStep.workflow_id == workflow_id
+                    )
+                )
+            )
+            position = self._next_position(db, workflow_id)
+            for step in steps:
+                if step in existing:
+                    continue
+                db.add(
+                    WorkflowStep(
+                        workflow_id=workflow_id,
+                        name=step,
+                        position=position,
+                        status="pending",
+                        attempts=0,
+                    )
+                )
+                position += 1
+            db.commit()
+        finally:
+            db.close()
+
+    def checkpoint(self, workflow_id: str, step: str) -> Optional[Any]:
+        """Output of a completed step, or None if it has to run"""
+        db = self.session_factory()
+        try:
+            record = db.get(WorkflowStep, (workflow_id, step))
+            if record is None or record.status != "completed":
+                return None
+            return record.output
+        finally:
+            db.close()
+
+    def start_step(self, workflow_id: str, step: str):
+        db = self.session_factory()
+        try:
+            record = db.get(WorkflowStep, (workflow_id, step))
+            if record is None:
+                record = WorkflowStep(
+                    workflow_id=workflow_id,
+                    name=step,
+                    position=self._next_position(db, workflow_id),
+                    attempts=0,
+                )
+                db.add(record)
+            record.status = "running"
+            record.attempts += 1
+            record.error = None
+            record.started_at = _utcnow()
+            self._touch(db, workflow_id)
+            db.commit()
+        finally:
+            db.close()
+
+    def complete_step(
+        self,
+        workflow_id: str,
+        step: str,
+        output: Any,
+        seconds: Optional[float] = None,
+        items: Optional[int] = None,
+    ):
+        db = self.session_factory()
+        try:
+            record = db.get(WorkflowStep, (workflow_id, step))
+            record.status = "completed"
+            record.output = output
+            record.seconds = seconds
+            record.items = items
+            record.finished_at = _utcnow()
+            self._touch(db, workflow_id)
+            db.commit()
+        finally:
+            db.close()
+
+    def fail_step(
+        self, workflow_id: str, step: str, error: str, retrying: bool
+    ):
+        """Mark a step failed; without a retry the workflow fails too"""
+        db = self.session_factory()
+        try:
+            record = db.get(WorkflowStep, (workflow_id, step))
+            record.status = "retrying" if retrying else "failed"
+            record.error = error
+            record.finished_at = _utcnow()
+            workflow = self._touch(db, workflow_id)
+            if not retrying and workflow is not None:
+                workflow.status = "failed"
+                workflow.error = f"{step}: {error}"
+            db.commit()
+        finally:
+            db.close()
+
+    def set_status(self, workflow_id: str, status: str):
+        db = self.session_factory()
+        try:
+            workflow = self._touch(db, workflow_id)
+            workflow.status = status
+            if status != "failed":
+                workflow.error = None
+            db.commit()
+        finally:
+            db.close()
+
+    def config(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        db = self.session_factory()
+        try:
+            workflow = db.get(Workflow, workflow_id)
+            return workflow.config if workflow else None
+        finally:
+            db.close()
+
+    def progress(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        """Status of a run and each of its steps"""
+        db = self.session_factory()
+        try:
+            workflow = db.get(Workflow, workflow_id)
+            if workflow is None:
+                return None
+            steps = [
+                {
+                    "name": step.name,
+                    "status": step.status,
+                    "attempts": step.attempts,
+                    "items": step.items,
+                    "seconds": step.seconds,
+                    "started_at": _iso(step.started_at),
+                    "finished_at": _iso(step.finished_at),
+                    "error": step.error,
+                }
+                for step in workflow.steps
+            ]
+            completed = sum(step["status"] == "completed" for step in steps)
+            return {
+                "id": workflow.id,
+                "name": workflow.name,
+                "status": workflow.status,
+                "error": workflow.error,
+                "created_at": _iso(workflow.created_at),
+                "updated_at": _iso(workflow.updated_at),
+                "completed_steps": completed,
+                # Chunked steps are only known once their input is
+                "known_steps": len(steps),
+                "steps": steps,
+            }
+        finally:
+            db.close()
+
+    def stalled(self, idle_seconds: float) -> List[str]:
+        """Running workflows without a step transition for idle_seconds"""
+        cutoff = _utcnow() - timedelta(seconds=idle_seconds)
+        db = self.session_factory()
+        try:
+            return list(
+                db.scalars(
+                    select(Workflow.id).where(
+                        Workflow.status == "running",
+                        Workflow.updated_at < cutoff,
+                    )
+                )
+            )
+        finally:
+            db.close()
+
+    @staticmethod
+    def _touch(db, workflow_id: str) -> Optional[Workflow]:
+        workflow = db.get(Workflow, workflow_id)
+        if workflow is not None:
+            workflow.updated_at = _utcnow()
+        return workflow
+
+    @staticmethod
+    def _next_position(db, workflow_id: str) -> int:
+        highest = db.scalar(
+            select(func.max(WorkflowStep.position)).where(
+                WorkflowStep.workflow_id == workflow_id
+            )
+        )
+        return 0 if highest is None else highest + 1
+
+
+_store: Optional[WorkflowStore] = None
+_store_lock = threading.Lock()
+
+
+def get_workflow_store() -> WorkflowStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = WorkflowStore()
+    return _store
@@ -3,6 +3,10 @@ Test configuration and fixtures for the backend tests.
 """
 
 import asyncio
+from collections import (
+    defaultdict,
+    deque,
+)
 
 import pytest
 from fastapi.testclient import (
@@ -18,6 +22,7 @@ from sqlalchemy.pool import (
     StaticPool,
 )
 
+import core.middleware.rate_limit as rate_limit
 from db.database import (
     Base,
     get_db,
@@ -25,6 +30,9 @@ from db.database import (
 from main import (
     app,
 )
+from services.aws.sqs.service import (
+    SQSService,
+)
 
 # Test database URL - using SQLite for testing
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -69,6 +77,8 @@ def db_session():
 def client(db_session):
     """Create a test client with database dependency override."""
     app.dependency_overrides[get_db] = override_get_db
+    # Fresh rate-limit buckets, so earlier tests don't use up the budget
+    rate_limit._limiter = None
 
     with TestClient(app) as test_client:
         yield test_client
@@ -77,6 +87,53 @@ def client(db_session):
     app.dependency_overrides.clear()
 
 
+class FakeSQSClient:
+    """In-memory stand-in for the boto3 SQS client"""
+
+    def __init__(self):
+        self.sent = []
+        self.queues = defaultdict(deque)
+        self.in_flight = defaultdict(int)
+
+    def send_message(self, QueueUrl, MessageBody, MessageAttributes):
+        message = {
+            "MessageId": f"msg-{len(self.sent) + 1}",
+            "QueueUrl": QueueUrl,
+            "Body": MessageBody,
+            "MessageAttributes": MessageAttributes,
+            "ReceiptHandle": f"receipt-{len(self.sent) + 1}",
+        }
+        self.sent.append(message)
+        self.queues[QueueUrl].append(message)
+        return {"MessageId": message["MessageId"]}
+
+    def receive_message(
+        self, QueueUrl, MaxNumberOfMessages, WaitTimeSeconds, **kwargs
+    ):
+        queue = self.queues[QueueUrl]
+        count = min(MaxNumberOfMessages, len(queue))
+        self.in_flight[QueueUrl] += count
+        return {"Messages": [queue.popleft() for _ in range(count)]}
+
+    def get_queue_attributes(self, QueueUrl, AttributeNames):
+        return {
+            "Attributes": {
+                "ApproximateNumberOfMessages": str(len(self.queues[QueueUrl])),
+                "ApproximateNumberOfMessagesNotVisible": str(
+                    self.in_flight[QueueUrl]
+                ),
+            }
+        }
+
+
+@pytest.fixture
+def sqs_service():
+    """SQSService backed by an in-memory SQS client."""
+    service = SQSService()
+    service.sqs = FakeSQSClient()
+    return service
+
+
 @pytest.fixture(scope="session")
 def event_loop():
     """Create an instance of the default event loop for the test session."""
@@ -0,0 +1,141 @@
+"""
+Test admission control: in-flight caps, queueing and load shedding.
+"""
+
+import asyncio
+import time
+
+import httpx
+from starlette.applications import (
+    Starlette,
+)
+from starlette.responses import (
+    PlainTextResponse,
+)
+from starlette.routing import (
+    Route,
+)
+
+from core.middleware.admission import (
+    AdmissionControlMiddleware,
+    AdmissionController,
+)
+
+
+def _app(controller, service_seconds=0.05):
+    state = {"running": 0, "peak": 0}
+
+    async def slow(request):
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(service_seconds)
+        state["running"] -= 1
+        return PlainTextResponse("ok")
+
+    async def health(request):
+        return PlainTextResponse("healthy")
+
+    app = Starlette(
+        routes=[Route("/api/v1/slow", slow), Route("/health", health)]
+    )
+    return AdmissionControlMiddleware(app, controller), state
+
+
+async def _burst(app, count, path="/api/v1/slow"):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://test"
+    ) as client:
+
+        async def timed():
+            started = time.perf_counter()
+            response = await client.get(path)
+            return response, time.perf_counter() - started
+
+        return await asyncio.gather(*(timed() for _ in range(count)))
+
+
+def test_requests_over_the_limit_wait_their_turn():
+    controller = AdmissionController({"/api/v1": 2}, queue_timeout=5)
+    app, state = _app(controller)
+
+    results = asyncio.run(_burst(app, 8))
+
+    assert [response.status_code for response, _ in results] == [200] * 8
+    assert state["peak"] == 2
+    stats = controller.stats()["groups"][0]
+    assert (stats["admitted"], stats["queued"]) == (8, 6)
+    assert stats["in_flight"] == 0
+    assert stats["queue_wait_seconds"]["max"] > 0
+
+
+def test_full_queue_is_shed_at_once_with_retry_after():
+    controller = AdmissionController({"/api/v1": 1}, max_queue=1)
+    app, _ = _app(controller, service_seconds=0.2)
+
+    results = asyncio.run(_burst(app, 4))
+
+    rejected = [r for r, _ in results if r.status_code == 503]
+    assert len(rejected) == 2
+    assert int(rejected[0].headers["Retry-After"]) >= 1
+    # Shedding doesn't wait for a slot
+    assert min(elapsed for _, elapsed in results) < 0.1
+
+
+def test_queued_request_times_out():
+    controller = AdmissionController({"/api/v1": 1}, queue_timeout=0.05)
+    app, _ = _app(controller, service_seconds=0.3)
+
+    results = asyncio.run(_burst(app, 2))
+
+    assert sorted(r.status_code for r, _ in results) == [200, 503]
+    stats = controller.stats()["groups"][0]
+    assert stats["rejected_timeout"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_health_bypasses_a_saturated_group():
+    controller = AdmissionController({"/": 1}, max_queue=0)
+    app, _ = _app(controller, service_seconds=0.3)
+
+    async def probe_while_busy():
+        busy = asyncio.ensure_future(_burst(app, 3))
+        await asyncio.sleep(0.05)
+        health = await _burst(app, 1, path="/health")
+        return await busy, health
+
+    busy, [(health, elapsed)] = asyncio.run(probe_while_busy())
+
+    assert sorted(r.status_code for r, _ in busy) == [200, 503, 503]
+    assert health.status_code == 200
+    assert elapsed < 0.2
+
+
+def test_tail_latency_stays_bounded_under_overload():
+    # 400 requests at once against 4 slots of 20ms: without admission
+    # control the last request would wait ~2s
+    controller = AdmissionController(
+        {"/api/v1": 4}, max_queue=50, queue_timeout=0.25
+    )
+    app, state = _app(controller, service_seconds=0.02)
+
+    results = asyncio.run(_burst(app, 400))
+
+    admitted = sorted(
+        elapsed for response, elapsed in results if response.status_code < 500
+    )
+    shed = [r for r, _ in results if r.status_code == 503]
+    assert state["peak"] == 4
+    assert shed and admitted
+    assert admitted[-1] < 0.25 + 0.02 + 0.25
+    stats = controller.stats()["groups"][0]
+    assert stats["queue_wait_seconds"]["p99"] <= 0.25
+
+
+def test_admission_metrics_endpoint(client):
+    client.get("/api/v1/users")
+
+    groups = client.get("/api/v1/metrics/admission").json()["groups"]
+
+    assert {group["prefix"] for group in groups} >= {"/api/v1"}
+    assert all("queue_wait_seconds" in group for group in groups)
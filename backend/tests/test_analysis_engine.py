@@ -0,0 +1,162 @@
+"""
+Test the vectorized data analysis engine.
+"""
+
+import os
+import time
+import tracemalloc
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+
+import numpy as np
+import pytest
+
+from models.models import (
+    DataPoint,
+    Task,
+    User,
+)
+from services.analysis_engine import (
+    AnalysisEngine,
+    SeriesColumns,
+)
+
+# Budgets for the large-series check; override on slow machines
+BENCH_POINTS = int(os.getenv("ANALYSIS_BENCH_POINTS", "10000000"))
+BENCH_SECONDS = float(os.getenv("ANALYSIS_BENCH_SECONDS", "10.0"))
+BENCH_MEMORY_MB = int(os.getenv("ANALYSIS_BENCH_MEMORY_MB", "512"))
+
+
+def _columns(values):
+    values = np.asarray(values, dtype=np.float64)
+    return SeriesColumns(
+        timestamps=np.arange(values.size, dtype=np.float64),
+        values=values,
+        total_rows=values.size,
+    )
+
+
+@pytest.fixture
+def task(db_session):
+    user = User(username="analyst", email="a@example.com", password_hash="x")
+    task = Task(user=user, title="metrics")
+    db_session.add(task)
+    db_session.commit()
+    return task
+
+
+def _add_points(db_session, task, values, data_type="performance_metric"):
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    db_session.add_all(
+        DataPoint(
+            task_id=task.id,
+            data_type=data_type,
+            value_json={"cpu_usage": value},
+            timestamp=start + timedelta(minutes=index),
+        )
+        for index, value in enumerate(values)
+    )
+    db_session.commit()
+
+
+def test_rolling_blocks_match_naive_windows():
+    rng = np.random.default_rng(7)
+    values = rng.normal(1e6, 5.0, size=500)
+
+    starts, means, stds = [], [], []
+    for start, mean, std in AnalysisEngine.rolling_blocks(
+        values, window=20, block_size=64
+    ):
+        starts.append(start)
+        means.append(mean)
+        stds.append(std)
+
+    expected = [values[i - 20:i] for i in range(20, 500)]
+    assert starts[0] == 20
+    np.testing.assert_allclose(
+        np.concatenate(means), [w.mean() for w in expected]
+    )
+    np.testing.assert_allclose(
+        np.concatenate(stds), [w.std() for w in expected], rtol=1e-6
+    )
+
+
+def test_zscore_flags_spike():
+    values = np.sin(np.arange(1000) / 10.0)
+    values[700] = 25.0
+
+    result = AnalysisEngine.analyze(_columns(values), window=50)
+
+    points = result["anomalies"]["points"]
+    assert 700 in [int(point["timestamp"]) for point in points]
+    assert result["summary"]["max"] == 25.0
+    assert result["rolling"]["window"] == 50
+
+
+def test_zero_zscore_threshold_is_not_replaced_by_default():
+    values = np.sin(np.arange(1000) / 10.0)
+
+    default = AnalysisEngine.analyze(_columns(values), window=50)
+    zero = AnalysisEngine.analyze(_columns(values), window=50, threshold=0)
+
+    assert default["anomalies"]["count"] == 0
+    assert zero["anomalies"]["count"] > 0
+
+
+def test_short_series_has_no_rolling_results():
+    result = AnalysisEngine.analyze(_columns([1.0, 2.0, 3.0]), window=10)
+    assert result["summary"]["count"] == 3
+    assert result["anomalies"]["count"] == 0
+
+
+def test_load_columns_projects_one_json_field(db_session, task):
+    _add_points(db_session, task, [10.0, 20.0, 30.0, 40.0])
+    _add_points(db_session, task, [99.0], data_type="other")
+
+    columns = AnalysisEngine.load_columns(
+        db_session,
+        task.id,
+        value_key="cpu_usage",
+        data_type="performance_metric",
+        chunk_size=2,
+    )
+
+    assert columns.values.tolist() == [10.0, 20.0, 30.0, 40.0]
+    assert np.all(np.diff(columns.timestamps) == 60)
+    assert not columns.truncated
+
+
+def test_load_columns_keeps_latest_rows_over_budget(
+    db_session, task, monkeypatch
+):
+    monkeypatch.setattr(
+        "services.analysis_engine.max_rows_for_budget", lambda budget: 2
+    )
+    _add_points(db_session, task, [1.0, 2.0, 3.0])
+
+    columns = AnalysisEngine.load_columns(
+        db_session, task.id, value_key="cpu_usage"
+    )
+
+    assert columns.values.tolist() == [2.0, 3.0]
+    assert columns.truncated and columns.total_rows == 3
+
+
+def test_large_series_within_time_and_memory_budget():
+    rng = np.random.default_rng(1)
+    columns = _columns(rng.normal(50.0, 10.0, size=BENCH_POINTS))
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = AnalysisEngine.analyze(columns, window=60)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert result["summary"]["count"] == BENCH_POINTS
+    assert elapsed < BENCH_SECONDS
+    # Scratch memory on top of the loaded columns
+    assert peak < BENCH_MEMORY_MB * 1024 * 1024
@@ -0,0 +1,202 @@
+"""
+Test the queue-depth and processing-rate autoscaling signal.
+"""
+
+import sys
+from dataclasses import (
+    replace,
+)
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from types import (
+    SimpleNamespace,
+)
+
+import pytest
+from sqlalchemy.orm import (
+    sessionmaker,
+)
+
+import services.autoscaling as autoscaling
+from models.models import (
+    QueueThroughput,
+)
+from services.autoscaling import (
+    AckRecorder,
+    AutoscalingService,
+    desired_workers,
+    smoothed_rate,
+    window_start,
+)
+from workers.celery_app import (
+    WORKER_PROFILES,
+    _record_task_ack,
+    _start_task_timer,
+)
+
+
+class FakeCloudWatch:
+    def __init__(self):
+        self.calls = []
+
+    def put_metric_data(self, Namespace, MetricData):
+        self.calls.append((Namespace, MetricData))
+
+
+@pytest.fixture
+def session_factory(db_session):
+    return sessionmaker(bind=db_session.get_bind())
+
+
+@pytest.fixture
+def service(sqs_service, session_factory):
+    return AutoscalingService(
+        sqs_service=sqs_service,
+        session_factory=session_factory,
+        cloudwatch=FakeCloudWatch(),
+    )
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def test_smoothed_rate_weights_recent_windows():
+    assert smoothed_rate([], 0.3) is None
+    assert smoothed_rate([(10, 0.0)], 0.3) is None
+    assert smoothed_rate([(10, 10.0), (40, 10.0)], 0.5) == 2.5
+
+
+def test_desired_workers_clears_backlog_within_target():
+    # 1200 messages at 2/s per slot over 60s -> 10 slots -> 3 workers of 4
+    assert desired_workers(1200, 2.0, 60, 4, 0, 20) == 3
+    assert desired_workers(0, 2.0, 60, 4, 1, 20) == 1
+    assert desired_workers(10**6, 2.0, 60, 4, 0, 20) == 20
+
+
+def test_ack_recorder_merges_windows_across_workers(session_factory):
+    at = datetime(2026, 10, 19, 12, 0, 30, tzinfo=timezone.utc)
+    first = AckRecorder(session_factory, window_seconds=60, flush_seconds=60)
+    second = AckRecorder(session_factory, window_seconds=60, flush_seconds=60)
+    for _ in range(3):
+        first.record("wipsie-notifications-high", 0.5, at=at)
+    second.record("wipsie-notifications-high", 1.5, at=at)
+
+    assert first.flush() == 1
+    assert second.flush() == 1
+    assert first.flush() == 0
+
+    db = session_factory()
+    row = db.get(
+        QueueThroughput,
+        ("wipsie-notifications-high", window_start(at, 60)),
+    )
+    assert (row.acks, row.busy_seconds) == (4, 3.0)
+    db.close()
+
+
+def test_signals_follow_measured_rate(
+    service, sqs_service, session_factory, monkeypatch
+):
+    cpu = WORKER_PROFILES["cpu"]
+    monkeypatch.setitem(WORKER_PROFILES, "cpu", replace(cpu, concurrency=4))
+    for index in range(1200):
+        sqs_service.send_message("data_polling", {"n": index}, priority="low")
+    recorder = AckRecorder(session_factory, flush_seconds=3600)
+    for _ in range(120):
+        # 2 messages per busy second
+        recorder.record("wipsie-data-polling-low", 0.5)
+    recorder.flush()
+
+    signals = {s["queue"]: s for s in service.signals(running_workers=2)}
+
+    polling = signals["wipsie-data-polling"]
+    assert polling["messages_visible"] == 1200
+    assert polling["rate_source"] == "measured"
+    assert polling["processing_rate_per_slot"] == 2.0
+    assert polling["desired_workers"] == 3
+    assert polling["backlog_per_worker"] == 600
+    assert polling["acceptable_backlog_per_worker"] == 480
+    assert polling["worker_concurrency"] == 4
+    idle = signals["wipsie-default"]
+    assert (idle["desired_workers"], idle["rate_source"]) == (0, "default")
+
+
+def test_concurrency_comes_from_the_queues_worker_profile(
+    service, sqs_service, monkeypatch
+):
+    io = WORKER_PROFILES["io"]
+    monkeypatch.setitem(WORKER_PROFILES, "io", replace(io, concurrency=32))
+    for index in range(1920):
+        sqs_service.send_message("notifications", {"n": index})
+
+    signals = {s["queue"]: s for s in service.signals()}
+
+    # 1920 messages at the default 1/s per slot over 60s: 32 slots, one
+    # io worker of 32 threads rather than eight workers of 4
+    notifications = signals["wipsie-notifications"]
+    assert notifications["worker_concurrency"] == 32
+    assert notifications["acceptable_backlog_per_worker"] == 1920
+    assert notifications["desired_workers"] == 1
+
+
+def test_publish_puts_one_metric_set_per_queue(service):
+    published = service.publish(service.signals())
+
+    namespace, data = service.cloudwatch.calls[0]
+    assert namespace == "Wipsie/Workers"
+    assert published == len(data) == 4 * 4
+    assert {d["Dimensions"][0]["Value"] for d in data} >= {
+        "wipsie-notifications"
+    }
+
+
+def test_purge_drops_old_windows(service, session_factory):
+    db = session_factory()
+    db.add(
+        QueueThroughput(
+            queue="wipsie-default",
+            window_start=_now() - timedelta(days=1),
+            acks=1,
+            busy_seconds=1.0,
+        )
+    )
+    db.commit()
+    db.close()
+
+    assert service.purge_windows() == 1
+
+
+def test_task_postrun_records_ack_for_delivery_queue(monkeypatch):
+    recorded = []
+    # workers.celery_app is shadowed by the app object on the package
+    monkeypatch.setattr(
+        sys.modules[_record_task_ack.__module__],
+        "get_ack_recorder",
+        lambda: SimpleNamespace(record=lambda *args: recorded.append(args)),
+    )
+    task = SimpleNamespace(
+        request=SimpleNamespace(
+            delivery_info={"routing_key": "wipsie-notifications-high"}
+        )
+    )
+
+    _start_task_timer(task_id="t-1")
+    _record_task_ack(task_id="t-1", task=task)
+
+    assert recorded[0][0] == "wipsie-notifications-high"
+    assert recorded[0][1] >= 0
+
+
+def test_autoscaling_endpoint(client, service, monkeypatch):
+    monkeypatch.setattr(autoscaling, "AutoscalingService", lambda: service)
+
+    response = client.get("/api/v1/metrics/autoscaling?publish=true")
+
+    assert response.status_code == 200
+    assert len(response.json()["queues"]) == 4
+    # A GET never writes metrics; the beat task publishes them
+    assert not service.cloudwatch.calls
@@ -0,0 +1,101 @@
+"""
+Test bulk task creation and set-based status updates.
+"""
+
+import pytest
+from sqlalchemy import (
+    event,
+)
+
+from models.models import (
+    Task,
+    User,
+)
+
+
+def _user(db_session):
+    user = User(
+        username="bulk", email="bulk@example.com", password_hash="x"
+    )
+    db_session.add(user)
+    db_session.commit()
+    return user.id
+
+
+@pytest.fixture
+def statements(db_session):
+    """SQL statements sent to the test database"""
+    sent = []
+
+    def record(conn, cursor, statement, *args):
+        sent.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    yield sent
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def test_bulk_create_reports_each_task(client, db_session):
+    user_id = _user(db_session)
+    tasks = [{"title": f"task {i}", "user_id": user_id} for i in range(50)]
+    tasks.insert(3, {"title": "orphan", "user_id": user_id + 1})
+
+    response = client.post("/api/v1/tasks/bulk", json={"tasks": tasks})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["failed"]) == (50, 1)
+    assert body["results"][3] == {
+        "index": 3,
+        "status": "error",
+        "task": None,
+        "detail": "User not found",
+    }
+    created = [r["task"] for r in body["results"] if r["status"] == "created"]
+    assert [task["title"] for task in created] == [
+        f"task {i}" for i in range(50)
+    ]
+    assert all(task["status"] == "pending" for task in created)
+    assert len({task["id"] for task in created}) == 50
+    assert db_session.query(Task).count() == 50
+
+
+def test_bulk_create_is_bounded(client):
+    assert client.post("/api/v1/tasks/bulk", json={"tasks": []}).status_code
+    too_many = [{"title": "t", "user_id": 1}] * 1001
+
+    response = client.post("/api/v1/tasks/bulk", json={"tasks": too_many})
+
+    assert response.status_code == 422
+
+
+def test_status_update_reports_each_id(client, db_session, statements):
+    user_id = _user(db_session)
+    tasks = [{"title": f"task {i}", "user_id": user_id} for i in range(3)]
+    results = client.post("/api/v1/tasks/bulk", json={"tasks": tasks}).json()
+    ids = [result["task"]["id"] for result in results["results"]]
+    statements.clear()
+
+    response = client.patch(
+        "/api/v1/tasks/status",
+        json={"ids": ids[:2] + [999, ids[0]], "status": "completed"},
+    )
+
+    body = response.json()
+    assert (body["updated"], body["not_found"]) == (2, 1)
+    assert body["results"] == [
+        {"id": ids[0], "result": "updated"},
+        {"id": ids[1], "result": "updated"},
+        {"id": 999, "result": "not_found"},
+    ]
+    updates = [s for s in statements if s.lstrip().startswith("UPDATE")]
+    assert len(updates) == 1
+    statuses = {
+        task.id: (task.status, task.updated_at)
+        for task in db_session.query(Task)
+    }
+    assert statuses[ids[0]][0] == statuses[ids[1]][0] == "completed"
+    # updated_at moves, so the task ETags change
+    assert statuses[ids[0]][1] is not None
+    assert statuses[ids[2]] == ("pending", None)
@@ -0,0 +1,138 @@
+"""
+Test compressed and claim-checked SQS message payloads.
+"""
+
+import hashlib
+
+import boto3
+import pytest
+from moto import (
+    mock_s3,
+)
+
+from services.claim_check import (
+    SQS_MAX_MESSAGE_BYTES,
+    ClaimCheckCodec,
+    ClaimCheckError,
+    LocalBlobStore,
+    S3BlobStore,
+)
+
+# Hashes barely compress, so this stays far over the SQS limit
+LARGE = {
+    "items": [
+        {"id": n, "digest": hashlib.sha256(str(n).encode()).hexdigest()}
+        for n in range(10_000)
+    ]
+}
+
+
+@pytest.fixture
+def codec(tmp_path):
+    return ClaimCheckCodec(store=LocalBlobStore(str(tmp_path)))
+
+
+def test_small_payloads_are_plain_json(codec):
+    body, attributes = codec.encode({"type": "ping"})
+
+    assert body == '{"type": "ping"}'
+    assert attributes == {}
+    assert codec.decode(body).get() == {"type": "ping"}
+
+
+def test_medium_payloads_are_compressed_inline(codec):
+    payload = {"items": ["same reading"] * 5000}
+    body, attributes = codec.encode(payload)
+
+    assert attributes == {"content_encoding": "gzip"}
+    assert len(body) < len(str(payload)) / 10
+    assert codec.decode(body, attributes).get() == payload
+
+
+def test_large_payloads_are_claim_checked_and_fetched_lazily(codec):
+    body, attributes = codec.encode(LARGE)
+
+    assert attributes == {"content_encoding": "claim-check"}
+    assert len(body) < 1024
+    payload = codec.decode(
+        body, {"content_encoding": {"StringValue": "claim-check"}}
+    )
+    assert payload.claim_check["store"] == "local"
+    assert not payload._loaded
+    assert payload.get() == LARGE
+
+
+def test_oversized_payload_without_store_fails_loudly():
+    with pytest.raises(ClaimCheckError):
+        ClaimCheckCodec(offload_threshold=1024).encode(LARGE)
+
+
+def test_s3_blob_store_round_trip(monkeypatch):
+    for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"):
+        monkeypatch.setenv(name, "testing")
+    with mock_s3():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="claims")
+        codec = ClaimCheckCodec(store=S3BlobStore("claims", client=client))
+
+        body, attributes = codec.encode(LARGE)
+        payload = codec.decode(body, attributes)
+
+        assert payload.claim_check["key"].startswith("claim-checks/")
+        assert payload.get() == LARGE
+
+
+def test_s3_pointers_outside_the_bucket_or_prefix_are_refused():
+    client = boto3.client("s3", region_name="us-east-1")
+    codec = ClaimCheckCodec(store=S3BlobStore("claims", client=client))
+
+    for pointer in (
+        {"store": "s3", "bucket": "payroll", "key": "claim-checks/a"},
+        {"store": "s3", "bucket": "claims", "key": "exports/users.csv"},
+        {"store": "local", "path": "/etc/passwd"},
+    ):
+        with pytest.raises(ClaimCheckError, match="outside"):
+            codec.fetch(pointer)
+
+
+def test_local_pointers_outside_the_directory_are_refused(codec, tmp_path):
+    outside = tmp_path.parent / "secret.txt"
+    outside.write_bytes(b"secret")
+
+    for path in (
+        str(outside),
+        str(tmp_path / ".." / "secret.txt"),
+        str(tmp_path),
+    ):
+        with pytest.raises(ClaimCheckError, match="outside"):
+            codec.fetch({"store": "local", "path": path})
+
+
+def test_claim_check_without_a_store_is_refused(codec):
+    body, attributes = codec.encode(LARGE)
+
+    with pytest.raises(ClaimCheckError, match="no claim-check store"):
+        ClaimCheckCodec().decode(body, attributes).get()
+
+
+def test_wrap_only_offloads_oversized_task_arguments(codec):
+    assert codec.wrap({"items": [1, 2]}) == {"items": [1, 2]}
+
+    wrapped = codec.wrap(LARGE)
+    assert list(wrapped) == ["claim_check"]
+    assert codec.unwrap(wrapped) == LARGE
+    assert codec.unwrap({"items": [1]}) == {"items": [1]}
+
+
+def test_sqs_service_round_trips_large_messages(sqs_service, codec):
+    sqs_service.codec = codec
+
+    sqs_service.send_message("task_processing", dict(LARGE))
+    sent = sqs_service.sqs.sent[0]
+    assert len(sent["Body"].encode()) < SQS_MAX_MESSAGE_BYTES
+    attributes = sent["MessageAttributes"]
+    assert attributes["content_encoding"]["StringValue"] == "claim-check"
+
+    message = sqs_service.receive_messages("task_processing", lazy=True)[0]
+    assert message["body"].claim_check is not None
+    assert message["body"].get()["items"] == LARGE["items"]
@@ -0,0 +1,90 @@
+"""
+Test chunked deletes of expired data points.
+"""
+
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+
+import pytest
+
+from models.models import (
+    DataPoint,
+    Task,
+    User,
+)
+from services.cleanup_engine import (
+    CleanupEngine,
+    partition_upper_bound,
+)
+
+NOW = datetime(2026, 10, 1, tzinfo=timezone.utc)
+CUTOFF = NOW - timedelta(days=30)
+
+
+@pytest.fixture
+def points(db_session):
+    """Ten expired points and five recent ones"""
+    user = User(username="cleaner", email="c@example.com", password_hash="x")
+    task = Task(user=user, title="metrics")
+    db_session.add(task)
+    db_session.flush()
+    ages = [40 + day for day in range(10)] + [day for day in range(5)]
+    db_session.add_all(
+        DataPoint(
+            task_id=task.id,
+            data_type="error_count" if age % 2 else "log_entry",
+            value_json={"count": age},
+            timestamp=NOW - timedelta(days=age),
+        )
+        for age in ages
+    )
+    db_session.commit()
+    return task
+
+
+def _remaining(db_session):
+    return db_session.query(DataPoint).count()
+
+
+def test_deletes_expired_rows_in_chunks(db_session, points):
+    report = CleanupEngine.delete_before(
+        db_session, CUTOFF, chunk_size=3, throttle_seconds=0
+    )
+
+    assert report.rows_deleted == 10
+    assert report.chunks == 4
+    assert report.completed
+    assert report.rows_per_second > 0
+    assert _remaining(db_session) == 5
+
+
+def test_interrupted_run_resumes_with_same_cutoff(db_session, points):
+    first = CleanupEngine.delete_before(
+        db_session, CUTOFF, chunk_size=3, throttle_seconds=0, max_chunks=2
+    )
+    assert first.rows_deleted == 6 and not first.completed
+
+    second = CleanupEngine.delete_before(
+        db_session, CUTOFF, chunk_size=3, throttle_seconds=0
+    )
+    assert second.rows_deleted == 4 and second.completed
+    assert _remaining(db_session) == 5
+
+
+def test_filters_by_data_type(db_session, points):
+    report = CleanupEngine.delete_before(
+        db_session, CUTOFF, chunk_size=100, data_type="error_count"
+    )
+    assert report.rows_deleted == 5
+    assert report.chunks == 1
+
+
+def test_partition_upper_bound_parsing():
+    bound = "FOR VALUES FROM ('2026-08-01') TO ('2026-09-01 00:00:00+00')"
+    assert partition_upper_bound(bound) == datetime(
+        2026, 9, 1, tzinfo=timezone.utc
+    )
+    assert partition_upper_bound("DEFAULT") is None
@@ -0,0 +1,65 @@
+"""
+Test Lambda cold-start behaviour of the API entry point.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import (
+    Path,
+)
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+# Generous default so slow CI runners don't flake; tighten locally with
+# COLD_START_BUDGET_SECONDS=0.8
+COLD_START_BUDGET_SECONDS = float(
+    os.getenv("COLD_START_BUDGET_SECONDS", "3.0")
+)
+
+
+def _run_in_fresh_interpreter(code: str) -> str:
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return completed.stdout.strip()
+
+
+def test_main_cold_import_within_budget():
+    """Importing main in a fresh interpreter stays under the budget."""
+    elapsed = float(
+        _run_in_fresh_interpreter(
+            "import time\n"
+            "start = time.perf_counter()\n"
+            "import main\n"
+            "print(time.perf_counter() - start)\n"
+        )
+    )
+    assert elapsed < COLD_START_BUDGET_SECONDS
+
+
+def test_main_import_defers_heavy_clients():
+    """boto3, the DB driver and Mangum load only when first needed."""
+    loaded = _run_in_fresh_interpreter(
+        "import sys\n"
+        "import main\n"
+        "import db.database as database\n"
+        "heavy = ['boto3', 'psycopg2', 'mangum']\n"
+        "print(database._engine is None)\n"
+        "print(','.join(m for m in heavy if m in sys.modules))\n"
+    )
+    assert loaded == "True"
+
+
+def test_service_singletons_are_lazy():
+    """Importing the AWS service modules does not build boto3 clients."""
+    output = _run_in_fresh_interpreter(
+        "import services.aws.ses.service as ses\n"
+        "import services.aws.sqs.service as sqs\n"
+        "print(ses._ses_service is None and sqs._sqs_service is None)\n"
+    )
+    assert output == "True"
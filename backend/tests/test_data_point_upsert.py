@@ -0,0 +1,131 @@
+"""
+Test idempotent DataPoint ingestion through dedup keys and upserts.
+"""
+
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+
+import pytest
+
+from models.models import (
+    DataPoint,
+    Task,
+    User,
+)
+from services.data_point_service import (
+    DataPointService,
+)
+
+READ_AT = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def task_id(db_session):
+    user = User(username="poller", email="poller@example.com",
+                password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    task = Task(user_id=user.id, title="Weather polling")
+    db_session.add(task)
+    db_session.commit()
+    return task.id
+
+
+def _reading(task_id, minute, temperature=20, **extra):
+    return {
+        "task_id": task_id,
+        "data_type": "weather",
+        "value_json": {"temperature": temperature},
+        "timestamp": (READ_AT + timedelta(minutes=minute)).isoformat(),
+        **extra,
+    }
+
+
+def test_dedup_key_is_stable_across_time_zones():
+    reading = {"task_id": 1, "data_type": "weather", "timestamp": READ_AT}
+    shifted = READ_AT.astimezone(timezone(timedelta(hours=2)))
+
+    key = DataPointService.dedup_key(reading)
+
+    assert key == DataPointService.dedup_key({**reading, "timestamp": shifted})
+    assert key != DataPointService.dedup_key({**reading, "data_type": "x"})
+    assert DataPointService.dedup_key({**reading, "dedup_key": "c1"}) == "c1"
+    assert DataPointService.dedup_key({"task_id": 1, "data_type": "x"}) is None
+
+
+def test_replayed_batch_writes_only_new_readings(client, db_session, task_id):
+    batch = [_reading(task_id, minute) for minute in range(3)]
+    first = client.post(
+        "/api/v1/data-points/bulk", json={"data_points": batch}
+    )
+    assert first.json()["written"] == 3
+
+    replay = batch + [_reading(task_id, 3), _reading(task_id, 3)]
+    response = client.post(
+        "/api/v1/data-points/bulk", json={"data_points": replay}
+    )
+
+    assert response.json() == {
+        "received": 5,
+        "written": 1,
+        "duplicates": 4,
+        "failed": 0,
+        "missing_task": [],
+    }
+    assert db_session.query(DataPoint).count() == 4
+
+
+def test_update_overwrites_and_changes_the_etag(client, db_session, task_id):
+    client.post(
+        "/api/v1/data-points/bulk",
+        json={"data_points": [_reading(task_id, 0, temperature=20)]},
+    )
+    etag = client.get("/api/v1/data-points").headers["etag"]
+
+    response = client.post(
+        "/api/v1/data-points/bulk",
+        json={
+            "data_points": [_reading(task_id, 0, temperature=21)],
+            "on_conflict": "update",
+        },
+    )
+
+    assert response.json()["written"] == 1
+    stored = db_session.query(DataPoint).one()
+    db_session.refresh(stored)
+    assert stored.value_json == {"temperature": 21}
+    assert stored.updated_at is not None
+    current = client.get(
+        "/api/v1/data-points", headers={"If-None-Match": etag}
+    )
+    assert current.status_code == 200
+    assert current.headers["etag"] != etag
+
+
+def test_unknown_tasks_are_reported_by_index(client, task_id):
+    batch = [_reading(task_id, 0), _reading(task_id + 1, 0)]
+
+    body = client.post(
+        "/api/v1/data-points/bulk", json={"data_points": batch}
+    ).json()
+
+    assert (body["written"], body["failed"]) == (1, 1)
+    assert body["missing_task"] == [1]
+
+
+def test_single_create_is_idempotent_with_a_key(client, db_session, task_id):
+    reading = _reading(task_id, 0, dedup_key="sensor-7:0001")
+
+    first = client.post("/api/v1/data-points", json=reading).json()
+    second = client.post("/api/v1/data-points", json=reading).json()
+
+    assert first["id"] == second["id"]
+    assert first["dedup_key"] == "sensor-7:0001"
+    # Without a key or timestamp nothing is deduplicated
+    plain = {"task_id": task_id, "data_type": "weather"}
+    client.post("/api/v1/data-points", json=plain)
+    client.post("/api/v1/data-points", json=plain)
+    assert db_session.query(DataPoint).count() == 3
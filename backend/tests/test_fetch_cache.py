@@ -0,0 +1,116 @@
+"""
+Test the upstream fetch cache used by pollers.
+"""
+
+from contextlib import (
+    contextmanager,
+)
+
+import httpx
+import pytest
+from sqlalchemy.orm import (
+    sessionmaker,
+)
+
+import services.fetch_cache_service as fetch_cache_service
+from services.fetch_cache_service import (
+    FetchCacheService,
+    fetch_if_changed,
+)
+
+URL = "https://api.example.com/weather?q=London"
+
+
+def _response(status_code=200, content=b'{"temp": 12}', headers=None):
+    return httpx.Response(
+        status_code,
+        content=content,
+        headers=headers,
+        request=httpx.Request("GET", URL),
+    )
+
+
+@pytest.fixture
+def upstream(db_session, monkeypatch):
+    """Serve one canned response and commit sessions like the app does"""
+    factory = sessionmaker(bind=db_session.get_bind())
+
+    @contextmanager
+    def session():
+        db = factory()
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    monkeypatch.setattr(fetch_cache_service, "get_db_session", session)
+    monkeypatch.setattr(
+        fetch_cache_service.httpx,
+        "get",
+        lambda url, timeout, headers: _response(headers={"ETag": '"v1"'}),
+    )
+
+
+def test_first_fetch_is_changed_and_stores_validators(db_session):
+    response = _response(
+        headers={
+            "ETag": '"v1"',
+            "Last-Modified": "Mon, 19 Oct 2026 08:00:00 GMT",
+        }
+    )
+    assert FetchCacheService.record_response(db_session, URL, response)
+
+    headers = FetchCacheService.conditional_headers(db_session, URL)
+    assert headers == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 19 Oct 2026 08:00:00 GMT",
+    }
+
+
+def test_not_modified_is_unchanged(db_session):
+    FetchCacheService.record_response(
+        db_session, URL, _response(headers={"ETag": '"v1"'})
+    )
+    changed = FetchCacheService.record_response(
+        db_session, URL, _response(status_code=304, content=b"")
+    )
+
+    state = FetchCacheService.get_state(db_session, URL)
+    assert not changed
+    assert state.etag == '"v1"'
+    assert state.fetch_count == 2
+    assert state.unchanged_count == 1
+
+
+def test_same_body_without_validators_is_unchanged(db_session):
+    FetchCacheService.record_response(db_session, URL, _response())
+    assert not FetchCacheService.record_response(db_session, URL, _response())
+    assert FetchCacheService.record_response(
+        db_session, URL, _response(content=b'{"temp": 13}')
+    )
+
+
+def test_unknown_url_has_no_conditional_headers(db_session):
+    assert FetchCacheService.conditional_headers(db_session, URL) == {}
+
+
+def test_validators_commit_only_after_the_payload_is_handled(
+    upstream, db_session
+):
+    def store(db, response):
+        raise ConnectionError("database write failed")
+
+    with pytest.raises(ConnectionError):
+        fetch_if_changed(URL, store)
+    assert FetchCacheService.get_state(db_session, URL) is None
+
+    changed, stored = fetch_if_changed(URL, lambda db, r: r.json())
+    assert changed and stored == {"temp": 12}
+    assert FetchCacheService.conditional_headers(db_session, URL) == {
+        "If-None-Match": '"v1"'
+    }
+    assert fetch_if_changed(URL, lambda db, r: r.json()) == (False, None)
@@ -0,0 +1,157 @@
+"""
+Test response compression and conditional GET support.
+"""
+
+import gzip
+
+from core.middleware.compression import (
+    negotiate_encoding,
+)
+from models.models import (
+    DataPoint,
+    Task,
+    User,
+)
+
+
+def _seed(db_session, data_points=50):
+    user = User(username="poller", email="poller@example.com",
+                password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    task = Task(user_id=user.id, title="Weather polling")
+    db_session.add(task)
+    db_session.flush()
+    for i in range(data_points):
+        db_session.add(
+            DataPoint(
+                task_id=task.id,
+                data_type="weather",
+                value_json={"temperature": 20 + i, "city": "London"},
+            )
+        )
+    db_session.commit()
+    return task
+
+
+class TestCompression:
+    """Test the compression middleware."""
+
+    def test_negotiate_encoding(self):
+        assert negotiate_encoding("gzip, deflate") == "gzip"
+        assert negotiate_encoding("gzip;q=0") is None
+        assert negotiate_encoding("identity") is None
+        assert negotiate_encoding("") is None
+
+    def test_large_list_is_gzipped(self, client, db_session):
+        _seed(db_session)
+        response = client.get(
+            "/api/v1/data-points", headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        # httpx decodes transparently
+        assert len(response.json()) == 50
+
+    def test_small_response_is_not_compressed(self, client):
+        response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+
+    def test_identity_client_gets_plain_body(self, client, db_session):
+        _seed(db_session)
+        response = client.get(
+            "/api/v1/data-points", headers={"Accept-Encoding": "identity"}
+        )
+        assert "content-encoding" not in response.headers
+        assert len(response.json()) == 50
+
+    def test_gzip_body_is_valid(self, client, db_session):
+        _seed(db_session)
+        with client.stream(
+            "GET", "/api/v1/data-points", headers={"Accept-Encoding": "gzip"}
+        ) as response:
+            raw = b"".join(response.iter_raw())
+        assert gzip.decompress(raw).startswith(b"[")
+
+
+class TestConditionalGet:
+    """Test ETag / If-None-Match handling."""
+
+    def test_collection_returns_304_when_unchanged(self, client, db_session):
+        _seed(db_session, data_points=3)
+        first = client.get("/api/v1/data-points")
+        etag = first.headers["etag"]
+        assert etag.startswith('"')
+
+        second = client.get(
+            "/api/v1/data-points", headers={"If-None-Match": etag}
+        )
+        assert second.status_code == 304
+        assert second.headers["etag"] == etag
+        assert second.content == b""
+
+    def test_collection_etag_changes_on_insert(self, client, db_session):
+        task = _seed(db_session, data_points=3)
+        etag = client.get("/api/v1/data-points").headers["etag"]
+
+        db_session.add(DataPoint(task_id=task.id, data_type="weather"))
+        db_session.commit()
+
+        response = client.get(
+            "/api/v1/data-points", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert len(response.json()) == 4
+
+    def test_etag_depends_on_filters(self, client, db_session):
+        task = _seed(db_session, data_points=3)
+        all_points = client.get("/api/v1/data-points").headers["etag"]
+        filtered = client.get(
+            f"/api/v1/data-points?task_id={task.id}&limit=2"
+        ).headers["etag"]
+        assert all_points != filtered
+
+    def test_item_route_supports_if_none_match(self, client, db_session):
+        task = _seed(db_session, data_points=0)
+        first = client.get(f"/api/v1/tasks/{task.id}")
+        etag = first.headers["etag"]
+
+        second = client.get(
+            f"/api/v1/tasks/{task.id}",
+            headers={"If-None-Match": f'"other", W/{etag}'},
+        )
+        assert second.status_code == 304
+
+    def test_compressed_response_gets_weak_etag(self, client, db_session):
+        _seed(db_session)
+        plain = client.get(
+            "/api/v1/data-points", headers={"Accept-Encoding": "identity"}
+        )
+        compressed = client.get(
+            "/api/v1/data-points", headers={"Accept-Encoding": "gzip"}
+        )
+        etag = plain.headers["etag"]
+
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert compressed.headers["etag"] == f"W/{etag}"
+        # Weak comparison still revalidates either representation
+        revalidated = client.get(
+            "/api/v1/data-points",
+            headers={
+                "Accept-Encoding": "gzip",
+                "If-None-Match": compressed.headers["etag"],
+            },
+        )
+        assert revalidated.status_code == 304
+
+    def test_analytics_uses_content_etag(self, client, db_session):
+        _seed(db_session, data_points=2)
+        first = client.get("/api/v1/analytics/user-stats")
+        etag = first.headers["etag"]
+        second = client.get(
+            "/api/v1/analytics/user-stats", headers={"If-None-Match": etag}
+        )
+        assert second.status_code == 304
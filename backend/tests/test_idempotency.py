@@ -0,0 +1,231 @@
+"""
+Test duplicate message detection for SQS/Celery workers.
+"""
+
+from datetime import (
+    timedelta,
+)
+from types import (
+    SimpleNamespace,
+)
+
+import pytest
+from sqlalchemy.orm import (
+    sessionmaker,
+)
+
+import services.idempotency as idempotency
+from models.models import (
+    ProcessedMessage,
+)
+from services.idempotency import (
+    CLAIMED,
+    COMPLETED,
+    IN_PROGRESS,
+    DatabaseIdempotencyStore,
+    MemoryIdempotencyStore,
+    idempotent,
+    message_key,
+)
+
+
+@pytest.fixture
+def store(db_session):
+    return DatabaseIdempotencyStore(
+        session_factory=sessionmaker(bind=db_session.get_bind())
+    )
+
+
+class Retry(Exception):
+    pass
+
+
+def _task(task_id="celery-1", redelivered=False):
+    def retry(countdown=None):
+        return Retry(countdown)
+
+    return SimpleNamespace(
+        request=SimpleNamespace(
+            id=task_id, delivery_info={"redelivered": redelivered}
+        ),
+        retry=retry,
+    )
+
+
+def test_memory_store_skips_duplicates_until_released():
+    store = MemoryIdempotencyStore()
+
+    assert store.claim("a", 60, "t1") == CLAIMED
+    assert store.claim("a", 60, "t2") == IN_PROGRESS
+    # Only the owner can release its claim
+    store.release("a", "t2")
+    assert store.claim("a", 60, "t2") == IN_PROGRESS
+    store.release("a", "t1")
+    assert store.claim("a", 60, "t2") == CLAIMED
+    store.complete("a", 60, "t2")
+    # Completed entries are never released
+    store.release("a", "t2")
+    assert store.claim("a", 60, "t3") == COMPLETED
+    assert store.stats()["hit_rate"] == round(3 / 5, 4)
+
+
+def test_memory_store_is_bounded():
+    store = MemoryIdempotencyStore(max_entries=2)
+    for key in ("a", "b", "c"):
+        store.claim(key, 60)
+
+    assert store.claim("a", 60) == CLAIMED
+
+
+def test_memory_store_redelivery_takes_over_in_progress_claim():
+    store = MemoryIdempotencyStore()
+    store.claim("a", 600, "t1")
+
+    assert store.claim("a", 600, "t1", takeover=True) == CLAIMED
+    store.complete("a", 60, "t1")
+    assert store.claim("a", 600, "t1", takeover=True) == COMPLETED
+
+
+def test_database_store_counts_duplicate_hits(store, db_session):
+    assert store.claim("email:msg-1", 60, "t1") == CLAIMED
+    store.complete("email:msg-1", 3600, "t1")
+    assert store.claim("email:msg-1", 60, "t2") == COMPLETED
+    assert store.claim("email:msg-1", 60, "t3") == COMPLETED
+    assert store.claim("email:msg-2", 60, "t4") == CLAIMED
+
+    record = db_session.get(ProcessedMessage, "email:msg-1")
+    assert record.status == "completed"
+    assert record.hit_count == 2
+    assert store.stats() == {
+        "backend": "database",
+        "claims": 2,
+        "duplicates": 2,
+        "hit_rate": 0.5,
+    }
+
+
+def test_database_store_release_allows_retry(store):
+    assert store.claim("enrich:msg-1", 60, "t1") == CLAIMED
+    store.release("enrich:msg-1", "t2")
+    assert store.claim("enrich:msg-1", 60, "t2") == IN_PROGRESS
+    store.release("enrich:msg-1", "t1")
+
+    assert store.claim("enrich:msg-1", 60, "t2") == CLAIMED
+
+
+def test_database_store_takes_over_expired_claim(store, db_session):
+    assert store.claim("enrich:stuck", 60, "t1") == CLAIMED
+    record = db_session.get(ProcessedMessage, "enrich:stuck")
+    record.expires_at = record.expires_at - timedelta(minutes=5)
+    db_session.commit()
+
+    assert store.claim("enrich:stuck", 60, "t2") == CLAIMED
+    assert store.purge_expired() == 0
+
+
+def test_database_store_redelivery_takes_over_live_claim(store, db_session):
+    assert store.claim("enrich:crashed", 600, "t1") == CLAIMED
+
+    assert store.claim("enrich:crashed", 600, "t1", takeover=True) == CLAIMED
+    record = db_session.get(ProcessedMessage, "enrich:crashed")
+    db_session.refresh(record)
+    assert record.owner == "t1"
+    assert record.hit_count == 0
+
+
+def test_message_key_prefers_payload_ids():
+    assert message_key(_task(), {"correlation_id": "c", "id": "i"}) == "c"
+    assert message_key(_task(), '{"message_id": "m"}') == "m"
+    assert message_key(_task("celery-9"), "not json") == "celery-9"
+
+
+def test_message_key_ignores_record_ids():
+    # enrich_data payloads carry the record's own id
+    assert message_key(_task("celery-3"), {"id": 42}) == "celery-3"
+
+
+def test_decorator_skips_redelivered_message(monkeypatch):
+    monkeypatch.setattr(idempotency, "_store", MemoryIdempotencyStore())
+    calls = []
+
+    @idempotent()
+    def handle(task, payload):
+        calls.append(payload)
+        return {"status": "success"}
+
+    payload = {"correlation_id": "order-7"}
+    assert handle(_task(), payload) == {"status": "success"}
+    assert handle(_task("celery-2"), payload) == {
+        "status": "duplicate",
+        "idempotency_key": "handle:order-7",
+    }
+    assert len(calls) == 1
+
+
+def test_decorator_releases_claim_on_failure(monkeypatch):
+    monkeypatch.setattr(idempotency, "_store", MemoryIdempotencyStore())
+    attempts = []
+
+    @idempotent(name="flaky")
+    def handle(task, payload):
+        attempts.append(payload)
+        if len(attempts) == 1:
+            raise ConnectionError("SES unavailable")
+        return {"status": "success"}
+
+    with pytest.raises(ConnectionError):
+        handle(_task(), {"id": 1})
+    assert handle(_task(), {"id": 1}) == {"status": "success"}
+
+
+def test_decorator_retries_duplicate_of_in_flight_message(monkeypatch):
+    store = MemoryIdempotencyStore()
+    monkeypatch.setattr(idempotency, "_store", store)
+    monkeypatch.setattr(
+        idempotency.settings, "IDEMPOTENCY_LEASE_SECONDS", 600
+    )
+    calls = []
+
+    @idempotent()
+    def handle(task, payload):
+        calls.append(task.request.id)
+        return {"status": "success"}
+
+    payload = {"correlation_id": "order-9"}
+    # The first worker claimed the message and was killed mid-task
+    store.claim("handle:order-9", 600, "celery-1")
+
+    with pytest.raises(Retry) as retry:
+        handle(_task("celery-2"), payload)
+    assert retry.value.args == (600,)
+
+    # The broker redelivers the dead worker's message
+    redelivered = _task("celery-1", redelivered=True)
+    assert handle(redelivered, payload) == {"status": "success"}
+    assert calls == ["celery-1"]
+
+
+def test_decorator_fails_open_when_store_is_down(monkeypatch):
+    class BrokenStore(MemoryIdempotencyStore):
+        def claim(self, key, lease_seconds):
+            raise ConnectionError("database unavailable")
+
+    monkeypatch.setattr(idempotency, "_store", BrokenStore())
+
+    @idempotent()
+    def handle(task, payload):
+        return {"status": "success"}
+
+    assert handle(_task(), {"id": 1}) == {"status": "success"}
+
+
+def test_metrics_endpoint_reports_hit_rate(client, monkeypatch):
+    store = MemoryIdempotencyStore()
+    store.claim("a", 60)
+    store.claim("a", 60)
+    monkeypatch.setattr(idempotency, "_store", store)
+
+    response = client.get("/api/v1/metrics/idempotency")
+
+    assert response.status_code == 200
+    assert response.json()["hit_rate"] == 0.5
@@ -0,0 +1,222 @@
+"""
+Test the worker-side poll scheduler: jitter, backoff and skip-if-running.
+"""
+
+import random
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+
+import pytest
+from sqlalchemy.orm import (
+    sessionmaker,
+)
+
+import api.endpoints.polling as polling
+from models.models import (
+    PollingSource,
+)
+from workers.celery_app import (
+    app as celery_app,
+)
+from workers.scheduler import (
+    PollScheduler,
+    next_delay,
+)
+from workers.tasks import data_processing
+
+
+class FixedRandom(random.Random):
+    """uniform() always returns its upper bound"""
+
+    def uniform(self, a, b):
+        return b
+
+
+@pytest.fixture
+def scheduler(db_session):
+    return PollScheduler(
+        sessionmaker(bind=db_session.get_bind()), rng=FixedRandom()
+    )
+
+
+def _make_due(scheduler, source_id, running_since=None):
+    db = scheduler.session_factory()
+    source = db.get(PollingSource, source_id)
+    source.next_run_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    source.running_since = running_since
+    db.commit()
+    db.close()
+
+
+def test_next_delay_jitters_within_bounds():
+    rng = random.Random(7)
+    delays = [next_delay(100, jitter=0.1, rng=rng) for _ in range(200)]
+
+    assert all(90 <= delay <= 110 for delay in delays)
+    assert len(set(delays)) > 100
+
+
+def test_next_delay_backs_off_up_to_the_cap():
+    delays = [
+        next_delay(60, failures, jitter=0, max_backoff_seconds=600)
+        for failures in range(6)
+    ]
+
+    assert delays == [60, 120, 240, 480, 600, 600]
+    # An interval above the cap is never shortened by backing off
+    assert next_delay(900, 3, jitter=0, max_backoff_seconds=600) == 900
+
+
+def test_claim_skips_sources_that_are_still_running(scheduler):
+    first = scheduler.register("https://a.example/feed", "rss", 60)
+    second = scheduler.register("https://b.example/feed", "rss", 60)
+    assert scheduler.claim_due() == []
+
+    _make_due(scheduler, first)
+    _make_due(scheduler, second)
+    assert sorted(scheduler.claim_due()) == [first, second]
+    # Both are still running, so the next tick claims nothing
+    _make_due(scheduler, first, scheduler.get(first).running_since)
+    assert scheduler.claim_due() == []
+
+
+def test_claim_reclaims_an_expired_lease(scheduler):
+    source_id = scheduler.register("https://a.example/feed", "rss", 60)
+    lost = datetime.now(timezone.utc) - timedelta(hours=1)
+    _make_due(scheduler, source_id, running_since=lost)
+
+    assert scheduler.claim_due() == [source_id]
+
+
+def test_finish_backs_off_and_resets(scheduler, monkeypatch):
+    monkeypatch.setattr(
+        "core.config.settings.POLL_SCHEDULER_JITTER", 0.0, raising=False
+    )
+    source_id = scheduler.register("https://a.example/feed", "rss", 60)
+
+    def delay_after(succeeded):
+        before = datetime.now(timezone.utc)
+        next_run = scheduler.finish(source_id, succeeded, error="boom")
+        return (next_run.replace(tzinfo=timezone.utc) - before).seconds
+
+    assert delay_after(False) in (119, 120)
+    assert delay_after(False) in (239, 240)
+    source = scheduler.get(source_id)
+    assert (source.consecutive_failures, source.last_error) == (2, "boom")
+    assert source.running_since is None
+
+    assert delay_after(True) in (59, 60)
+    assert scheduler.get(source_id).consecutive_failures == 0
+
+
+def test_dispatch_spreads_claimed_polls_over_the_tick(scheduler, monkeypatch):
+    source_id = scheduler.register("https://a.example/feed", "rss", 60)
+    _make_due(scheduler, source_id)
+    monkeypatch.setattr(data_processing, "PollScheduler", lambda: scheduler)
+    queued = []
+    monkeypatch.setattr(
+        data_processing.poll_scheduled_source,
+        "apply_async",
+        lambda args, countdown: queued.append((args, countdown)),
+    )
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+
+    result = data_processing.dispatch_due_polls.delay().get()
+
+    assert result == {"queued": 1}
+    [(args, countdown)] = queued
+    assert args == (source_id,)
+    tick = data_processing.settings.POLL_SCHEDULER_TICK_SECONDS
+    assert 0 <= countdown <= tick
+
+
+def test_failed_poll_books_a_backoff(scheduler, monkeypatch):
+    source_id = scheduler.register("https://a.example/feed", "rss", 60)
+    monkeypatch.setattr(data_processing, "PollScheduler", lambda: scheduler)
+
+    def unreachable(url, handle):
+        raise ConnectionError("unreachable")
+
+    monkeypatch.setattr(data_processing, "fetch_if_changed", unreachable)
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+
+    result = data_processing.poll_scheduled_source.delay(source_id).get()
+
+    assert result["status"] == "failed"
+    assert scheduler.get(source_id).consecutive_failures == 1
+
+
+def test_changed_payload_is_handed_to_enrichment(scheduler, monkeypatch):
+    source_id = scheduler.register("https://a.example/feed", "rss", 60)
+    monkeypatch.setattr(data_processing, "PollScheduler", lambda: scheduler)
+
+    class Response:
+        def json(self):
+            return {"items": [1, 2]}
+
+    def fetch(url, handle):
+        return True, handle(None, Response())
+
+    queued = []
+    monkeypatch.setattr(data_processing, "fetch_if_changed", fetch)
+    monkeypatch.setattr(
+        data_processing.enrich_data,
+        "apply_async",
+        lambda args: queued.append(args[0]),
+    )
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+
+    result = data_processing.poll_scheduled_source.delay(source_id).get()
+
+    assert result["status"] == "changed"
+    [payload] = queued
+    assert payload["data"] == {"items": [1, 2]}
+    assert payload["source"] == "https://a.example/feed"
+    source = scheduler.get(source_id)
+    assert source.running_since is None
+    assert source.consecutive_failures == 0
+
+
+def test_source_disabled_after_claim_is_released(scheduler, monkeypatch):
+    source_id = scheduler.register("https://a.example/feed", "rss", 60)
+    _make_due(scheduler, source_id)
+    assert scheduler.claim_due() == [source_id]
+    next_run_at = scheduler.get(source_id).next_run_at
+    scheduler.register("https://a.example/feed", "rss", 60, enabled=False)
+    monkeypatch.setattr(data_processing, "PollScheduler", lambda: scheduler)
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+
+    result = data_processing.poll_scheduled_source.delay(source_id).get()
+
+    assert result["status"] == "skipped"
+    source = scheduler.get(source_id)
+    assert source.running_since is None
+    assert source.next_run_at == next_run_at
+
+
+def test_sources_are_registered_through_the_api(
+    client, scheduler, monkeypatch
+):
+    monkeypatch.setattr(polling, "_scheduler", lambda: scheduler)
+    source = {
+        "url": "https://a.example/feed",
+        "data_type": "rss",
+        "interval_seconds": 300,
+    }
+
+    created = client.put("/api/v1/polling-sources", json=source).json()
+    updated = client.put(
+        "/api/v1/polling-sources",
+        json={**source, "interval_seconds": 60, "enabled": False},
+    ).json()
+
+    assert created["id"] == updated["id"]
+    assert (updated["interval_seconds"], updated["enabled"]) == (60, False)
+    listed = client.get("/api/v1/polling-sources").json()
+    assert [row["url"] for row in listed] == [source["url"]]
+    invalid = {**source, "interval_seconds": 0}
+    response = client.put("/api/v1/polling-sources", json=invalid)
+    assert response.status_code == 422
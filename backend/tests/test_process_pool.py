@@ -0,0 +1,98 @@
+"""
+Test the API's process pool: timing, backpressure and the 503 it causes.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from api.endpoints import enrichment
+from services.process_pool import (
+    PoolSaturatedError,
+    ProcessPoolService,
+)
+
+
+@pytest.fixture
+def pool():
+    pool = ProcessPoolService(max_workers=1, max_pending=1)
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+def test_run_times_the_job_in_a_worker_process(pool):
+    job = asyncio.run(pool.run(divmod, 7, 2))
+
+    assert job.result == (3, 1)
+    assert job.run_seconds >= 0
+    stats = pool.stats()
+    assert (stats["jobs"], stats["in_flight"]) == (1, 0)
+
+
+def test_full_pool_rejects_with_a_retry_estimate(pool):
+    async def flood():
+        jobs = [
+            asyncio.ensure_future(pool.run(time.sleep, 0.5))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        with pytest.raises(PoolSaturatedError) as rejected:
+            await pool.run(time.sleep, 0)
+        await asyncio.gather(*jobs)
+        return rejected.value
+
+    rejected = asyncio.run(flood())
+
+    assert rejected.retry_after >= 1
+    stats = pool.stats()
+    assert (stats["jobs"], stats["rejected"], stats["in_flight"]) == (2, 1, 0)
+
+
+def test_timed_out_job_keeps_its_slot_until_it_ends(pool):
+    async def run_late():
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.run(time.sleep, 0.5, timeout=0.05)
+        in_flight = pool.stats()["in_flight"]
+        await asyncio.sleep(1.0)
+        return in_flight
+
+    assert asyncio.run(run_late()) == 1
+    stats = pool.stats()
+    assert (stats["timed_out"], stats["in_flight"]) == (1, 0)
+
+
+def test_stopped_pool_refuses_jobs():
+    with pytest.raises(RuntimeError):
+        asyncio.run(ProcessPoolService(max_workers=1).run(divmod, 1, 1))
+
+
+def test_enrichment_endpoint_returns_records_and_timing(client):
+    response = client.post(
+        "/api/v1/enrichment",
+        json={"records": [{"id": 1}], "data_type": "analytics"},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    record = body["records"][0]
+    assert record["data_type"] == "analytics"
+    assert record["metadata"]["dashboard_ready"] is True
+    assert set(body["timing"]) == {"queued_seconds", "run_seconds"}
+    assert client.get("/api/v1/metrics/process-pool").json()["jobs"] >= 1
+
+
+def test_saturated_enrichment_returns_503_with_retry_after(
+    client, monkeypatch
+):
+    class Saturated:
+        async def run(self, *args, **kwargs):
+            raise PoolSaturatedError(retry_after=3)
+
+    monkeypatch.setattr(enrichment, "get_process_pool", Saturated)
+
+    response = client.post("/api/v1/enrichment", json={"records": []})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
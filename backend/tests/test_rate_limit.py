@@ -0,0 +1,174 @@
+"""
+Test per-client token-bucket rate limiting and its RateLimit headers.
+"""
+
+import asyncio
+import threading
+
+import httpx
+from starlette.applications import (
+    Starlette,
+)
+from starlette.responses import (
+    PlainTextResponse,
+)
+from starlette.routing import (
+    Route,
+)
+
+from core.middleware.rate_limit import (
+    MemoryRateLimiter,
+    RateLimitMiddleware,
+    client_key,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _app(limiter, capacity=10, rate=1.0, **kwargs):
+    async def ok(request):
+        return PlainTextResponse("ok")
+
+    app = Starlette(
+        routes=[
+            Route("/api/v1/items", ok),
+            Route("/api/v1/analytics/report", ok),
+            Route("/health", ok),
+        ]
+    )
+    return RateLimitMiddleware(
+        app,
+        capacity=capacity,
+        refill_per_second=rate,
+        costs={"/api/v1/analytics": 4},
+        prefix="/api/v1",
+        limiter=limiter,
+        **kwargs,
+    )
+
+
+def _get(app, path, count=1, headers=None):
+    async def send():
+        transport = httpx.ASGITransport(app=app, client=("10.0.0.1", 1234))
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            return [
+                await client.get(path, headers=headers) for _ in range(count)
+            ]
+
+    return asyncio.run(send())
+
+
+def test_bucket_spends_and_refills():
+    clock = FakeClock()
+    limiter = MemoryRateLimiter(clock=clock)
+
+    assert limiter.take("a", 3, capacity=5, rate=1.0) == (True, 2, 0.0)
+    allowed, tokens, retry_after = limiter.take("a", 3, 5, 1.0)
+    assert (allowed, tokens, retry_after) == (False, 2, 1.0)
+
+    clock.now += 10
+    # Refills to capacity, never beyond
+    assert limiter.take("a", 1, 5, 1.0) == (True, 4, 0.0)
+    assert limiter.take("b", 5, 5, 1.0)[0]
+
+
+def test_full_buckets_are_evicted():
+    clock = FakeClock()
+    limiter = MemoryRateLimiter(clock=clock, max_buckets=2)
+    limiter.take("a", 1, 5, 1.0)
+    limiter.take("b", 1, 5, 1.0)
+    clock.now += 5
+
+    limiter.take("c", 1, 5, 1.0)
+
+    assert set(limiter._buckets) == {"c"}
+
+
+def test_headers_and_429_with_retry_after():
+    app = _app(MemoryRateLimiter(clock=FakeClock()), capacity=3)
+
+    responses = _get(app, "/api/v1/items", count=4)
+
+    assert [r.status_code for r in responses] == [200, 200, 200, 429]
+    first = responses[0].headers
+    assert first["RateLimit-Limit"] == "3"
+    assert first["RateLimit-Remaining"] == "2"
+    assert first["RateLimit-Reset"] == "1"
+    assert first["RateLimit-Policy"] == "3;w=3"
+    assert responses[3].headers["Retry-After"] == "1"
+    assert responses[3].headers["RateLimit-Remaining"] == "0"
+
+
+def test_routes_cost_their_weight():
+    app = _app(MemoryRateLimiter(clock=FakeClock()), capacity=10)
+
+    responses = _get(app, "/api/v1/analytics/report", count=3)
+
+    assert [r.status_code for r in responses] == [200, 200, 429]
+    assert responses[1].headers["RateLimit-Remaining"] == "2"
+    # Two tokens short at 1 token/s
+    assert responses[2].headers["Retry-After"] == "2"
+
+
+def test_api_keys_get_their_own_buckets():
+    app = _app(MemoryRateLimiter(clock=FakeClock()), capacity=1)
+
+    assert _get(app, "/api/v1/items", 2)[1].status_code == 429
+    keyed = _get(app, "/api/v1/items", headers={"X-API-Key": "k1"})
+    assert keyed[0].status_code == 200
+    assert _get(app, "/health", 3)[2].status_code == 200
+
+
+def test_client_key_prefers_api_key_then_trusted_forwarding():
+    scope = {
+        "type": "http",
+        "client": ("10.0.0.1", 1234),
+        "headers": [(b"x-forwarded-for", b"203.0.113.9, 10.0.0.1")],
+    }
+
+    assert client_key(scope) == "ip:10.0.0.1"
+    assert client_key(scope, trust_forwarded=True) == "ip:203.0.113.9"
+    scope["headers"].append((b"x-api-key", b"secret"))
+    assert client_key(scope).startswith("key:")
+    assert "secret" not in client_key(scope)
+
+
+def test_limiter_outage_lets_requests_through():
+    class Down:
+        def take(self, *args):
+            raise ConnectionError("redis down")
+
+    assert _get(_app(Down()), "/api/v1/items")[0].status_code == 200
+
+
+def test_blocking_limiters_run_off_the_event_loop():
+    loop_thread = threading.get_ident()
+
+    class Remote(MemoryRateLimiter):
+        blocking = True
+
+        def take(self, *args):
+            self.thread = threading.get_ident()
+            return super().take(*args)
+
+    limiter = Remote()
+    response = _get(_app(limiter), "/api/v1/items")[0]
+
+    assert response.headers["RateLimit-Remaining"] == "9"
+    assert limiter.thread != loop_thread
+
+
+def test_api_sends_rate_limit_headers(client):
+    response = client.get("/api/v1/users")
+
+    assert response.headers["RateLimit-Limit"] == "120"
+    assert "RateLimit-Remaining" in response.headers
+    assert "RateLimit-Limit" not in client.get("/health").headers
@@ -0,0 +1,166 @@
+"""
+Test streaming report generation into S3 multipart uploads.
+"""
+
+import csv
+import io
+import os
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+
+import boto3
+import pytest
+from botocore.config import (
+    Config,
+)
+from moto import (
+    mock_s3,
+)
+
+from models.models import (
+    DataPoint,
+    Task,
+    User,
+)
+from services.aws.s3.exceptions import (
+    MultipartUploadError,
+)
+from services.aws.s3.service import (
+    S3Service,
+)
+from services.report_engine import (
+    ReportEngine,
+)
+
+BUCKET = "wipsie-test-reports"
+PART_SIZE = 64 * 1024
+ROWS = 4000
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    # Let moto accept parts below the 5 MiB S3 minimum
+    monkeypatch.setattr("moto.s3.models.S3_UPLOAD_PART_MIN_SIZE", 1024)
+    for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"):
+        monkeypatch.setenv(name, "testing")
+    with mock_s3():
+        # moto can't decode the aws-chunked checksum bodies newer clients
+        # send by default
+        client = boto3.client(
+            "s3",
+            region_name="us-east-1",
+            config=Config(request_checksum_calculation="when_required"),
+        )
+        client.create_bucket(Bucket=BUCKET)
+        yield S3Service(client=client)
+
+
+@pytest.fixture
+def points(db_session):
+    user = User(username="reporter", email="r@example.com", password_hash="x")
+    task = Task(user=user, title="metrics")
+    db_session.add(task)
+    db_session.flush()
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    db_session.bulk_insert_mappings(
+        DataPoint,
+        [
+            {
+                "task_id": task.id,
+                "data_type": "response_time",
+                "value_json": {"milliseconds": index, "endpoint": "/api"},
+                "meta_data": {"source": "test"},
+                "timestamp": start + timedelta(minutes=index),
+            }
+            for index in range(ROWS)
+        ],
+    )
+    db_session.commit()
+    return task
+
+
+def _body(s3, key):
+    return s3.s3.get_object(Bucket=BUCKET, Key=key)["Body"].read()
+
+
+def test_csv_report_streams_in_parts(db_session, points, s3):
+    report = ReportEngine.generate(
+        db_session,
+        BUCKET,
+        "reports/metrics.csv",
+        s3_service=s3,
+        part_size=PART_SIZE,
+        chunk_size=500,
+        task_id=points.id,
+    )
+
+    body = _body(s3, "reports/metrics.csv").decode()
+    rows = list(csv.reader(io.StringIO(body)))
+    assert report["rows"] == ROWS
+    assert len(rows) == ROWS + 1
+    assert rows[1][2] == "response_time"
+    assert report["parts"] > 1
+    # Only about one part is ever buffered
+    assert report["max_buffered_bytes"] < PART_SIZE * 2
+    assert report["bytes"] > PART_SIZE * 4
+
+
+def test_filters_apply_to_streamed_rows(db_session, points, s3):
+    since = datetime(2026, 1, 1, 1, tzinfo=timezone.utc)
+    until = datetime(2026, 1, 1, 2, tzinfo=timezone.utc)
+
+    report = ReportEngine.generate(
+        db_session,
+        BUCKET,
+        "reports/hour.csv",
+        s3_service=s3,
+        since=since,
+        until=until,
+    )
+
+    assert report["rows"] == 60
+    assert report["parts"] == 1
+
+
+def test_parquet_report_has_row_group_per_chunk(db_session, points, s3):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    report = ReportEngine.generate(
+        db_session,
+        BUCKET,
+        "reports/metrics.parquet",
+        output_format="parquet",
+        s3_service=s3,
+        part_size=PART_SIZE,
+        chunk_size=1000,
+    )
+
+    body = _body(s3, "reports/metrics.parquet")
+    parquet = pq.ParquetFile(io.BytesIO(body))
+    assert report["rows"] == ROWS
+    assert parquet.metadata.num_rows == ROWS
+    assert parquet.metadata.num_row_groups == ROWS // 1000
+
+
+def test_failed_render_aborts_upload(s3):
+    with pytest.raises(RuntimeError):
+        with s3.open_multipart(BUCKET, "reports/broken.csv") as upload:
+            upload.write(b"id,value\n")
+            raise RuntimeError("render failed")
+
+    assert "Contents" not in s3.s3.list_objects_v2(Bucket=BUCKET)
+    assert "Uploads" not in s3.s3.list_multipart_uploads(Bucket=BUCKET)
+
+
+def test_failed_part_raises_upload_error(s3, monkeypatch):
+    upload = s3.open_multipart(BUCKET, "reports/part.csv", part_size=1024)
+
+    def broken_upload_part(**kwargs):
+        raise ConnectionError("reset")
+
+    monkeypatch.setattr(upload.client, "upload_part", broken_upload_part)
+    with pytest.raises(MultipartUploadError):
+        upload.write(os.urandom(2048))
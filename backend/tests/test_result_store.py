@@ -0,0 +1,173 @@
+"""
+Test the batched task result store and the task status endpoint.
+"""
+
+from datetime import (
+    timedelta,
+)
+
+import pytest
+from celery import (
+    Celery,
+    states,
+)
+from sqlalchemy.orm import (
+    sessionmaker,
+)
+
+import services.result_store as result_store
+from models.models import (
+    TaskResult,
+)
+from services.result_store import (
+    DatabaseResultStore,
+    MemoryResultStore,
+    ResultStoreUnavailable,
+    get_result_store,
+)
+
+
+@pytest.fixture
+def store(db_session):
+    return DatabaseResultStore(
+        session_factory=sessionmaker(bind=db_session.get_bind()),
+        flush_seconds=3600,
+        batch_size=100,
+    )
+
+
+@pytest.fixture
+def memory_store(monkeypatch):
+    store = MemoryResultStore()
+    monkeypatch.setattr(result_store, "_store", store)
+    return store
+
+
+def _meta(status, result=None):
+    return {"status": status, "result": result, "date_done": None}
+
+
+def test_state_changes_coalesce_into_one_row_per_flush(store, db_session):
+    store.set("t1", _meta(states.STARTED), 60)
+    store.set("t1", _meta("PROGRESS", {"done": 5}), 60)
+    store.set("t1", _meta(states.SUCCESS, {"rows": 10}), 60)
+    store.set("t2", _meta(states.STARTED), 60)
+
+    # Readable from the buffer before anything is written
+    assert store.get("t1")["result"] == {"rows": 10}
+    assert db_session.query(TaskResult).count() == 0
+
+    assert store.flush() == 2
+    assert db_session.query(TaskResult).count() == 2
+    assert store.get("t1") == _meta(states.SUCCESS, {"rows": 10})
+
+    store.set("t2", _meta(states.SUCCESS, 1), 60)
+    store.flush()
+    assert db_session.get(TaskResult, "t2").status == states.SUCCESS
+
+
+def test_late_progress_does_not_hide_final_state(store):
+    store.set("t1", _meta(states.SUCCESS, 1), 60)
+    store.set("t1", _meta("PROGRESS"), 60)
+
+    assert store.get("t1")["status"] == states.SUCCESS
+
+
+def test_full_buffer_flushes_immediately(db_session):
+    store = DatabaseResultStore(
+        session_factory=sessionmaker(bind=db_session.get_bind()),
+        flush_seconds=3600,
+        batch_size=3,
+    )
+    for index in range(3):
+        store.set(f"t{index}", _meta(states.SUCCESS), 60)
+
+    assert db_session.query(TaskResult).count() == 3
+
+
+def test_failed_flush_keeps_states_for_the_next_one(
+    store, db_session, monkeypatch
+):
+    store.set("t1", _meta(states.SUCCESS, 1), 60)
+    store.set("t2", _meta(states.STARTED), 60)
+    write = store._write
+
+    def down(pending):
+        # New states arrive while the write is failing
+        store.set("t1", _meta("PROGRESS"), 60)
+        store.set("t2", _meta(states.SUCCESS, 2), 60)
+        raise ConnectionError("database down")
+
+    monkeypatch.setattr(store, "_write", down)
+    assert store.flush() == 0
+    monkeypatch.setattr(store, "_write", write)
+
+    assert store.flush() == 2
+    assert db_session.get(TaskResult, "t1").status == states.SUCCESS
+    assert store.get("t2")["result"] == 2
+
+
+def test_unreachable_store_fails_instead_of_using_memory(monkeypatch):
+    monkeypatch.setattr(result_store, "_store", None)
+    monkeypatch.setattr(
+        result_store.settings, "RESULT_STORE_BACKEND", "redis"
+    )
+    monkeypatch.setattr(
+        result_store.settings, "REDIS_URL", "redis://127.0.0.1:1/0"
+    )
+
+    with pytest.raises(ResultStoreUnavailable):
+        get_result_store()
+    assert result_store._store is None
+
+
+def test_expired_results_are_hidden_and_purged(store, db_session):
+    store.set("old", _meta(states.SUCCESS), 60)
+    store.set("new", _meta(states.SUCCESS), 60)
+    store.flush()
+    row = db_session.get(TaskResult, "old")
+    row.expires_at = row.expires_at - timedelta(seconds=120)
+    db_session.commit()
+
+    assert store.get("old") is None
+    assert store.purge_expired() == 1
+    assert store.get("new") is not None
+
+
+def test_celery_backend_round_trips_results(memory_store):
+    app = Celery(
+        "test_result_store",
+        result_backend="services.result_store:ResultStoreBackend",
+    )
+    backend = app.backend
+
+    backend.store_result("ok", {"rows": 3}, states.SUCCESS)
+    backend.store_result("bad", ValueError("boom"), states.FAILURE)
+
+    assert app.AsyncResult("ok").get(timeout=1) == {"rows": 3}
+    assert app.AsyncResult("missing").state == states.PENDING
+    failed = app.AsyncResult("bad")
+    assert failed.state == states.FAILURE
+    assert isinstance(failed.result, ValueError)
+
+
+def test_status_endpoint(client, memory_store):
+    memory_store.set("ok", _meta(states.SUCCESS, {"rows": 3}), 60)
+    memory_store.set(
+        "bad",
+        _meta(
+            states.FAILURE,
+            {"exc_type": "ValueError", "exc_message": ["boom"]},
+        ),
+        60,
+    )
+
+    pending = client.get("/api/v1/tasks/missing/status").json()
+    succeeded = client.get("/api/v1/tasks/ok/status").json()
+    failed = client.get("/api/v1/tasks/bad/status").json()
+
+    assert pending["status"] == states.PENDING
+    assert succeeded["status"] == states.SUCCESS
+    assert succeeded["result"] == {"rows": 3}
+    assert failed["result"] is None
+    assert failed["error"] == {"type": "ValueError", "message": ["boom"]}
@@ -0,0 +1,109 @@
+"""
+Test priority lanes and weighted-fair polling for SQS queues.
+"""
+
+from collections import (
+    Counter,
+)
+
+import pytest
+
+from services.aws.sqs.priority import (
+    WeightedFairPoller,
+    lane_name,
+    lanes,
+    normalize_priority,
+)
+from workers.celery_app import (
+    route_by_priority,
+)
+
+
+def test_lane_names_keep_medium_on_base_queue():
+    assert lanes("notifications") == [
+        "notifications-high",
+        "notifications",
+        "notifications-low",
+    ]
+    assert lane_name("notifications", "URGENT") == "notifications"
+    assert normalize_priority("High") == "high"
+
+
+def test_poller_shares_polls_by_weight():
+    poller = WeightedFairPoller({"high": 6, "medium": 3, "low": 1})
+    picks = [poller.next_priority() for _ in range(100)]
+
+    assert Counter(picks) == {"high": 60, "medium": 30, "low": 10}
+    # Smooth round-robin never gives one lane a long burst
+    assert "high" in picks[:2] and "low" in picks[:10]
+
+
+def test_poller_falls_through_empty_lanes():
+    poller = WeightedFairPoller({"high": 6, "medium": 3, "low": 1})
+    queues = {"high": [], "medium": [], "low": ["a"]}
+
+    priority, messages = poller.poll(lambda lane: queues[lane])
+
+    assert (priority, messages) == ("low", ["a"])
+
+
+def test_poller_rejects_all_zero_weights():
+    with pytest.raises(ValueError):
+        WeightedFairPoller({"high": 0})
+
+
+def test_send_message_routes_to_priority_lane(sqs_service):
+    result = sqs_service.send_message(
+        "notifications", {"message": "disk full", "priority": "high"}
+    )
+
+    sent = sqs_service.sqs.sent[0]
+    assert sent["QueueUrl"].endswith("/wipsie-notifications-high")
+    assert sent["MessageAttributes"]["priority"]["StringValue"] == "high"
+    assert result["queue"] == "notifications-high"
+
+    sqs_service.send_message("notifications", {}, priority="low")
+    sqs_service.send_message("notifications", {})
+    urls = [message["QueueUrl"] for message in sqs_service.sqs.sent]
+    assert urls[1].endswith("/wipsie-notifications-low")
+    assert urls[2].endswith("/wipsie-notifications")
+
+
+def test_send_message_rejects_unknown_queue(sqs_service):
+    with pytest.raises(ValueError):
+        sqs_service.send_message("missing", {}, priority="high")
+
+
+def test_alerts_are_not_starved_by_low_priority_flood(sqs_service):
+    for index in range(1000):
+        sqs_service.send_message(
+            "notifications", {"n": index}, priority="low"
+        )
+    for index in (1, 2):
+        sqs_service.send_message(
+            "notifications", {"alert": index}, priority="high"
+        )
+
+    first = sqs_service.receive_prioritized("notifications", 10)
+    second = sqs_service.receive_prioritized("notifications", 10)
+
+    assert [m["body"]["alert"] for m in first] == [1, 2]
+    assert first[0]["queue"] == "notifications-high"
+    assert second[0]["priority"] == "low"
+    assert second[0]["queue"] == "notifications-low"
+
+
+def test_celery_routes_by_payload_priority():
+    assert route_by_priority(
+        "workers.tasks.notifications.send_alert", ({},), {}, {}
+    ) == {"queue": "wipsie-notifications-high"}
+    assert route_by_priority(
+        "backend.workers.tasks.notifications.send_notification",
+        ({"priority": "low"},),
+        {},
+        {},
+    ) == {"queue": "wipsie-notifications-low"}
+    assert route_by_priority(
+        "workers.tasks.data_processing.enrich_data", ("raw",), {}, {}
+    ) == {"queue": "wipsie-data-polling"}
+    assert route_by_priority("unknown.task", (), {}, {}) is None
@@ -0,0 +1,104 @@
+"""
+Test the task-type registry shared by Celery and the task processor Lambda.
+"""
+
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+
+import pytest
+
+from services.task_registry import (
+    ResourceHint,
+    TaskRegistry,
+    UnknownTaskType,
+    process_data_analysis,
+    process_data_cleanup,
+    process_report_generation,
+    registry,
+)
+
+
+@pytest.fixture
+def local_registry():
+    local = TaskRegistry(max_threads=2, max_processes=2)
+    yield local
+    local.shutdown()
+
+
+def test_builtin_types_and_hints():
+    assert {"data_analysis", "report_generation", "data_cleanup"} <= set(
+        registry.types()
+    )
+    assert registry.get("data_analysis").hint == ResourceHint.CPU_BOUND
+
+
+def test_decorator_registers_handler(local_registry):
+    @local_registry.register("echo")
+    def echo(task_data):
+        """Return the payload"""
+        return {"status": "success", "echo": task_data["value"]}
+
+    handler = local_registry.get("echo")
+    assert handler.hint == ResourceHint.IO_BOUND
+    assert handler.description == "Return the payload"
+    assert local_registry.run("echo", {"value": 3})["echo"] == 3
+
+
+def test_unknown_type_raises(local_registry):
+    assert "missing" not in local_registry
+    with pytest.raises(UnknownTaskType):
+        local_registry.run("missing", {})
+
+
+def test_cpu_bound_routes_to_process_pool(local_registry):
+    local_registry.register("data_analysis", ResourceHint.CPU_BOUND)(
+        process_data_analysis
+    )
+    executor = local_registry.executor_for(ResourceHint.CPU_BOUND)
+    assert isinstance(executor, ProcessPoolExecutor)
+    assert isinstance(
+        local_registry.executor_for(ResourceHint.IO_BOUND), ThreadPoolExecutor
+    )
+
+    result = local_registry.run(
+        "data_analysis", {"values": [1, 2, 3, 4, 100], "zscore_threshold": 1.5}
+    )
+    assert result["status"] == "success"
+    assert result["results"]["anomalies"]["values"] == [100.0]
+
+
+def test_cpu_bound_falls_back_to_threads_without_processes():
+    local = TaskRegistry(max_threads=2, max_processes=0)
+    try:
+        executor = local.executor_for(ResourceHint.CPU_BOUND)
+        assert isinstance(executor, ThreadPoolExecutor)
+    finally:
+        local.shutdown()
+
+
+def test_run_batch_keeps_input_order(local_registry):
+    @local_registry.register("double", ResourceHint.BATCHABLE)
+    def double(task_data):
+        return {"status": "success", "value": task_data["value"] * 2}
+
+    items = [{"value": value} for value in (7, 30, 90)]
+
+    results = local_registry.run_batch("double", items)
+
+    assert [result["value"] for result in results] == [14, 60, 180]
+
+
+def test_cleanup_without_a_database_is_an_error():
+    result = process_data_cleanup({"days_old": 14})
+
+    assert result["status"] == "error"
+    assert result["days_old"] == 14
+
+
+def test_report_without_a_database_is_an_error():
+    result = process_report_generation({"report_name": "weekly"})
+
+    assert result["status"] == "error"
+    assert "report_url" not in result
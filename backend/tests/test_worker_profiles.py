@@ -0,0 +1,91 @@
+"""
+Test the per-queue worker profiles.
+"""
+
+from celery import (
+    Celery,
+)
+
+from workers.celery_app import (
+    QUEUES,
+    WORKER_PROFILES,
+    WorkerProfile,
+)
+
+
+def test_profiles_split_queues_between_io_and_cpu():
+    io = set(WORKER_PROFILES["io"].queues)
+    cpu = set(WORKER_PROFILES["cpu"].queues)
+
+    assert not io & cpu
+    assert io | cpu == set(QUEUES)
+    assert set(WORKER_PROFILES["all"].queues) == set(QUEUES)
+
+
+def test_consumed_queues_list_high_lanes_first():
+    profile = WorkerProfile(
+        name="test", queues=("a", "b"), pool="threads", concurrency=8
+    )
+
+    assert profile.consumed_queues() == [
+        "a-high",
+        "b-high",
+        "a",
+        "b",
+        "a-low",
+        "b-low",
+    ]
+
+
+def test_worker_args_use_concurrency_without_autoscale():
+    profile = WorkerProfile(
+        name="io",
+        queues=("a",),
+        pool="threads",
+        concurrency=32,
+        prefetch_multiplier=4,
+    )
+
+    args = profile.worker_args(queues=["celery"])
+
+    assert args == [
+        "worker",
+        "--pool=threads",
+        "--queues=celery",
+        "--prefetch-multiplier=4",
+        "--hostname=io@%h",
+        "--concurrency=32",
+    ]
+
+
+def test_worker_args_autoscale_prefork():
+    profile = WorkerProfile(
+        name="cpu",
+        queues=("a",),
+        pool="prefork",
+        concurrency=4,
+        autoscale=(4, 2),
+    )
+
+    args = profile.worker_args()
+
+    assert "--autoscale=4,2" in args
+    assert not any(arg.startswith("--concurrency") for arg in args)
+    assert "--queues=a-high,a,a-low" in args
+
+
+def test_apply_sets_prefetch_and_late_acks():
+    app = Celery("test_worker_profiles")
+    profile = WorkerProfile(
+        name="io",
+        queues=("a",),
+        pool="threads",
+        concurrency=32,
+        prefetch_multiplier=4,
+    )
+
+    profile.apply(app)
+
+    assert app.conf.worker_prefetch_multiplier == 4
+    assert app.conf.task_acks_late is True
+    assert app.conf.task_reject_on_worker_lost is True
@@ -0,0 +1,217 @@
+"""
+Test the poll → validate → transform → enrich → notify data pipeline.
+"""
+
+import asyncio
+from types import (
+    SimpleNamespace,
+)
+
+import pytest
+from sqlalchemy.orm import (
+    sessionmaker,
+)
+
+import services.workflow_service as workflow_service
+import services.workflow_store as workflow_store
+from services.claim_check import (
+    ClaimCheckCodec,
+    LocalBlobStore,
+)
+from services.workflow_service import (
+    DataPipeline,
+    SimpleWorkflowService,
+    chunked,
+    summarize_steps,
+)
+from services.workflow_store import (
+    WorkflowStore,
+)
+from workers.celery_app import (
+    app as celery_app,
+)
+from workers.tasks import workflows
+
+SOURCES = {
+    "https://a.example/data": [{"id": i, "value": i} for i in range(7)],
+    "https://b.example/data": [{"id": 7, "value": None}, "not-a-record"],
+}
+
+
+PIPELINE = {
+    "source_id": "src",
+    "sources": list(SOURCES),
+    "required_fields": ["id", "value"],
+    "chunk_size": 3,
+}
+
+
+@pytest.fixture
+def eager(monkeypatch, tmp_path, db_session):
+    """Run the canvas inline with fake sources and a local claim check"""
+    monkeypatch.setattr(
+        workflow_store,
+        "_store",
+        WorkflowStore(sessionmaker(bind=db_session.get_bind())),
+    )
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    monkeypatch.setattr(celery_app.conf, "task_eager_propagates", True)
+    codec = ClaimCheckCodec(
+        store=LocalBlobStore(str(tmp_path)), offload_threshold=512
+    )
+    monkeypatch.setattr(workflows, "get_claim_check_codec", lambda: codec)
+    polls = []
+
+    def get(url, timeout):
+        polls.append(url)
+        return SimpleNamespace(
+            raise_for_status=lambda: None, json=lambda: SOURCES[url]
+        )
+
+    monkeypatch.setattr(workflow_service.httpx, "get", get)
+    notifications = []
+    monkeypatch.setattr(
+        workflows.send_notification, "delay", notifications.append
+    )
+    results = {}
+    original = workflows.notify_pipeline.run
+
+    def capture(*args, **kwargs):
+        result = original(*args, **kwargs)
+        results[result["workflow_id"]] = result
+        return result
+
+    monkeypatch.setattr(workflows.notify_pipeline, "run", capture)
+    return SimpleNamespace(
+        notifications=notifications, results=results, polls=polls
+    )
+
+
+def test_chunked_splits_evenly():
+    assert chunked(list(range(5)), 2) == [[0, 1], [2, 3], [4]]
+    assert chunked([], 2) == []
+
+
+def test_validate_rejects_incomplete_records():
+    valid, rejected = DataPipeline.validate(
+        [{"id": 1, "value": 2}, {"id": 2}, "text"], ["id", "value"]
+    )
+
+    assert valid == [{"id": 1, "value": 2}]
+    assert rejected == 2
+
+
+def test_summarize_steps_merges_parallel_runs():
+    steps = [
+        {"step": "poll", "started_at": "b", "seconds": 0.2, "items": 3},
+        {"step": "poll", "started_at": "a", "seconds": 0.5, "items": 4},
+        {"step": "enrich", "started_at": "c", "seconds": 0.1, "items": 7},
+    ]
+
+    poll, enrich = summarize_steps(steps)
+
+    assert poll["started_at"] == "a"
+    assert poll["seconds"] == 0.5
+    assert poll["busy_seconds"] == 0.7
+    assert (poll["items"], poll["runs"]) == (7, 2)
+    assert enrich["step"] == "enrich"
+
+
+def test_pipeline_fans_out_enrichment_and_notifies(eager):
+    workflow_id = asyncio.run(
+        SimpleWorkflowService().execute_data_pipeline(PIPELINE)
+    )
+
+    result = eager.results[workflow_id]
+    assert result["enriched"] == 7
+    assert result["rejected"] == 2
+    assert len(result["chunks"]) == 3
+    assert [step["step"] for step in result["steps"]] == [
+        "poll",
+        "validate",
+        "transform",
+        "enrich",
+        "notify",
+    ]
+    assert result["steps"][0]["runs"] == 2
+    assert result["steps"][3]["runs"] == 3
+    assert "7 records enriched" in eager.notifications[0]["message"]
+
+
+def test_progress_endpoint_lists_checkpointed_steps(client, eager):
+    workflow_id = asyncio.run(
+        SimpleWorkflowService().execute_data_pipeline(PIPELINE)
+    )
+
+    response = client.get(f"/api/v1/workflows/{workflow_id}")
+
+    progress = response.json()
+    assert progress["status"] == "completed"
+    assert [step["name"] for step in progress["steps"]] == [
+        "poll:0",
+        "poll:1",
+        "validate",
+        "transform",
+        "enrich:0",
+        "enrich:1",
+        "enrich:2",
+        "notify",
+    ]
+    assert progress["completed_steps"] == progress["known_steps"] == 8
+    assert progress["steps"][0]["items"] == 7
+    assert client.get("/api/v1/workflows/missing").status_code == 404
+
+
+def test_resume_skips_finished_steps(eager, monkeypatch):
+    enrich = DataPipeline.enrich
+    calls = []
+
+    def crash_on_second_chunk(records):
+        calls.append(len(records))
+        if len(calls) == 2:
+            raise RuntimeError("worker lost")
+        return enrich(records)
+
+    monkeypatch.setattr(DataPipeline, "enrich", crash_on_second_chunk)
+    monkeypatch.setattr(
+        workflow_service,
+        "uuid",
+        SimpleNamespace(uuid4=lambda: SimpleNamespace(hex="run1")),
+    )
+    service = SimpleWorkflowService()
+    with pytest.raises(RuntimeError):
+        asyncio.run(service.execute_data_pipeline(PIPELINE))
+
+    workflow_id = "data_pipeline_src_run1"
+    failed = service.progress(workflow_id)
+    assert failed["status"] == "failed"
+    assert "worker lost" in failed["error"]
+
+    assert asyncio.run(service.resume_data_pipeline(workflow_id))
+
+    # Polls, validation, transformation and the first chunk are reused
+    assert len(eager.polls) == 2
+    assert calls == [3, 3, 3, 1]
+    resumed = service.progress(workflow_id)
+    assert resumed["status"] == "completed"
+    attempts = {step["name"]: step["attempts"] for step in resumed["steps"]}
+    assert attempts["poll:0"] == attempts["enrich:0"] == 1
+    assert attempts["enrich:1"] == 2
+    assert eager.results[workflow_id]["enriched"] == 7
+    assert not asyncio.run(service.resume_data_pipeline(workflow_id))
+
+
+def test_resume_completes_runs_that_already_notified(eager):
+    service = SimpleWorkflowService()
+    workflow_id = asyncio.run(service.execute_data_pipeline(PIPELINE))
+    # A worker lost between the notify checkpoint and the status update
+    workflow_store.get_workflow_store().set_status(workflow_id, "running")
+
+    assert not asyncio.run(service.resume_data_pipeline(workflow_id))
+    assert service.progress(workflow_id)["status"] == "completed"
+    assert len(eager.polls) == 2
+
+
+def test_pipeline_requires_a_source(eager):
+    with pytest.raises(ValueError):
+        asyncio.run(SimpleWorkflowService().execute_data_pipeline({}))
@@ -12,5 +12,6 @@ from .tasks import data_processing  # noqa: F401
 from .tasks import email  # noqa: F401
 from .tasks import general  # noqa: F401
 from .tasks import notifications  # noqa: F401
+from .tasks import workflows  # noqa: F401
 
 __all__ = ["celery_app"]
@@ -5,6 +5,20 @@ Centralized Celery setup with SQS broker
 """
 
 import logging
+import os
+import time
+from dataclasses import (
+    dataclass,
+)
+from fnmatch import (
+    fnmatch,
+)
+from typing import (
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 from urllib.parse import (
     quote_plus,
 )
@@ -12,10 +26,28 @@ from urllib.parse import (
 from celery import (
     Celery,
 )
+from celery.signals import (
+    task_postrun,
+    task_prerun,
+    worker_process_init,
+    worker_process_shutdown,
+)
 
 from core.config import (
     settings,
 )
+from services.autoscaling import (
+    get_ack_recorder,
+)
+from services.aws.sqs.priority import (
+    PRIORITIES,
+    lane_name,
+    lanes,
+    normalize_priority,
+)
+from services.result_store import (
+    get_result_store,
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -28,39 +60,179 @@ app = Celery("wipsie_worker")
 encoded_access_key = quote_plus(settings.AWS_ACCESS_KEY_ID or "")
 encoded_secret_key = quote_plus(settings.AWS_SECRET_ACCESS_KEY or "")
 
+QUEUE_BASE_URL = (
+    f"https://sqs.{settings.AWS_REGION}.amazonaws.com/554510949034"
+)
+QUEUES = (
+    "wipsie-default",
+    "wipsie-data-polling",
+    "wipsie-task-processing",
+    "wipsie-notifications",
+)
+
+# Base queue per task module; the priority picks the lane within it
+TASK_QUEUES = {
+    "workers.tasks.data_processing.*": "wipsie-data-polling",
+    "workers.tasks.general.*": "wipsie-task-processing",
+    "workers.tasks.notifications.*": "wipsie-notifications",
+    "workers.tasks.email.*": "wipsie-notifications",
+    "workers.tasks.workflows.poll_source": "wipsie-data-polling",
+    "workers.tasks.workflows.*": "wipsie-task-processing",
+}
+
+# Lane for tasks whose payload doesn't carry a "priority"
+TASK_PRIORITIES = {
+    "workers.tasks.notifications.send_alert": "high",
+}
+
+
+def route_by_priority(name, args, kwargs, options, task=None, **kw):
+    """
+    Route a task to the priority lane of its module's queue.
+
+    The payload's "priority" field wins, then TASK_PRIORITIES, then
+    medium. Task names are matched with or without a "backend." prefix.
+    """
+    task_name = name.removeprefix("backend.")
+    queue = next(
+        (
+            queue
+            for pattern, queue in TASK_QUEUES.items()
+            if fnmatch(task_name, pattern)
+        ),
+        None,
+    )
+    if queue is None:
+        return None
+
+    payload = args[0] if args else None
+    priority = None
+    if isinstance(payload, dict):
+        priority = payload.get("priority")
+    if priority is None:
+        priority = TASK_PRIORITIES.get(task_name)
+    return {"queue": lane_name(queue, normalize_priority(priority))}
+
+
+@dataclass(frozen=True)
+class WorkerProfile:
+    """Pool, concurrency and prefetch settings for a group of queues"""
+
+    name: str
+    queues: Tuple[str, ...]
+    pool: str
+    concurrency: int
+    # (max, min) processes for the prefork autoscaler; None keeps the
+    # concurrency fixed (thread and gevent pools can't autoscale)
+    autoscale: Optional[Tuple[int, int]] = None
+    prefetch_multiplier: int = 1
+    acks_late: bool = True
+
+    def consumed_queues(self) -> List[str]:
+        """Every priority lane of the profile's queues, high lanes first"""
+        return [
+            lane_name(queue, priority)
+            for priority in PRIORITIES
+            for queue in self.queues
+        ]
+
+    def worker_args(self, queues: Optional[Sequence[str]] = None):
+        """`celery worker` arguments for this profile"""
+        args = [
+            "worker",
+            f"--pool={self.pool}",
+            f"--queues={','.join(queues or self.consumed_queues())}",
+            f"--prefetch-multiplier={self.prefetch_multiplier}",
+            f"--hostname={self.name}@%h",
+        ]
+        if self.autoscale:
+            args.append(f"--autoscale={self.autoscale[0]},{self.autoscale[1]}")
+        else:
+            args.append(f"--concurrency={self.concurrency}")
+        return args
+
+    def apply(self, celery_app: Celery):
+        """Configure acknowledgement for the worker about to start"""
+        celery_app.conf.update(
+            worker_prefetch_multiplier=self.prefetch_multiplier,
+            # Ack after the task finishes, so a crashed worker's message is
+            # redelivered; @idempotent lets the redelivery take over the
+            # dead worker's claim (or retries it once the lease expires)
+            task_acks_late=self.acks_late,
+            task_reject_on_worker_lost=self.acks_late,
+        )
+
+
+_CPUS = os.cpu_count() or 1
+
+WORKER_PROFILES = {
+    # SES email and webhooks mostly wait on the network: many cheap
+    # threads (or greenlets with WORKER_IO_POOL=gevent), and a few
+    # messages prefetched per slot to hide SQS round trips
+    "io": WorkerProfile(
+        name="io",
+        queues=("wipsie-notifications", "wipsie-default"),
+        pool=settings.WORKER_IO_POOL,
+        concurrency=settings.WORKER_IO_CONCURRENCY,
+        prefetch_multiplier=4,
+    ),
+    # Enrichment and analysis are CPU-bound: a process per core, grown
+    # and shrunk with load, prefetching one message so long tasks don't
+    # hoard work other processes could start
+    "cpu": WorkerProfile(
+        name="cpu",
+        queues=("wipsie-data-polling", "wipsie-task-processing"),
+        pool="prefork",
+        concurrency=_CPUS,
+        autoscale=(_CPUS, max(1, _CPUS // 2)),
+        prefetch_multiplier=1,
+    ),
+    # One worker for every queue, as before profiles existed
+    "all": WorkerProfile(
+        name="all",
+        queues=QUEUES,
+        pool="prefork",
+        concurrency=settings.WORKER_CONCURRENCY,
+        prefetch_multiplier=1,
+    ),
+}
+
+
 # Configure Celery to use SQS as broker
 app.conf.update(
     broker_url=f"sqs://{encoded_access_key}:{encoded_secret_key}@",
     broker_transport_options={
         "region": settings.AWS_REGION,
         "predefined_queues": {
-            "wipsie-default": {
-                "url": f"https://sqs.{settings.AWS_REGION}.amazonaws.com/554510949034/wipsie-default"  # noqa: E501
-            },
-            "wipsie-data-polling": {
-                "url": f"https://sqs.{settings.AWS_REGION}.amazonaws.com/554510949034/wipsie-data-polling"  # noqa: E501
-            },
-            "wipsie-task-processing": {
-                "url": f"https://sqs.{settings.AWS_REGION}.amazonaws.com/554510949034/wipsie-task-processing"  # noqa: E501
-            },
-            "wipsie-notifications": {
-                "url": f"https://sqs.{settings.AWS_REGION}.amazonaws.com/554510949034/wipsie-notifications"  # noqa: E501
-            },
+            lane: {"url": f"{QUEUE_BASE_URL}/{lane}"}
+            for queue in QUEUES
+            for lane in lanes(queue)
         },
     },
     task_default_queue="wipsie-default",
-    task_routes={
-        "backend.workers.tasks.data_processing.*": {
-            "queue": "wipsie-data-polling"
+    task_routes=(route_by_priority,),
+    # Autoscaling signal, published every minute when beat is running
+    beat_schedule={
+        "publish-scaling-signals": {
+            "task": "workers.tasks.general.publish_scaling_signals",
+            "schedule": 60.0,
+        },
+        "purge-task-results": {
+            "task": "workers.tasks.general.purge_task_results",
+            "schedule": 3600.0,
         },
-        "backend.workers.tasks.general.*": {"queue": "wipsie-task-processing"},
-        "backend.workers.tasks.notifications.*": {
-            "queue": "wipsie-notifications"
+        "dispatch-due-polls": {
+            "task": "workers.tasks.data_processing.dispatch_due_polls",
+            "schedule": settings.POLL_SCHEDULER_TICK_SECONDS,
+        },
+        "resume-stalled-workflows": {
+            "task": "workers.tasks.workflows.resume_stalled_workflows",
+            "schedule": 300.0,
         },
-        "backend.workers.tasks.email.*": {"queue": "wipsie-notifications"},
     },
-    # Disable results backend to avoid queue creation issues
-    result_backend=None,
+    # Batched result store rather than an SQS or per-update DB backend
+    result_backend="services.result_store:ResultStoreBackend",
+    result_expires=settings.RESULT_STORE_TTL_SECONDS,
     # Task serialization
     task_serializer="json",
     accept_content=["json"],
@@ -73,9 +245,45 @@ app.conf.update(
         "backend.workers.tasks.general",
         "backend.workers.tasks.notifications",
         "backend.workers.tasks.email",
+        "backend.workers.tasks.workflows",
     ],
 )
 
+# Task start times by task id, to measure busy time for autoscaling
+_task_started = {}
+
+
+@task_prerun.connect
+def _start_task_timer(task_id=None, **kwargs):
+    _task_started[task_id] = time.monotonic()
+
+
+@task_postrun.connect
+def _record_task_ack(task_id=None, task=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    delivery_info = getattr(task.request, "delivery_info", None) or {}
+    queue = delivery_info.get("routing_key")
+    if started is None or not queue:
+        return
+    try:
+        get_ack_recorder().record(queue, time.monotonic() - started)
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to record task ack: {e}")
+
+
+@worker_process_init.connect
+def _connect_result_store(**kwargs):
+    # Raises ResultStoreUnavailable: a worker whose results nobody can
+    # read must not start taking tasks
+    get_result_store()
+
+
+@worker_process_shutdown.connect
+def _flush_worker_buffers(**kwargs):
+    get_ack_recorder().flush()
+    get_result_store().flush()
+
+
 # Configure logging for Celery
 app.log.setup_logging_subsystem(loglevel=logging.INFO)
 
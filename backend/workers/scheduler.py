@@ -0,0 +1,218 @@
+"""
+Poll Scheduler
+Per-source polling cadence for the workers. Celery beat ticks every
+POLL_SCHEDULER_TICK_SECONDS; each tick claims the sources that are due
+and not already being polled, and every finished poll schedules the
+next one with jitter, or with exponential backoff after a failure, so
+polls spread out instead of bursting at the top of each minute.
+"""
+
+import logging
+import random
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from typing import (
+    Callable,
+    List,
+    Optional,
+)
+
+from sqlalchemy import (
+    or_,
+    select,
+    update,
+)
+
+from core.config import (
+    settings,
+)
+from db.database import (
+    SessionLocal,
+)
+from models.models import (
+    PollingSource,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def next_delay(
+    interval_seconds: float,
+    failures: int = 0,
+    jitter: Optional[float] = None,
+    max_backoff_seconds: Optional[float] = None,
+    rng: random.Random = random,
+) -> float:
+    """
+    Seconds until a source's next poll.
+
+    The interval doubles with each consecutive failure up to the backoff
+    cap, then moves by a random +/- jitter fraction of itself.
+    """
+    if jitter is None:
+        jitter = settings.POLL_SCHEDULER_JITTER
+    if max_backoff_seconds is None:
+        max_backoff_seconds = settings.POLL_SCHEDULER_MAX_BACKOFF_SECONDS
+    delay = interval_seconds
+    if failures:
+        delay = min(
+            interval_seconds * 2 ** min(failures, 32),
+            max(max_backoff_seconds, interval_seconds),
+        )
+    return max(0.0, delay * (1 + rng.uniform(-jitter, jitter)))
+
+
+class PollScheduler:
+    """Claims due sources and records poll outcomes in polling_sources"""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable] = None,
+        rng: random.Random = random,
+    ):
+        self.session_factory = session_factory or SessionLocal
+        self.rng = rng
+
+    def register(
+        self,
+        url: str,
+        data_type: str,
+        interval_seconds: int,
+        enabled: bool = True,
+    ) -> int:
+        """Add a source, or update its cadence; returns its id"""
+        db = self.session_factory()
+        try:
+            source = db.scalar(
+                select(PollingSource).where(PollingSource.url == url)
+            )
+            if source is None:
+                source = PollingSource(
+                    url=url,
+                    # A random first run spreads sources added together
+                    next_run_at=_utcnow()
+                    + timedelta(
+                        seconds=self.rng.uniform(0, interval_seconds)
+                    ),
+                    consecutive_failures=0,
+                )
+                db.add(source)
+            source.data_type = data_type
+            source.interval_seconds = interval_seconds
+            source.enabled = enabled
+            db.commit()
+            return source.id
+        finally:
+            db.close()
+
+    def claim_due(self, limit: Optional[int] = None) -> List[int]:
+        """
+        Ids of due sources, each marked running.
+
+        Sources whose previous poll is still running are skipped until
+        it finishes or its lease runs out.
+        """
+        now = _utcnow()
+        stale = now - timedelta(seconds=settings.POLL_SCHEDULER_LEASE_SECONDS)
+        idle = or_(
+            PollingSource.running_since.is_(None),
+            PollingSource.running_since < stale,
+        )
+        db = self.session_factory()
+        try:
+            due = db.scalars(
+                select(PollingSource.id)
+                .where(
+                    PollingSource.enabled.is_(True),
+                    PollingSource.next_run_at <= now,
+                    idle,
+                )
+                .order_by(PollingSource.next_run_at)
+                .limit(limit or settings.POLL_SCHEDULER_BATCH_SIZE)
+            ).all()
+
+            claimed = []
+            for source_id in due:
+                # Conditional update: a concurrent tick can't claim twice
+                result = db.execute(
+                    update(PollingSource)
+                    .where(PollingSource.id == source_id, idle)
+                    .values(running_since=now, last_started_at=now)
+                )
+                if result.rowcount:
+                    claimed.append(source_id)
+            db.commit()
+            return claimed
+        finally:
+            db.close()
+
+    def get(self, source_id: int) -> Optional[PollingSource]:
+        db = self.session_factory()
+        try:
+            return db.get(PollingSource, source_id)
+        finally:
+            db.close()
+
+    def sources(self) -> List[PollingSource]:
+        db = self.session_factory()
+        try:
+            return list(
+                db.scalars(select(PollingSource).order_by(PollingSource.id))
+            )
+        finally:
+            db.close()
+
+    def release(self, source_id: int):
+        """Drop a claim without polling, leaving the schedule as it was"""
+        db = self.session_factory()
+        try:
+            db.execute(
+                update(PollingSource)
+                .where(PollingSource.id == source_id)
+                .values(running_since=None)
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def finish(
+        self, source_id: int, succeeded: bool, error: Optional[str] = None
+    ) -> Optional[datetime]:
+        """Release a source and schedule its next poll"""
+        now = _utcnow()
+        db = self.session_factory()
+        try:
+            source = db.get(PollingSource, source_id)
+            if source is None:
+                return None
+            if succeeded:
+                source.consecutive_failures = 0
+                source.last_error = None
+            else:
+                source.consecutive_failures += 1
+                source.last_error = error
+            delay = next_delay(
+                source.interval_seconds,
+                source.consecutive_failures,
+                rng=self.rng,
+            )
+            source.next_run_at = now + timedelta(seconds=delay)
+            source.running_since = None
+            source.last_finished_at = now
+            db.commit()
+            if not succeeded:
+                logger.warning(
+                    f"⚠️ Polling {source.url} failed "
+                    f"{source.consecutive_failures} times in a row, "
+                    f"next try in {delay:.0f}s"
+                )
+            return source.next_run_at
+        finally:
+            db.close()
@@ -5,18 +5,33 @@ Handle data polling, collection, and analysis
 
 import json
 import logging
+import random
 from datetime import (
     datetime,
 )
 
+from core.config import (
+    settings,
+)
+from services.fetch_cache_service import (
+    fetch_if_changed,
+)
+from services.idempotency import (
+    idempotent,
+)
+
 from ..celery_app import (
     app,
 )
+from ..scheduler import (
+    PollScheduler,
+)
 
 logger = logging.getLogger(__name__)
 
 
 @app.task(bind=True)
+@idempotent()
 def process_default_message(self, message_data):
     """Process messages from the default queue"""
     logger.info(f"📨 Processing default message: {self.request.id}")
@@ -77,6 +92,7 @@ def process_data_polling(self, polling_data):
 
 
 @app.task(bind=True)
+@idempotent()
 def enrich_data(self, raw_data):
     """Enrich raw data with additional information (Data Enricher)"""
     logger.info(f"🔧 Enriching data: {self.request.id}")
@@ -113,3 +129,60 @@ def enrich_data(self, raw_data):
     except Exception as e:
         logger.error(f"❌ Data enrichment failed: {e}")
         raise self.retry(countdown=90, max_retries=3)
+
+
+@app.task(bind=True)
+def dispatch_due_polls(self):
+    """Queue a poll for every source that is due (run by beat)"""
+    claimed = PollScheduler().claim_due()
+    tick = settings.POLL_SCHEDULER_TICK_SECONDS
+    for source_id in claimed:
+        # Spread this tick's polls over the tick instead of one burst
+        poll_scheduled_source.apply_async(
+            args=(source_id,), countdown=random.uniform(0, tick)
+        )
+    if claimed:
+        logger.info(f"⏰ Queued {len(claimed)} scheduled polls")
+    return {"queued": len(claimed)}
+
+
+@app.task(bind=True)
+def poll_scheduled_source(self, source_id):
+    """Poll one scheduled source and book its next run"""
+    scheduler = PollScheduler()
+    source = scheduler.get(source_id)
+    if source is None or not source.enabled:
+        # Disabled after it was claimed: free it for when it's re-enabled
+        scheduler.release(source_id)
+        return {"status": "skipped", "source_id": source_id}
+
+    logger.info(f"🔍 Polling scheduled source: {source.url}")
+
+    def hand_on(db, response):
+        # Queued before the new validators commit: if this fails, the
+        # next poll fetches the payload again
+        enrich_data.apply_async(
+            args=(
+                {
+                    "type": source.data_type,
+                    "source": source.url,
+                    "polled_at": datetime.now().isoformat(),
+                    "data": response.json(),
+                },
+            )
+        )
+
+    try:
+        changed, _ = fetch_if_changed(source.url, hand_on)
+    except Exception as e:
+        # No Celery retry: the scheduler backs the source off instead
+        logger.error(f"❌ Scheduled poll of {source.url} failed: {e}")
+        scheduler.finish(source_id, succeeded=False, error=str(e))
+        return {"status": "failed", "source": source.url, "error": str(e)}
+
+    scheduler.finish(source_id, succeeded=True)
+    return {
+        "status": "changed" if changed else "unchanged",
+        "source": source.url,
+        "data_type": source.data_type,
+    }
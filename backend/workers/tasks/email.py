@@ -9,7 +9,10 @@ from datetime import (
 )
 
 from services.aws.ses.service import (
-    ses_service,
+    get_ses_service,
+)
+from services.idempotency import (
+    idempotent,
 )
 
 from ..celery_app import (
@@ -20,6 +23,7 @@ logger = logging.getLogger(__name__)
 
 
 @app.task(bind=True)
+@idempotent()
 def send_notification_email(self, notification_data):
     """Send notifications via email using SES"""
     logger.info(f"📧 Sending notification email: {self.request.id}")
@@ -38,7 +42,7 @@ def send_notification_email(self, notification_data):
         email_result = None
         if "@" in recipient:  # If recipient looks like an email
             try:
-                email_result = ses_service.send_notification_email(
+                email_result = get_ses_service().send_notification_email(
                     recipient=recipient,
                     notification_type=notification_type,
                     title=f"Wipsie Notification: {notification_type}",
@@ -86,7 +90,7 @@ def send_task_completion_email(self, task_data):
         details = task_data.get("details", {})
 
         # Send task completion email
-        email_result = ses_service.send_task_completion_email(
+        email_result = get_ses_service().send_task_completion_email(
             recipient=recipient,
             task_id=task_id,
             task_type=task_type,
@@ -120,7 +124,7 @@ def process_email_queue(self, email_data):
 
         if email_type == "notification":
             # Handle notification emails
-            result = ses_service.send_notification_email(
+            result = get_ses_service().send_notification_email(
                 recipient=email_data["recipient"],
                 notification_type=email_data["notification_type"],
                 title=email_data["title"],
@@ -129,7 +133,7 @@ def process_email_queue(self, email_data):
             )
         elif email_type == "task_completion":
             # Handle task completion emails
-            result = ses_service.send_task_completion_email(
+            result = get_ses_service().send_task_completion_email(
                 recipient=email_data["recipient"],
                 task_id=email_data["task_id"],
                 task_type=email_data["task_type"],
@@ -138,7 +142,7 @@ def process_email_queue(self, email_data):
             )
         else:
             # Handle general emails
-            result = ses_service.send_email(
+            result = get_ses_service().send_email(
                 to_emails=email_data["to_emails"],
                 subject=email_data["subject"],
                 body_text=email_data["body_text"],
@@ -8,6 +8,23 @@ from datetime import (
     datetime,
 )
 
+# Register the backend analysis, cleanup and report handlers
+import services.analysis_engine  # noqa: F401
+import services.cleanup_engine  # noqa: F401
+import services.report_engine  # noqa: F401
+from services.autoscaling import (
+    AutoscalingService,
+)
+from services.aws.sqs.service import (
+    get_claim_check_codec,
+)
+from services.result_store import (
+    get_result_store,
+)
+from services.task_registry import (
+    registry,
+)
+
 from ..celery_app import (
     app,
 )
@@ -25,27 +42,8 @@ def process_task(self, task_data):
         logger.info(f"🔧 Task type: {task_type}")
 
         # Process based on task type
-        if task_type == "data_analysis":
-            result = {
-                "analysis": "completed",
-                "insights": ["insight1", "insight2"],
-                "processed_records": 150,
-                "analysis_duration": "2.5 seconds",
-            }
-        elif task_type == "report_generation":
-            result = {
-                "report": "generated",
-                "file_path": "/reports/report.pdf",
-                "pages": 12,
-                "charts": 5,
-            }
-        elif task_type == "data_cleanup":
-            result = {
-                "cleanup": "completed",
-                "records_cleaned": 1200,
-                "duplicates_removed": 45,
-                "errors_fixed": 12,
-            }
+        if task_type in registry:
+            result = registry.run(task_type, task_data)
         else:
             result = {"status": "processed", "type": task_type}
 
@@ -93,12 +91,42 @@ def health_check(self):
         raise
 
 
+@app.task(bind=True)
+def publish_scaling_signals(self):
+    """Publish per-queue worker scaling signals to CloudWatch"""
+    service = AutoscalingService()
+    signals = service.signals()
+    published = service.publish(signals)
+    purged = service.purge_windows()
+
+    for signal in signals:
+        logger.info(
+            f"📈 {signal['queue']}: {signal['messages_visible']} waiting, "
+            f"{signal['desired_workers']} workers wanted"
+        )
+    return {"metrics_published": published, "windows_purged": purged}
+
+
+@app.task(bind=True)
+def purge_task_results(self):
+    """Delete task results past RESULT_STORE_TTL_SECONDS"""
+    store = get_result_store()
+    # Redis and in-memory entries expire on their own
+    if not hasattr(store, "purge_expired"):
+        return {"results_purged": 0}
+    purged = store.purge_expired()
+    logger.info(f"🧹 Purged {purged} expired task results")
+    return {"results_purged": purged}
+
+
 @app.task(bind=True)
 def process_batch(self, batch_data):
     """Process a batch of items"""
     logger.info(f"📦 Processing batch: {self.request.id}")
 
     try:
+        # Large batches arrive as a claim check (see ClaimCheckCodec.wrap)
+        batch_data = get_claim_check_codec().unwrap(batch_data)
         items = batch_data.get("items", [])
         batch_type = batch_data.get("type", "generic")
 
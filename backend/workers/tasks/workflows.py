@@ -0,0 +1,317 @@
+"""
+Workflow Tasks
+Celery canvas for the data pipeline: sources are polled in parallel,
+validated and transformed once all polls are in, enriched in parallel
+chunks and announced when every chunk is done. Every step checkpoints
+its output, so a resumed run skips the steps that already finished.
+"""
+
+import logging
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+)
+
+from celery import (
+    chain,
+    chord,
+    group,
+)
+
+from core.config import (
+    settings,
+)
+from services.aws.sqs.service import (
+    get_claim_check_codec,
+)
+from services.workflow_service import (
+    DataPipeline,
+    StepTimer,
+    chunked,
+    summarize_steps,
+)
+from services.workflow_store import (
+    get_workflow_store,
+)
+
+from ..celery_app import (
+    app,
+)
+from .notifications import (
+    send_notification,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def notify_task_id(workflow_id: str) -> str:
+    """Task id of a pipeline's final step, known before it is queued"""
+    return f"{workflow_id}-notify"
+
+
+def _wrap(records: List[Any]) -> Dict[str, Any]:
+    # Record lists can outgrow an SQS message; large ones go to S3
+    return get_claim_check_codec().wrap({"records": records})
+
+
+def _unwrap(payload: Dict[str, Any]) -> List[Any]:
+    return get_claim_check_codec().unwrap(payload)["records"]
+
+
+def _run_step(
+    workflow_id: str,
+    step: str,
+    work: Callable[[], tuple],
+    retrying: bool = False,
+) -> Any:
+    """
+    Run work() as a checkpointed step, or reuse its saved output.
+
+    work returns (output, StepTimer); the output is saved with the
+    timer's duration and item count once it returns. A failure fails
+    the workflow unless the task is going to retry the step.
+    """
+    store = get_workflow_store()
+    output = store.checkpoint(workflow_id, step)
+    if output is not None:
+        logger.info(f"⏭️ {workflow_id}: {step} already done")
+        return output
+
+    store.start_step(workflow_id, step)
+    try:
+        output, timer = work()
+    except Exception as e:
+        store.fail_step(workflow_id, step, str(e), retrying)
+        raise
+    store.complete_step(
+        workflow_id, step, output, round(timer.seconds, 4), timer.items
+    )
+    return output
+
+
+def start_data_pipeline(workflow_id: str, data_config: Dict[str, Any]):
+    """Record and queue a new pipeline; returns the id of its final task"""
+    sources = data_config.get("sources") or []
+    if not sources:
+        raise ValueError("A data pipeline needs at least one source")
+
+    get_workflow_store().create(
+        workflow_id,
+        "data_pipeline",
+        data_config,
+        [f"poll:{index}" for index in range(len(sources))]
+        + ["validate", "transform"],
+    )
+    _queue_pipeline(workflow_id, data_config)
+    return notify_task_id(workflow_id)
+
+
+def resume_data_pipeline(workflow_id: str) -> Optional[str]:
+    """
+    Continue a pipeline from the first step that didn't finish.
+
+    Returns the id of its final task, or None if the run is unknown or
+    already completed.
+    """
+    store = get_workflow_store()
+    data_config = store.config(workflow_id)
+    if data_config is None:
+        return None
+    if store.checkpoint(workflow_id, "notify") is not None:
+        # Notified but lost before its status was set: nothing to rerun
+        store.set_status(workflow_id, "completed")
+        return None
+
+    store.set_status(workflow_id, "running")
+    transformed = store.checkpoint(workflow_id, "transform")
+    if transformed is not None:
+        # Polls, validation and transformation are done: fan out again;
+        # chunks that were already enriched return their checkpoint
+        logger.info(f"🔁 {workflow_id}: resuming at enrichment")
+        fan_out_enrichment.delay(transformed, workflow_id, data_config)
+    else:
+        logger.info(f"🔁 {workflow_id}: resuming at polling")
+        _queue_pipeline(workflow_id, data_config)
+    return notify_task_id(workflow_id)
+
+
+def _queue_pipeline(workflow_id: str, data_config: Dict[str, Any]):
+    # A group followed by a task runs as a chord: the fan-in waits for
+    # every poll before validating
+    chain(
+        group(
+            poll_source.s(workflow_id, url, index)
+            for index, url in enumerate(data_config["sources"])
+        ),
+        validate_and_transform.s(workflow_id, data_config),
+        fan_out_enrichment.s(workflow_id, data_config),
+    ).apply_async()
+
+
+@app.task(bind=True, max_retries=3)
+def poll_source(self, workflow_id, source_url, index=0):
+    """Poll Data: fetch the records of one source"""
+    logger.info(f"🔍 {workflow_id}: polling {source_url}")
+
+    def work():
+        with StepTimer("poll") as step:
+            records = DataPipeline.poll(source_url)
+            step.items = len(records)
+        return {"payload": _wrap(records), "steps": [step.as_dict()]}, step
+
+    try:
+        return _run_step(
+            workflow_id,
+            f"poll:{index}",
+            work,
+            retrying=self.request.retries < self.max_retries,
+        )
+
+    except Exception as e:
+        logger.error(f"❌ {workflow_id}: polling {source_url} failed: {e}")
+        raise self.retry(countdown=60)
+
+
+@app.task(bind=True)
+def validate_and_transform(self, polled, workflow_id, data_config):
+    """Validate → Transform the records of every polled source"""
+    records = [
+        record for result in polled for record in _unwrap(result["payload"])
+    ]
+    steps = [step for result in polled for step in result["steps"]]
+
+    def validate_work():
+        with StepTimer("validate") as step:
+            valid, rejected = DataPipeline.validate(
+                records, data_config.get("required_fields", [])
+            )
+            step.items = len(records)
+        output = {
+            "payload": _wrap(valid),
+            "rejected": rejected,
+            "steps": [step.as_dict()],
+        }
+        return output, step
+
+    validated = _run_step(workflow_id, "validate", validate_work)
+
+    def transform_work():
+        with StepTimer("transform") as step:
+            transformed = DataPipeline.transform(
+                _unwrap(validated["payload"]), data_config
+            )
+            step.items = len(transformed)
+        output = {
+            "payload": _wrap(transformed),
+            "rejected": validated["rejected"],
+            "steps": steps + validated["steps"] + [step.as_dict()],
+        }
+        return output, step
+
+    transformed = _run_step(workflow_id, "transform", transform_work)
+    logger.info(
+        f"🧹 {workflow_id}: {transformed['rejected']} records rejected"
+    )
+    return transformed
+
+
+@app.task(bind=True)
+def fan_out_enrichment(self, transformed, workflow_id, data_config):
+    """Enrich in parallel chunks, then notify once all chunks are done"""
+    records = _unwrap(transformed["payload"])
+    chunks = chunked(
+        records, data_config.get("chunk_size", settings.WORKFLOW_CHUNK_SIZE)
+    )
+    get_workflow_store().add_steps(
+        workflow_id,
+        [f"enrich:{index}" for index in range(len(chunks))] + ["notify"],
+    )
+    notify = notify_pipeline.s(
+        workflow_id, data_config, transformed["steps"], transformed["rejected"]
+    ).set(task_id=notify_task_id(workflow_id))
+
+    logger.info(
+        f"🔀 {workflow_id}: enriching {len(records)} records "
+        f"in {len(chunks)} chunks"
+    )
+    if chunks:
+        chord(
+            enrich_chunk.s(workflow_id, _wrap(chunk), index)
+            for index, chunk in enumerate(chunks)
+        )(notify)
+    else:
+        notify.apply_async(args=([],))
+    return {"chunks": len(chunks), "notify_task_id": notify.id}
+
+
+@app.task(bind=True)
+def enrich_chunk(self, workflow_id, payload, index=0):
+    """Enrich one chunk of records"""
+
+    def work():
+        with StepTimer("enrich") as step:
+            enriched = DataPipeline.enrich(_unwrap(payload))
+            step.items = len(enriched)
+        output = {
+            "payload": _wrap(enriched),
+            "count": len(enriched),
+            "steps": [step.as_dict()],
+        }
+        return output, step
+
+    return _run_step(workflow_id, f"enrich:{index}", work)
+
+
+@app.task(bind=True)
+def notify_pipeline(self, chunks, workflow_id, data_config, steps, rejected):
+    """Notify: announce the finished pipeline and report step timings"""
+    enriched = sum(chunk["count"] for chunk in chunks)
+
+    def work():
+        with StepTimer("notify") as step:
+            send_notification.delay(
+                DataPipeline.notification(
+                    workflow_id, data_config, enriched, rejected
+                )
+            )
+            step.items = 1
+        timings = summarize_steps(
+            steps
+            + [timing for chunk in chunks for timing in chunk["steps"]]
+            + [step.as_dict()]
+        )
+        output = {
+            "workflow_id": workflow_id,
+            "status": "completed",
+            "enriched": enriched,
+            "rejected": rejected,
+            "chunks": [chunk["payload"] for chunk in chunks],
+            "steps": timings,
+        }
+        return output, step
+
+    result = _run_step(workflow_id, "notify", work)
+    get_workflow_store().set_status(workflow_id, "completed")
+    for timing in result["steps"]:
+        logger.info(
+            f"⏱️ {workflow_id} {timing['step']}: {timing['seconds']}s "
+            f"({timing['runs']} runs, {timing['items']} items)"
+        )
+    return result
+
+
+@app.task(bind=True)
+def resume_stalled_workflows(self):
+    """Resume pipelines with no step progress for WORKFLOW_STALL_SECONDS"""
+    resumed = []
+    for workflow_id in get_workflow_store().stalled(
+        settings.WORKFLOW_STALL_SECONDS
+    ):
+        if resume_data_pipeline(workflow_id):
+            resumed.append(workflow_id)
+    if resumed:
+        logger.info(f"🔁 Resumed {len(resumed)} stalled workflows")
+    return {"resumed": resumed}
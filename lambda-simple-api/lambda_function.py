@@ -1,6 +1,8 @@
 import json
 import logging
 import os
+import random
+import time
 from datetime import (
     datetime,
 )
@@ -9,15 +11,103 @@ from datetime import (
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Fraction of requests whose summary is logged; errors are always logged
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.01"))
+
+# Upper bound for list endpoints
+MAX_PAGE_SIZE = 1000
+
+# Reused across warm invocations of the same execution environment
+_connection = None
+
+
+class Router:
+    """
+    Path router backed by a segment trie.
+
+    Static paths resolve with a single dict lookup; templates such as
+    /users/{user_id} walk one trie level per path segment.
+    """
+
+    PARAM = "{param}"
+
+    def __init__(self):
+        self.static = {}
+        self.root = {}
+
+    def route(self, template):
+        def decorator(handler):
+            self.add(template, handler)
+            return handler
+        return decorator
+
+    def add(self, template, handler):
+        segments = _split_path(template)
+        if not any(s.startswith('{') for s in segments):
+            self.static['/' + '/'.join(segments)] = handler
+            return
+
+        node = self.root
+        names = []
+        for segment in segments:
+            if segment.startswith('{') and segment.endswith('}'):
+                names.append(segment[1:-1])
+                segment = self.PARAM
+            node = node.setdefault(segment, {})
+        node['__handler__'] = (handler, names)
+
+    def resolve(self, path):
+        """Return (handler, path_params) or (None, {})"""
+        segments = _split_path(path)
+        handler = self.static.get('/' + '/'.join(segments))
+        if handler:
+            return handler, {}
+
+        node = self.root
+        values = []
+        for segment in segments:
+            if segment in node:
+                node = node[segment]
+            elif self.PARAM in node:
+                node = node[self.PARAM]
+                values.append(segment)
+            else:
+                return None, {}
+
+        if '__handler__' not in node:
+            return None, {}
+        handler, names = node['__handler__']
+        return handler, dict(zip(names, values))
+
+    def paths(self):
+        return sorted(self.static) + sorted(
+            _template_paths(self.root, '')
+        )
+
+
+def _split_path(path):
+    return [segment for segment in path.split('/') if segment]
+
+
+def _template_paths(node, prefix):
+    for segment, child in node.items():
+        if segment == '__handler__':
+            yield prefix or '/'
+            continue
+        label = '{id}' if segment == Router.PARAM else segment
+        yield from _template_paths(child, f"{prefix}/{label}")
+
+
+router = Router()
+
 
 def lambda_handler(event, context):
-    # Log the incoming event for debugging
-    logger.info(f"Received event: {json.dumps(event, default=str)}")
+    start = time.perf_counter()
 
     # Extract request details
     http_method = event.get('httpMethod', 'GET')
     path = event.get('path', '/')
-    headers = event.get('headers', {})
+    headers = event.get('headers') or {}
     query_params = event.get('queryStringParameters') or {}
     body = event.get('body')
 
@@ -30,74 +120,160 @@ def lambda_handler(event, context):
             # If body is not valid JSON or is an unexpected type, keep original string/value
             request_body = body
 
+    request = {
+        'method': http_method,
+        'path': path,
+        'headers': headers,
+        'query': query_params,
+        'body': request_body,
+    }
+
     try:
-        # Route requests
-        if path == '/health':
-            return handle_health(http_method)
-        elif path == '/':
-            return handle_root(http_method)
-        elif path == '/data-points':
-            return handle_data_points(http_method, request_body)
-        elif path == '/users':
-            return handle_users(http_method, request_body, query_params)
-        elif path == '/courses':
-            return handle_courses(http_method, request_body, query_params)
-        elif path == '/api/test':
-            return handle_test(http_method, query_params, headers)
-        else:
-            return create_response(404, {
+        handler, path_params = router.resolve(path)
+        if handler is None:
+            response = create_response(404, {
                 "error": "Not Found",
                 "message": f"Path {path} not found",
-                "available_paths": ["/", "/health", "/data-points", "/users", "/courses", "/api/test"],
+                "available_paths": router.paths(),
                 "method": http_method
             })
+        else:
+            request['params'] = path_params
+            response = handler(request)
+
+    except ValueError as e:
+        response = create_response(400, {"error": "Bad Request", "message": str(e)})
 
     except Exception as e:
-        logger.error(f"Error processing request: {str(e)}")
-        return create_response(500, {
+        logger.exception(f"Error processing {http_method} {path}: {e}")
+        response = create_response(500, {
             "error": "Internal Server Error",
             "message": str(e),
             "path": path,
             "method": http_method
         })
 
+    if random.random() < LOG_SAMPLE_RATE:
+        logger.info(json.dumps({
+            "method": http_method,
+            "path": path,
+            "status": response['statusCode'],
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+            "query_keys": sorted(query_params),
+        }))
+
+    return response
+
 
 def get_db_connection():
-    """Get database connection - will implement actual connection next"""
+    """
+    Return the module-level database connection, connecting if needed.
+
+    The connection survives between warm invocations, so only cold
+    starts pay for the TCP/TLS handshake and authentication.
+    """
+    global _connection
+
+    if _connection is not None and not _connection.closed:
+        return _connection
+
     database_url = os.getenv("DATABASE_URL")
     if not database_url:
         raise Exception("DATABASE_URL environment variable not set")
 
-    # For now, return a mock connection status
-    # We'll implement actual psycopg2 connection next
-    host = "unknown"
-    if "@" in database_url:
-        host = database_url.split("@")[1].split(":")[0]
-    return {
-        "status": "configured",
-        "url_set": True,
-        "host": host
-    }
+    import psycopg2
+
+    _connection = psycopg2.connect(database_url, connect_timeout=5)
+    # Each statement commits on its own; no idle transactions held open
+    _connection.autocommit = True
+    return _connection
+
+
+def reset_db_connection():
+    """Drop the cached connection so the next call reconnects"""
+    global _connection
+    if _connection is not None:
+        try:
+            _connection.close()
+        except Exception:
+            pass
+    _connection = None
+
+
+def run_query(sql, params=None):
+    """
+    Execute a statement and return rows as dicts.
+
+    A broken connection (server restart, failover, idle timeout) is
+    dropped, and a SELECT is retried once on a fresh connection. Writes
+    are not: the lost one may have committed before the error.
+    """
+    import psycopg2
+    from psycopg2.extras import RealDictCursor
+
+    attempts = 2 if sql.lstrip()[:6].upper() == "SELECT" else 1
+    for attempt in range(attempts):
+        connection = get_db_connection()
+        try:
+            with connection.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute(sql, params)
+                if cursor.description is None:
+                    return []
+                return [dict(row) for row in cursor.fetchall()]
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            reset_db_connection()
+            if attempt == attempts - 1:
+                raise
+            logger.warning("Database connection lost, reconnecting")
+
+
+def _pagination(params):
+    try:
+        limit = min(int(params.get('limit', 100)), MAX_PAGE_SIZE)
+        skip = max(int(params.get('skip', 0)), 0)
+    except (TypeError, ValueError):
+        raise ValueError("skip and limit must be integers")
+    return limit, skip
+
+
+def _method_not_allowed(*allowed):
+    return create_response(405, {"error": "Method not allowed", "allowed": list(allowed)})
+
+
+def _int_query(params, name):
+    value = params.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer")
+
+
+def _int_param(request, name):
+    try:
+        return int(request['params'][name])
+    except (KeyError, ValueError):
+        return None
 
 
-def handle_health(method):
+@router.route('/health')
+def handle_health(request):
     """Health check endpoint with database status"""
-    if method != 'GET':
-        return create_response(
-            405,
-            {
-                "error": "Method not allowed",
-                "allowed": ["GET"],
-            },
-        )
+    if request['method'] != 'GET':
+        return _method_not_allowed('GET')
 
     try:
-        db_status = get_db_connection()
+        start = time.perf_counter()
+        run_query("SELECT 1")
         return create_response(200, {
             "status": "healthy",
             "message": "Wipsie Backend API is running",
             "environment": "lambda",
-            "database": db_status,
+            "database": {
+                "status": "connected",
+                "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+            },
             "timestamp": datetime.utcnow().isoformat() + "Z"
         })
     except Exception as e:
@@ -109,90 +285,188 @@ def handle_health(method):
         })
 
 
-def handle_root(method):
+@router.route('/')
+def handle_root(request):
     """Root endpoint with API information"""
     return create_response(200, {
         "message": "Welcome to Wipsie Learning Management System API",
         "status": "working",
-        "version": "1.1.0",
+        "version": "1.2.0",
         "endpoints": {
             "health": "/health",
-            "data_points": "/data-points",
             "users": "/users",
+            "tasks": "/tasks",
+            "data_points": "/data-points",
             "courses": "/courses",
             "test": "/api/test"
         },
-        "method": method,
+        "method": request['method'],
         "timestamp": datetime.utcnow().isoformat() + "Z"
     })
 
 
-def handle_data_points(method, body):
-    """Handle data points - will connect to database"""
+USER_COLUMNS = "id, username, email, created_at, updated_at"
+TASK_COLUMNS = (
+    "id, user_id, title, description, status, priority, due_date, "
+    "created_at, updated_at"
+)
+DATA_POINT_COLUMNS = (
+    "id, task_id, data_type, value_json, meta_data, timestamp, created_at"
+)
+
+
+@router.route('/users')
+def handle_users(request):
+    """List or create users"""
+    method = request['method']
     if method == 'GET':
-        # For now, return mock data - will query database next
-        return create_response(200, {
-            "message": "Data points from database (mock)",
-            "data": [
-                {"id": 1, "name": "Sample Learning Module",
-                    "type": "course", "created_at": "2024-11-02T10:00:00Z"},
-                {"id": 2, "name": "User Progress Data", "type": "progress",
-                    "created_at": "2024-11-02T11:00:00Z"},
-                {"id": 3, "name": "Assessment Results", "type": "assessment",
-                    "created_at": "2024-11-02T12:00:00Z"}
-            ],
-            "total": 3,
-            "source": "database_ready",
-            "timestamp": datetime.utcnow().isoformat() + "Z"
-        })
+        limit, skip = _pagination(request['query'])
+        users = run_query(
+            f"SELECT {USER_COLUMNS} FROM users ORDER BY id LIMIT %s OFFSET %s",
+            (limit, skip),
+        )
+        return create_response(200, {"users": users, "total": len(users)})
 
     elif method == 'POST':
-        if not body:
-            return create_response(400, {"error": "Request body required"})
-
-        # Mock creation response - will insert to database next
-        return create_response(201, {
-            "message": "Data point would be created in database",
-            "received_data": body,
-            "mock_id": 123,
-            "status": "ready_for_db_insert",
-            "timestamp": datetime.utcnow().isoformat() + "Z"
-        })
+        body = request['body']
+        required = ('username', 'email', 'password_hash')
+        if not isinstance(body, dict) or not all(body.get(f) for f in required):
+            return create_response(400, {"error": "Required fields", "fields": list(required)})
+
+        rows = run_query(
+            "INSERT INTO users (username, email, password_hash) "
+            "VALUES (%s, %s, %s) ON CONFLICT DO NOTHING "
+            f"RETURNING {USER_COLUMNS}",
+            (body['username'], body['email'], body['password_hash']),
+        )
+        if not rows:
+            return create_response(409, {"error": "Username or email already exists"})
+        return create_response(201, rows[0])
+
+    return _method_not_allowed('GET', 'POST')
+
+
+@router.route('/users/{user_id}')
+def handle_user(request):
+    """Fetch a single user"""
+    if request['method'] != 'GET':
+        return _method_not_allowed('GET')
+
+    user_id = _int_param(request, 'user_id')
+    rows = run_query(f"SELECT {USER_COLUMNS} FROM users WHERE id = %s", (user_id,))
+    if not rows:
+        return create_response(404, {"error": "User not found"})
+    return create_response(200, rows[0])
+
+
+@router.route('/users/{user_id}/tasks')
+def handle_user_tasks(request):
+    """List tasks belonging to a user"""
+    if request['method'] != 'GET':
+        return _method_not_allowed('GET')
+
+    limit, skip = _pagination(request['query'])
+    tasks = run_query(
+        f"SELECT {TASK_COLUMNS} FROM tasks WHERE user_id = %s "
+        "ORDER BY id LIMIT %s OFFSET %s",
+        (_int_param(request, 'user_id'), limit, skip),
+    )
+    return create_response(200, {"tasks": tasks, "total": len(tasks)})
+
+
+@router.route('/tasks')
+def handle_tasks(request):
+    """List tasks, optionally filtered by status"""
+    if request['method'] != 'GET':
+        return _method_not_allowed('GET')
+
+    limit, skip = _pagination(request['query'])
+    status = request['query'].get('status')
+    tasks = run_query(
+        f"SELECT {TASK_COLUMNS} FROM tasks "
+        "WHERE (%s::text IS NULL OR status = %s) "
+        "ORDER BY id LIMIT %s OFFSET %s",
+        (status, status, limit, skip),
+    )
+    return create_response(200, {"tasks": tasks, "total": len(tasks)})
+
+
+@router.route('/tasks/{task_id}')
+def handle_task(request):
+    """Fetch a single task"""
+    if request['method'] != 'GET':
+        return _method_not_allowed('GET')
+
+    rows = run_query(
+        f"SELECT {TASK_COLUMNS} FROM tasks WHERE id = %s",
+        (_int_param(request, 'task_id'),),
+    )
+    if not rows:
+        return create_response(404, {"error": "Task not found"})
+    return create_response(200, rows[0])
+
+
+@router.route('/data-points')
+def handle_data_points(request):
+    """List or create data points"""
+    method = request['method']
+    if method == 'GET':
+        limit, skip = _pagination(request['query'])
+        task_id = _int_query(request['query'], 'task_id')
+        data_type = request['query'].get('data_type')
+        data_points = run_query(
+            f"SELECT {DATA_POINT_COLUMNS} FROM data_points "
+            "WHERE (%s::int IS NULL OR task_id = %s) "
+            "AND (%s::text IS NULL OR data_type = %s) "
+            "ORDER BY timestamp DESC LIMIT %s OFFSET %s",
+            (task_id, task_id, data_type, data_type, limit, skip),
+        )
+        return create_response(200, {"data": data_points, "total": len(data_points)})
 
-    else:
-        return create_response(405, {"error": "Method not allowed", "allowed": ["GET", "POST"]})
+    elif method == 'POST':
+        body = request['body']
+        if not isinstance(body, dict) or not body.get('task_id') or not body.get('data_type'):
+            return create_response(400, {"error": "task_id and data_type are required"})
+
+        rows = run_query(
+            "INSERT INTO data_points (task_id, data_type, value_json, meta_data) "
+            "SELECT %s, %s, %s::jsonb, %s::jsonb "
+            "WHERE EXISTS (SELECT 1 FROM tasks WHERE id = %s) "
+            f"RETURNING {DATA_POINT_COLUMNS}",
+            (
+                body['task_id'],
+                body['data_type'],
+                json.dumps(body.get('value_json')),
+                json.dumps(body.get('meta_data')),
+                body['task_id'],
+            ),
+        )
+        if not rows:
+            return create_response(404, {"error": "Task not found"})
+        return create_response(201, rows[0])
 
+    return _method_not_allowed('GET', 'POST')
 
-def handle_users(method, body, params):
-    """Handle user management endpoints"""
-    if method == 'GET':
-        return create_response(200, {
-            "message": "Users endpoint (database ready)",
-            "users": [
-                {"id": 1, "name": "John Doe",
-                    "email": "john@example.com", "role": "student"},
-                {"id": 2, "name": "Jane Smith",
-                    "email": "jane@example.com", "role": "instructor"}
-            ],
-            "total": 2,
-            "filters": params,
-            "timestamp": datetime.utcnow().isoformat() + "Z"
-        })
 
-    elif method == 'POST':
-        return create_response(201, {
-            "message": "User would be created",
-            "user_data": body,
-            "status": "ready_for_db",
-            "timestamp": datetime.utcnow().isoformat() + "Z"
-        })
+@router.route('/data-points/{data_point_id}')
+def handle_data_point(request):
+    """Fetch a single data point"""
+    if request['method'] != 'GET':
+        return _method_not_allowed('GET')
 
-    else:
-        return create_response(405, {"error": "Method not allowed", "allowed": ["GET", "POST"]})
+    rows = run_query(
+        f"SELECT {DATA_POINT_COLUMNS} FROM data_points WHERE id = %s",
+        (_int_param(request, 'data_point_id'),),
+    )
+    if not rows:
+        return create_response(404, {"error": "Data point not found"})
+    return create_response(200, rows[0])
 
 
-def handle_courses(method, body, params):
-    """Handle course management endpoints"""
+@router.route('/courses')
+def handle_courses(request):
+    """Handle course management endpoints (no courses table yet)"""
+    method = request['method']
     if method == 'GET':
         return create_response(200, {
             "message": "Courses endpoint (database ready)",
@@ -203,30 +477,30 @@ def handle_courses(method, body, params):
                     "instructor": "John Doe", "students": 18}
             ],
             "total": 2,
-            "filters": params,
+            "filters": request['query'],
             "timestamp": datetime.utcnow().isoformat() + "Z"
         })
 
     elif method == 'POST':
         return create_response(201, {
             "message": "Course would be created",
-            "course_data": body,
+            "course_data": request['body'],
             "status": "ready_for_db",
             "timestamp": datetime.utcnow().isoformat() + "Z"
         })
 
-    else:
-        return create_response(405, {"error": "Method not allowed", "allowed": ["GET", "POST"]})
+    return _method_not_allowed('GET', 'POST')
 
 
-def handle_test(method, params, headers):
+@router.route('/api/test')
+def handle_test(request):
     """Test endpoint for debugging"""
     return create_response(200, {
         "message": "Test endpoint working",
         "request_info": {
-            "method": method,
-            "query_params": params,
-            "headers_count": len(headers),
+            "method": request['method'],
+            "query_params": request['query'],
+            "headers_count": len(request['headers']),
             "database_configured": bool(os.getenv("DATABASE_URL"))
         },
         "timestamp": datetime.utcnow().isoformat() + "Z"
@@ -245,7 +519,7 @@ def create_response(status_code, body):
                 'Content-Type, Authorization,'
                 ' X-Requested-With'
             ),
-            'X-API-Version': '1.1.0',
+            'X-API-Version': '1.2.0',
             'X-Timestamp': datetime.utcnow().isoformat() + 'Z'
         },
         'body': json.dumps(body, default=str)
@@ -0,0 +1,182 @@
+"""
+Tests for the simple API Lambda router and pooled connection handling
+"""
+
+import json
+
+import pytest
+
+import lambda_function
+from lambda_function import (
+    Router,
+    lambda_handler,
+)
+
+
+class FakeOperationalError(Exception):
+    pass
+
+
+def make_event(path, method="GET", query=None, body=None):
+    return {
+        "httpMethod": method,
+        "path": path,
+        "headers": {},
+        "queryStringParameters": query,
+        "body": json.dumps(body) if body is not None else None,
+    }
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    """Capture SQL instead of talking to Postgres"""
+    calls = []
+    results = {}
+
+    def fake_run_query(sql, params=None):
+        calls.append((sql, params))
+        for fragment, rows in results.items():
+            if fragment in sql:
+                return rows
+        return []
+
+    monkeypatch.setattr(lambda_function, "run_query", fake_run_query)
+    return calls, results
+
+
+def test_router_static_and_params():
+    router = Router()
+    router.add("/users", "list")
+    router.add("/users/{user_id}", "item")
+    router.add("/users/{user_id}/tasks", "tasks")
+
+    assert router.resolve("/users") == ("list", {})
+    assert router.resolve("/users/") == ("list", {})
+    assert router.resolve("/users/7") == ("item", {"user_id": "7"})
+    assert router.resolve("/users/7/tasks") == ("tasks", {"user_id": "7"})
+    assert router.resolve("/users/7/other") == (None, {})
+    assert router.resolve("/missing") == (None, {})
+
+
+def test_unknown_path_lists_routes(queries):
+    response = lambda_handler(make_event("/nope"), None)
+    assert response["statusCode"] == 404
+    assert "/users/{id}" in json.loads(response["body"])["available_paths"]
+
+
+def test_user_item_uses_path_param(queries):
+    calls, results = queries
+    results["FROM users WHERE id"] = [{"id": 3, "username": "ada"}]
+
+    response = lambda_handler(make_event("/users/3"), None)
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["username"] == "ada"
+    assert calls[-1][1] == (3,)
+
+
+def test_data_points_filters_and_pagination(queries):
+    calls, _ = queries
+    response = lambda_handler(
+        make_event(
+            "/data-points",
+            query={"task_id": "5", "data_type": "weather", "limit": "5000"},
+        ),
+        None,
+    )
+    assert response["statusCode"] == 200
+    sql, params = calls[-1]
+    assert "FROM data_points" in sql
+    assert params == (5, 5, "weather", "weather", 1000, 0)
+
+
+def test_non_integer_task_filter_is_bad_request(queries):
+    calls, _ = queries
+    response = lambda_handler(
+        make_event("/data-points", query={"task_id": "abc"}), None
+    )
+    assert response["statusCode"] == 400
+    assert "task_id" in json.loads(response["body"])["message"]
+    assert not calls
+
+
+def test_invalid_pagination_is_bad_request(queries):
+    response = lambda_handler(make_event("/tasks", query={"limit": "x"}), None)
+    assert response["statusCode"] == 400
+
+
+def test_create_data_point_requires_fields(queries):
+    response = lambda_handler(
+        make_event("/data-points", method="POST", body={"task_id": 1}), None
+    )
+    assert response["statusCode"] == 400
+
+
+def test_connection_reused_and_reconnected(monkeypatch):
+    """A dropped connection is replaced once and then reused."""
+    import sys
+    import types
+
+    connects = []
+
+    class FakeCursor:
+        description = None
+
+        def __init__(self, connection):
+            self.connection = connection
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, sql, params=None):
+            if self.connection.broken:
+                raise FakeOperationalError("server closed the connection")
+
+    class FakeConnection:
+        def __init__(self):
+            self.closed = 0
+            self.broken = False
+            self.autocommit = False
+
+        def cursor(self, cursor_factory=None):
+            return FakeCursor(self)
+
+        def close(self):
+            self.closed = 1
+
+    def connect(url, connect_timeout):
+        connection = FakeConnection()
+        connects.append(connection)
+        return connection
+
+    fake_psycopg2 = types.ModuleType("psycopg2")
+    fake_psycopg2.connect = connect
+    fake_psycopg2.OperationalError = FakeOperationalError
+    fake_psycopg2.InterfaceError = FakeOperationalError
+    fake_extras = types.ModuleType("psycopg2.extras")
+    fake_extras.RealDictCursor = object
+    fake_psycopg2.extras = fake_extras
+    monkeypatch.setitem(sys.modules, "psycopg2", fake_psycopg2)
+    monkeypatch.setitem(sys.modules, "psycopg2.extras", fake_extras)
+    monkeypatch.setenv("DATABASE_URL", "postgresql://test")
+    monkeypatch.setattr(lambda_function, "_connection", None)
+
+    lambda_function.run_query("SELECT 1")
+    lambda_function.run_query("SELECT 1")
+    assert len(connects) == 1
+    assert connects[0].autocommit is True
+
+    connects[0].broken = True
+    lambda_function.run_query("SELECT 1")
+    assert len(connects) == 2
+    assert connects[0].closed
+
+    # A write may have committed before the connection dropped
+    connects[1].broken = True
+    with pytest.raises(FakeOperationalError):
+        lambda_function.run_query("INSERT INTO users VALUES (%s)", (1,))
+    assert len(connects) == 2
+    assert lambda_function._connection is None
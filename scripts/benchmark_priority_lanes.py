@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Priority Lane Simulation Benchmark
+Simulates one consumer draining a low-priority flood while alerts keep
+arriving, once with a single FIFO queue and once with weighted-fair
+priority lanes, and reports the latency of each priority.
+
+Usage:
+    python scripts/benchmark_priority_lanes.py
+    python scripts/benchmark_priority_lanes.py --low-rate 800 --seconds 120
+"""
+
+import argparse
+import random
+import sys
+from collections import deque
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from services.aws.sqs.priority import (  # noqa: E402
+    DEFAULT_WEIGHTS,
+    PRIORITIES,
+    WeightedFairPoller,
+)
+
+
+def generate_arrivals(rates, seconds, flood_seconds, seed):
+    """Poisson arrivals per priority; the low lane only floods at first"""
+    rng = random.Random(seed)
+    arrivals = []
+    for priority, rate in rates.items():
+        until = flood_seconds if priority == "low" else seconds
+        clock = rng.expovariate(rate)
+        while clock < until:
+            arrivals.append((clock, priority))
+            clock += rng.expovariate(rate)
+    arrivals.sort()
+    return arrivals
+
+
+def _take(queue, count):
+    return [queue.popleft() for _ in range(min(count, len(queue)))]
+
+
+def simulate(arrivals, lanes, batch_size, service_ms, poll_ms, weights):
+    """Replay arrivals through one consumer, returning latencies (ms)"""
+    queues = {priority: deque() for priority in PRIORITIES}
+    poller = WeightedFairPoller(weights)
+    latencies = {priority: [] for priority in PRIORITIES}
+    clock = 0.0
+    index = 0
+
+    while index < len(arrivals) or any(queues.values()):
+        while index < len(arrivals) and arrivals[index][0] <= clock:
+            arrived, priority = arrivals[index]
+            lane = priority if lanes else "medium"
+            queues[lane].append((arrived, priority))
+            index += 1
+
+        if not any(queues.values()):
+            clock = arrivals[index][0]
+            continue
+
+        if lanes:
+            _, messages = poller.poll(
+                lambda lane: _take(queues[lane], batch_size)
+            )
+        else:
+            messages = _take(queues["medium"], batch_size)
+
+        clock += poll_ms / 1000
+        for arrived, priority in messages:
+            clock += service_ms / 1000
+            latencies[priority].append((clock - arrived) * 1000)
+
+    return latencies
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def print_report(title, latencies):
+    print(f"{title}")
+    print(
+        f"  {'lane':8} {'count':>7} {'p50 ms':>10} {'p99 ms':>10}"
+        f" {'max ms':>10}"
+    )
+    for priority in PRIORITIES:
+        values = latencies[priority]
+        if not values:
+            continue
+        print(
+            f"  {priority:8} {len(values):7d}"
+            f" {_percentile(values, 50):10.0f}"
+            f" {_percentile(values, 99):10.0f}"
+            f" {max(values):10.0f}"
+        )
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--seconds", type=float, default=60)
+    parser.add_argument("--flood-seconds", type=float, default=20)
+    parser.add_argument("--high-rate", type=float, default=2)
+    parser.add_argument("--medium-rate", type=float, default=20)
+    parser.add_argument("--low-rate", type=float, default=400)
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--service-ms", type=float, default=4)
+    parser.add_argument("--poll-ms", type=float, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rates = {
+        "high": args.high_rate,
+        "medium": args.medium_rate,
+        "low": args.low_rate,
+    }
+    arrivals = generate_arrivals(
+        rates, args.seconds, args.flood_seconds, args.seed
+    )
+    capacity = args.batch_size / (
+        (args.poll_ms + args.batch_size * args.service_ms) / 1000
+    )
+    print(f"📨 {len(arrivals)} messages, consumer capacity ~{capacity:.0f}/s")
+    print(
+        f"🌊 Low-priority flood: {args.low_rate:.0f}/s for "
+        f"{args.flood_seconds:.0f}s"
+    )
+    print()
+
+    results = {}
+    modes = (
+        (False, "📥 Single FIFO queue"),
+        (True, f"🚦 Priority lanes {DEFAULT_WEIGHTS}"),
+    )
+    for lanes, title in modes:
+        results[lanes] = simulate(
+            arrivals,
+            lanes,
+            args.batch_size,
+            args.service_ms,
+            args.poll_ms,
+            DEFAULT_WEIGHTS,
+        )
+        print_report(title, results[lanes])
+
+    fifo_p99 = _percentile(results[False]["high"], 99)
+    lanes_p99 = _percentile(results[True]["high"], 99)
+    print(f"🚨 High-priority p99: {fifo_p99:.0f} ms -> {lanes_p99:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Worker Profile Benchmark
+Runs synthetic IO-bound and CPU-bound tasks through a real Celery worker
+started with each worker profile, using kombu's filesystem transport as a
+local stand-in for SQS, and reports tasks per second.
+
+Usage:
+    python scripts/benchmark_worker_profiles.py
+    python scripts/benchmark_worker_profiles.py --io-tasks 400 --io-ms 100
+"""
+
+import argparse
+import dataclasses
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from celery import Celery
+
+SCRIPTS_DIR = Path(__file__).parent
+BACKEND_DIR = SCRIPTS_DIR.parent / "backend"
+BENCH_DIR = Path(
+    os.environ.get("BENCH_DIR", Path(tempfile.gettempdir()) / "wipsie-bench")
+)
+
+# The worker subprocess imports this module for `app`; keep it free of
+# backend imports so the real task signals and SQS settings stay out
+app = Celery("wipsie_worker_bench")
+app.conf.update(
+    broker_url="filesystem://",
+    broker_transport_options={
+        "data_folder_in": str(BENCH_DIR / "broker"),
+        "data_folder_out": str(BENCH_DIR / "broker"),
+        "control_folder": str(BENCH_DIR / "control"),
+        "store_processed": False,
+        "polling_interval": 0.01,
+    },
+    result_backend=f"file://{BENCH_DIR / 'results'}",
+    task_serializer="json",
+    accept_content=["json"],
+    result_serializer="json",
+    worker_prefetch_multiplier=int(os.environ.get("BENCH_PREFETCH", "1")),
+    task_acks_late=os.environ.get("BENCH_ACKS_LATE") == "1",
+)
+
+
+# Explicit names: the harness runs as __main__, the worker imports it
+@app.task(name="bench.io_task")
+def io_task(milliseconds):
+    """Stands in for an SES or webhook call"""
+    time.sleep(milliseconds / 1000)
+    return milliseconds
+
+
+@app.task(name="bench.cpu_task")
+def cpu_task(rounds):
+    """Stands in for enrichment: pure-Python hashing"""
+    digest = b""
+    for _ in range(rounds):
+        digest = hashlib.sha256(digest).digest()
+    return digest.hex()
+
+
+def _reset_dirs():
+    shutil.rmtree(BENCH_DIR, ignore_errors=True)
+    (BENCH_DIR / "broker").mkdir(parents=True)
+    (BENCH_DIR / "results").mkdir(parents=True)
+
+
+def _wait(results, timeout):
+    # One result file at a time: polling them all would starve the worker
+    deadline = time.monotonic() + timeout
+    for result in results:
+        while not result.ready():
+            if time.monotonic() > deadline:
+                raise TimeoutError("Benchmark tasks did not finish in time")
+            time.sleep(0.01)
+    failed = [result for result in results if result.failed()]
+    if failed:
+        raise RuntimeError(f"Benchmark task failed: {failed[0].result}")
+
+
+def run_profile(profile, task, arg, count, timeout=300.0):
+    """Tasks per second for `count` tasks through a worker with `profile`"""
+    _reset_dirs()
+    env = dict(
+        os.environ,
+        BENCH_DIR=str(BENCH_DIR),
+        BENCH_PREFETCH=str(profile.prefetch_multiplier),
+        BENCH_ACKS_LATE="1" if profile.acks_late else "0",
+    )
+    worker = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "celery",
+            "-A",
+            Path(__file__).stem,
+            *profile.worker_args(queues=["celery"]),
+            "--loglevel=warning",
+            "--without-gossip",
+            "--without-mingle",
+            "--without-heartbeat",
+        ],
+        cwd=SCRIPTS_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        # Warm up: wait until the worker is consuming
+        _wait([task.delay(arg)], timeout)
+
+        started = time.perf_counter()
+        _wait([task.delay(arg) for _ in range(count)], timeout)
+        return count / (time.perf_counter() - started)
+    finally:
+        worker.terminate()
+        worker.wait(timeout=30)
+
+
+def _profiles():
+    sys.path.insert(0, str(BACKEND_DIR))
+    from workers.celery_app import (
+        WORKER_PROFILES,
+    )
+
+    profiles = dict(WORKER_PROFILES)
+    try:
+        import gevent  # noqa: F401
+
+        profiles["io-gevent"] = dataclasses.replace(
+            WORKER_PROFILES["io"], name="io-gevent", pool="gevent"
+        )
+    except ImportError:
+        pass
+    return profiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--io-tasks", type=int, default=200)
+    parser.add_argument("--io-ms", type=float, default=50)
+    parser.add_argument("--cpu-tasks", type=int, default=40)
+    parser.add_argument("--cpu-rounds", type=int, default=100_000)
+    args = parser.parse_args()
+
+    profiles = _profiles()
+    workloads = (
+        ("IO-bound", io_task, args.io_ms, args.io_tasks),
+        ("CPU-bound", cpu_task, args.cpu_rounds, args.cpu_tasks),
+    )
+
+    print(f"🖥️  {os.cpu_count()} CPUs, filesystem broker in {BENCH_DIR}")
+    print()
+    for title, task, arg, count in workloads:
+        print(f"⚙️  {title}: {count} tasks")
+        for name, profile in profiles.items():
+            rate = run_profile(profile, task, arg, count)
+            print(f"  {name:10} {profile.pool:8} {rate:8.1f} tasks/s")
+        print()
+
+
+if __name__ == "__main__":
+    main()
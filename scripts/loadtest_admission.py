@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Admission Control Load Test
+Sends requests at a fixed rate above capacity to an in-process app
+whose handler holds one of a fixed number of database connections,
+once without and once with AdmissionControlMiddleware, and reports the
+latency of the requests that were served and how many were shed.
+
+Usage:
+    python scripts/loadtest_admission.py
+    python scripts/loadtest_admission.py --rate 3000 --seconds 10
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+import httpx  # noqa: E402
+from starlette.applications import Starlette  # noqa: E402
+from starlette.responses import PlainTextResponse  # noqa: E402
+from starlette.routing import Route  # noqa: E402
+
+from core.middleware.admission import (  # noqa: E402
+    AdmissionControlMiddleware,
+    AdmissionController,
+)
+
+
+def build_app(connections, service_ms, pool_timeout):
+    """An endpoint that checks out a connection like get_db does"""
+    pool = asyncio.Semaphore(connections)
+
+    async def query(request):
+        try:
+            await asyncio.wait_for(pool.acquire(), pool_timeout)
+        except asyncio.TimeoutError:
+            return PlainTextResponse("pool timeout", status_code=500)
+        try:
+            await asyncio.sleep(service_ms / 1000)
+        finally:
+            pool.release()
+        return PlainTextResponse("ok")
+
+    async def health(request):
+        return PlainTextResponse("healthy")
+
+    return Starlette(
+        routes=[Route("/api/v1/query", query), Route("/health", health)]
+    )
+
+
+async def fire(app, rate, seconds):
+    """Open-loop arrivals at `rate` per second, plus /health probes"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://load", timeout=None
+    ) as client:
+
+        async def timed(path):
+            started = time.perf_counter()
+            response = await client.get(path)
+            return path, response.status_code, time.perf_counter() - started
+
+        started = time.perf_counter()
+        pending = []
+        sent = 0
+        next_probe = 0.0
+        while time.perf_counter() - started < seconds:
+            # Catch up to the schedule; arrivals don't wait for responses
+            due = int((time.perf_counter() - started) * rate)
+            pending += [
+                asyncio.ensure_future(timed("/api/v1/query"))
+                for _ in range(due - sent)
+            ]
+            sent = due
+            if time.perf_counter() - started >= next_probe:
+                pending.append(asyncio.ensure_future(timed("/health")))
+                next_probe += 0.1
+            await asyncio.sleep(0.01)
+        return await asyncio.gather(*pending)
+
+
+def percentile(values, fraction):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def report(label, results):
+    ok = [s * 1000 for p, c, s in results if p != "/health" and c == 200]
+    shed = sum(1 for p, c, _ in results if c == 503)
+    failed = sum(1 for p, c, _ in results if c == 500)
+    health = [s * 1000 for p, c, s in results if p == "/health"]
+    print(f"\n{label}")
+    print(f"  served {len(ok)}, shed (503) {shed}, pool timeouts {failed}")
+    print(
+        "  served latency ms: "
+        f"p50 {percentile(ok, 0.5):8.1f}  p95 {percentile(ok, 0.95):8.1f}  "
+        f"p99 {percentile(ok, 0.99):8.1f}  max {max(ok, default=0):8.1f}"
+    )
+    print(f"  /health max ms: {max(health, default=0):8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rate", type=float, default=1500.0)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--connections", type=int, default=15)
+    parser.add_argument("--service-ms", type=float, default=20.0)
+    parser.add_argument("--pool-timeout", type=float, default=30.0)
+    parser.add_argument("--max-queue", type=int, default=100)
+    parser.add_argument("--queue-timeout", type=float, default=0.5)
+    args = parser.parse_args()
+
+    capacity = args.connections / (args.service_ms / 1000)
+    print(
+        f"{args.rate:.0f} requests/s for {args.seconds:.0f}s against "
+        f"{args.connections} connections of {args.service_ms:.0f}ms "
+        f"(capacity {capacity:.0f} requests/s)"
+    )
+
+    app = build_app(args.connections, args.service_ms, args.pool_timeout)
+    results = asyncio.run(fire(app, args.rate, args.seconds))
+    report("Without admission control", results)
+
+    controller = AdmissionController(
+        {"/api/v1": args.connections},
+        max_queue=args.max_queue,
+        queue_timeout=args.queue_timeout,
+    )
+    app = AdmissionControlMiddleware(
+        build_app(args.connections, args.service_ms, args.pool_timeout),
+        controller,
+    )
+    results = asyncio.run(fire(app, args.rate, args.seconds))
+    report("With admission control", results)
+    wait = controller.stats()["groups"][0]["queue_wait_seconds"]
+    print(
+        f"  queue wait ms: p50 {wait['p50'] * 1000:.1f}  "
+        f"p99 {wait['p99'] * 1000:.1f}  max {wait['max'] * 1000:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
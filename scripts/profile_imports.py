@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Import-time Profiler
+Runs `python -X importtime` against a backend module (the Lambda entry
+point by default) and reports the slowest imports.
+
+Usage:
+    python scripts/profile_imports.py
+    python scripts/profile_imports.py --module workers --top 30
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent / "backend"
+
+
+def profile_module(module: str):
+    """Import `module` in a fresh interpreter and parse the importtime log"""
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    wall_time = time.perf_counter() - start
+
+    if completed.returncode != 0:
+        print(completed.stderr, file=sys.stderr)
+        raise SystemExit(f"❌ Failed to import {module}")
+
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        entries.append(_parse_line(line))
+
+    return wall_time, entries
+
+
+def _parse_line(line: str):
+    """Split an importtime line into (name, self_us, cumulative_us)"""
+    self_part, cumulative_part, name = line.split("|")
+    self_us = int(self_part.split(":")[1])
+    return name.rstrip(), self_us, int(cumulative_part)
+
+
+def print_report(module: str, wall_time: float, entries, top: int):
+    print(f"🧊 Cold import of '{module}': {wall_time * 1000:.0f} ms wall")
+    print(f"📦 Modules imported: {len(entries)}")
+    print()
+
+    print(f"🐢 Top {top} by cumulative time:")
+    by_cumulative = sorted(entries, key=lambda e: e[2], reverse=True)
+    for name, _, cumulative_us in by_cumulative[:top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+    print()
+
+    print(f"🔥 Top {top} by self time:")
+    by_self = sorted(entries, key=lambda e: e[1], reverse=True)
+    for name, self_us, _ in by_self[:top]:
+        print(f"  {self_us / 1000:8.1f} ms  {name.strip()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    wall_time, entries = profile_module(args.module)
+    print_report(args.module, wall_time, entries, args.top)
+
+
+if __name__ == "__main__":
+    main()
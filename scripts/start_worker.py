@@ -2,8 +2,14 @@
 """
 Start Celery Worker
 Production script to start Celery workers
+
+Usage:
+    python scripts/start_worker.py --profile io    # notifications, default
+    python scripts/start_worker.py --profile cpu   # data processing, tasks
+    python scripts/start_worker.py                 # every queue
 """
 
+import argparse
 import os
 import sys
 from pathlib import Path
@@ -13,25 +19,26 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 
-def start_worker():
-    """Start the Celery worker"""
+def start_worker(profile_name: str):
+    """Start a Celery worker with the given profile"""
     # Import after path setup
     from workers import celery_app
+    from workers.celery_app import WORKER_PROFILES
+
+    profile = WORKER_PROFILES[profile_name]
+    profile.apply(celery_app)
 
-    print("🚀 Starting Wipsie Celery Worker...")
-    print("📋 Available Queues:")
-    print("   • wipsie-default (general messages)")
-    print("   • wipsie-data-polling (data processing)")
-    print("   • wipsie-task-processing (general tasks)")
-    print("   • wipsie-notifications (emails & alerts)")
+    print(f"🚀 Starting Wipsie Celery Worker ({profile.name} profile)...")
+    print(f"🏊 Pool: {profile.pool}")
+    print("📋 Queues:")
+    for queue in profile.consumed_queues():
+        print(f"   • {queue}")
     print()
 
-    # Start worker with optimized settings
     celery_app.worker_main(
-        [
-            "worker",
+        profile.worker_args()
+        + [
             "--loglevel=info",
-            "--concurrency=4",
             "--max-tasks-per-child=1000",
             "--time-limit=300",
             "--soft-time-limit=240",
@@ -40,4 +47,10 @@ def start_worker():
 
 
 if __name__ == "__main__":
-    start_worker()
+    parser = argparse.ArgumentParser(description="Start a Celery worker")
+    parser.add_argument(
+        "--profile",
+        choices=["io", "cpu", "all"],
+        default=os.environ.get("WORKER_PROFILE", "all"),
+    )
+    start_worker(parser.parse_args().profile)